@@ -0,0 +1,207 @@
+"""
+Benchmark: Catalog Loading Throughput
+Times load_quests, load_items, parse_quest_block and validate_item_data
+on generated catalogs (plus load_quests on the .jsonl and .csv formats)
+and reports records/s, MB/s and peak memory
+
+Usage: python benchmarks/bench_loading.py [--sizes 1000,10000,100000]
+           [--repeat N] [--output results.json]
+           [--baseline baseline.json] [--threshold 0.10]
+
+With --baseline, every result whose records/s dropped by more than the
+threshold (a fraction, 0.10 = 10%) is listed and the exit status is 1,
+so the benchmark can gate CI. Everything runs offline on data written by
+tools/generate_data.py.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "tools"))
+
+import game_data
+from generate_data import QuestTree, write_quests, write_items
+from convert_data import convert
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+# ============================================================================
+# CASES
+# ============================================================================
+# Each case is set up once per size (untimed) and returns a function that
+# does the measured work plus the number of bytes that work covers.
+
+def read_blocks(filename):
+    with open(filename, 'r') as file:
+        content = file.read()
+    return [block.split('\n') for block in content.strip().split('\n\n')]
+
+
+def setup_load_quests(files):
+    return (lambda: game_data.load_quests(files['quests'])), os.path.getsize(files['quests'])
+
+
+def setup_load_quests_jsonl(files):
+    return (lambda: game_data.load_quests(files['quests_jsonl'])), os.path.getsize(files['quests_jsonl'])
+
+
+def setup_load_quests_csv(files):
+    return (lambda: game_data.load_quests(files['quests_csv'])), os.path.getsize(files['quests_csv'])
+
+
+def setup_load_items(files):
+    return (lambda: game_data.load_items(files['items'])), os.path.getsize(files['items'])
+
+
+def setup_parse_quest_block(files):
+    blocks = read_blocks(files['quests'])
+
+    def run():
+        for lines in blocks:
+            game_data.parse_quest_block(lines)
+    return run, os.path.getsize(files['quests'])
+
+
+def setup_validate_item_data(files):
+    items = [game_data.parse_item_block(lines) for lines in read_blocks(files['items'])]
+
+    def run():
+        for item in items:
+            game_data.validate_item_data(item)
+    return run, os.path.getsize(files['items'])
+
+
+CASES = {
+    'load_quests': setup_load_quests,
+    'load_quests_jsonl': setup_load_quests_jsonl,
+    'load_quests_csv': setup_load_quests_csv,
+    'load_items': setup_load_items,
+    'parse_quest_block': setup_parse_quest_block,
+    'validate_item_data': setup_validate_item_data
+}
+
+# ============================================================================
+# MEASURING
+# ============================================================================
+
+def measure(run, size, byte_count, repeat):
+    # Best of `repeat` untraced runs for speed, then one traced run for
+    # memory (tracemalloc slows everything down too much to time with it)
+    best = min(_elapsed(run) for _ in range(repeat))
+
+    tracemalloc.start()
+    run()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'records': size,
+        'seconds': best,
+        'records_per_sec': size / best,
+        'mb_per_sec': byte_count / 2**20 / best,
+        'peak_mb': peak / 2**20
+    }
+
+
+def _elapsed(run):
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def run_suite(sizes, repeat):
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            files = {
+                'quests': os.path.join(directory, f"quests_{size}.txt"),
+                'quests_jsonl': os.path.join(directory, f"quests_{size}.jsonl"),
+                'quests_csv': os.path.join(directory, f"quests_{size}.csv"),
+                'items': os.path.join(directory, f"items_{size}.txt")
+            }
+            rng = random.Random(size)
+            write_quests(files['quests'], size, QuestTree(10, 2), rng)
+            write_items(files['items'], size, rng)
+            convert(files['quests'], files['quests_jsonl'], 'quests')
+            convert(files['quests'], files['quests_csv'], 'quests')
+
+            for name, setup in CASES.items():
+                run, byte_count = setup(files)
+                result = measure(run, size, byte_count, repeat)
+                results[f"{name}/{size}"] = result
+                print(f"{name:<20} {size:>9,} records  "
+                      f"{result['records_per_sec']:>12,.0f} records/s  "
+                      f"{result['mb_per_sec']:>8.1f} MB/s  "
+                      f"{result['peak_mb']:>8.1f} MB peak")
+
+            for filename in files.values():
+                os.remove(filename)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Find results that got slower than the baseline by more than threshold
+
+    Returns: List of (name, baseline records/s, current records/s)
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]['records_per_sec']
+        after = result['records_per_sec']
+        if after < before * (1 - threshold):
+            regressions.append((name, before, after))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark catalog loading")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="Comma-separated record counts (up to 1000000)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Allowed slowdown as a fraction (default 0.10)")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    print(f"=== LOADING BENCHMARK (sizes {sizes}) ===")
+    results = run_suite(sizes, args.repeat)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'results': results
+            }, file, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            baseline = json.load(file)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before:,.0f} -> {after:,.0f} records/s "
+                  f"({(1 - after / before) * 100:.1f}% slower)")
+        if regressions:
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%} of the baseline")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
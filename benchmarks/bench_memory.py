@@ -0,0 +1,88 @@
+"""
+Benchmark: Catalog Memory
+Uses tracemalloc to compare catalogs of plain dicts against the slotted
+QuestRecord/ItemRecord classes, with and without lazy text fields
+
+Usage: python benchmarks/bench_memory.py [record_count]
+"""
+
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+from bench_snapshot import write_quest_file, write_item_file
+
+# Text fields left on disk for the lazy catalog
+LAZY_FIELDS = {'quest': ('description', 'title'), 'item': ('description', 'name')}
+
+
+def load_as_dicts(filename, schema):
+    # What the loaders used to keep: one dict per record
+    records = {}
+    with open(filename, 'rb') as file:
+        for line_number, lines in game_data._iter_blocks(file, schema.record_name):
+            record = schema.parse(lines)
+            schema.validate(record)
+            records[record[schema.id_field]] = record
+    return records
+
+
+def load_as_records(filename, schema):
+    records = {}
+    for line_number, record in game_data._iter_records(filename, schema):
+        records[record[schema.id_field]] = record
+    return records
+
+
+def load_lazy(filename, schema):
+    lazy_fields = LAZY_FIELDS[schema.record_name]
+    records = {}
+    for line_number, record in game_data._iter_records(filename, schema, lazy_fields=lazy_fields):
+        records[record[schema.id_field]] = record
+    return records
+
+
+def measure(loader, filename, schema):
+    tracemalloc.start()
+    catalog = loader(filename, schema)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return catalog, retained
+
+
+def run(count):
+    with tempfile.TemporaryDirectory() as directory:
+        quest_file = os.path.join(directory, "quests.txt")
+        item_file = os.path.join(directory, "items.txt")
+        write_quest_file(quest_file, count)
+        write_item_file(item_file, count)
+
+        print(f"=== CATALOG MEMORY ({count} records each) ===")
+        for name, filename, schema in [
+            ("quests", quest_file, game_data.QUEST_SCHEMA),
+            ("items", item_file, game_data.ITEM_SCHEMA)
+        ]:
+            dicts, dict_bytes = measure(load_as_dicts, filename, schema)
+            records, record_bytes = measure(load_as_records, filename, schema)
+            lazy, lazy_bytes = measure(load_lazy, filename, schema)
+            assert records == dicts
+            del dicts, records, lazy
+
+            print(f"\n{name}:")
+            print(f"  dict catalog:    {dict_bytes / 2**20:8.1f} MiB "
+                  f"({dict_bytes / count:6.0f} bytes/record)")
+            print(f"  slotted catalog: {record_bytes / 2**20:8.1f} MiB "
+                  f"({record_bytes / count:6.0f} bytes/record)")
+            print(f"  Saved:           {(1 - record_bytes / dict_bytes) * 100:8.1f}%")
+            print(f"  lazy text:       {lazy_bytes / 2**20:8.1f} MiB "
+                  f"({lazy_bytes / count:6.0f} bytes/record)")
+            print(f"  Saved:           {(1 - lazy_bytes / dict_bytes) * 100:8.1f}%")
+
+
+if __name__ == "__main__":
+    record_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    run(record_count)
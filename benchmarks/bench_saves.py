@@ -0,0 +1,119 @@
+"""
+Benchmark: Save Throughput
+Saves per second for each save backend, with an fsync per save compared
+against group commits of many saves, and for small changes (gold) to a
+character with long inventory and quest lists. Also times listing saves
+with their class and level from the manifest against scanning every save
+
+Usage: python benchmarks/bench_saves.py [save_count] [batch_size]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+
+def make_characters(count):
+    characters = []
+    for i in range(count):
+        character = character_manager.create_character(f"hero_{i}", "Warrior")
+        character['inventory'] = [f"item_{n}" for n in range(i % 20)]
+        character['completed_quests'] = [f"quest_{n}" for n in range(i % 50)]
+        characters.append(character)
+    return characters
+
+
+def saves_per_second(backend_name, characters, batch_size):
+    with tempfile.TemporaryDirectory() as directory:
+        character_manager.set_save_backend(backend_name)
+        # Unchanged characters would be skipped, so every save must write
+        for character in characters:
+            character_manager.mark_dirty(character)
+
+        start = time.perf_counter()
+        if batch_size <= 1:
+            for character in characters:
+                character_manager.save_character(character, directory)
+        else:
+            for first in range(0, len(characters), batch_size):
+                with character_manager.group_commit(directory):
+                    for character in characters[first:first + batch_size]:
+                        character_manager.save_character(character, directory)
+        elapsed = time.perf_counter() - start
+
+        character_manager.close_save_backends()
+    return len(characters) / elapsed
+
+
+def small_changes_per_second(backend_name, count):
+    character = character_manager.create_character("collector", "Rogue")
+    character['inventory'] = [f"item_{n}" for n in range(500)]
+    character['completed_quests'] = [f"quest_{n}" for n in range(2000)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        character_manager.set_save_backend(backend_name)
+        character_manager.save_character(character, directory)
+
+        start = time.perf_counter()
+        for _ in range(count):
+            character_manager.add_gold(character, 1)
+            character_manager.save_character(character, directory)
+        elapsed = time.perf_counter() - start
+
+        character_manager.close_save_backends()
+    return count / elapsed
+
+
+def listing_seconds(characters):
+    with tempfile.TemporaryDirectory() as directory:
+        character_manager.set_save_backend("file")
+        with character_manager.group_commit(directory):
+            for character in characters:
+                character_manager.mark_dirty(character)
+                character_manager.save_character(character, directory)
+
+        start = time.perf_counter()
+        character_manager.list_character_summaries(directory)
+        manifest_time = time.perf_counter() - start
+
+        # No manifest: every save is read to rebuild it
+        os.remove(os.path.join(directory, character_manager.FileSaveBackend.MANIFEST_NAME))
+        start = time.perf_counter()
+        character_manager.list_character_summaries(directory)
+        scan_time = time.perf_counter() - start
+
+        character_manager.close_save_backends()
+    return manifest_time, scan_time
+
+
+def run(count, batch_size):
+    characters = make_characters(count)
+    print(f"=== SAVE THROUGHPUT ({count} saves, group commits of {batch_size}) ===")
+    for backend_name in character_manager.SAVE_BACKENDS:
+        single = saves_per_second(backend_name, characters, 1)
+        grouped = saves_per_second(backend_name, characters, batch_size)
+        print(f"\n{backend_name}:")
+        print(f"  fsync per save: {single:10,.0f} saves/s")
+        print(f"  group commit:   {grouped:10,.0f} saves/s")
+        print(f"  Speedup:        {grouped / single:10.2f}x")
+
+    print(f"\n=== SMALL CHANGES TO A LARGE CHARACTER ({count // 10} saves) ===")
+    for backend_name in character_manager.SAVE_BACKENDS:
+        rate = small_changes_per_second(backend_name, count // 10)
+        print(f"  {backend_name:<8} {rate:10,.0f} saves/s")
+
+    manifest_time, scan_time = listing_seconds(characters)
+    print(f"\n=== LISTING {count} SAVES WITH CLASS AND LEVEL ===")
+    print(f"  Manifest:      {manifest_time * 1000:10.1f} ms")
+    print(f"  Reading saves: {scan_time * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    save_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    batch = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    run(save_count, batch)
@@ -0,0 +1,185 @@
+"""
+Benchmark: Record Schema Parsing
+Compares the old hand-written if/elif parser + dict validator against the
+compiled record schema, in records per second
+
+Usage: python benchmarks/bench_schema.py [record_count]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+from custom_exceptions import InvalidDataFormatError
+from bench_snapshot import write_quest_file, write_item_file
+
+# ============================================================================
+# ORIGINAL IMPLEMENTATION (for comparison only)
+# ============================================================================
+
+def legacy_parse_quest_block(lines):
+    quest = {}
+    try:
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            if ':' not in line:
+                raise InvalidDataFormatError(f"Malformed line in quest data: {line}")
+            key, value = line.split(':', 1)
+            key = key.strip().lower()
+            value = value.strip()
+            if key == 'quest_id':
+                quest['quest_id'] = value
+            elif key == 'title':
+                quest['title'] = value
+            elif key == 'description':
+                quest['description'] = value
+            elif key == 'reward_xp':
+                quest['reward_xp'] = int(value)
+            elif key == 'reward_gold':
+                quest['reward_gold'] = int(value)
+            elif key == 'required_level':
+                quest['required_level'] = int(value)
+            elif key == 'prerequisite':
+                quest['prerequisite'] = value
+            else:
+                raise InvalidDataFormatError(f"Unknown field in quest: {key}")
+    except ValueError as e:
+        raise InvalidDataFormatError(f"Could not convert value to correct type: {e}")
+    return quest
+
+
+def legacy_validate_quest_data(quest_dict):
+    required_fields = {
+        'quest_id': str,
+        'title': str,
+        'description': str,
+        'reward_xp': int,
+        'reward_gold': int,
+        'required_level': int,
+        'prerequisite': str
+    }
+    for field, field_type in required_fields.items():
+        if field not in quest_dict:
+            raise InvalidDataFormatError(f"Missing required field: {field}")
+        if not isinstance(quest_dict[field], field_type):
+            raise InvalidDataFormatError(f"Invalid type for field '{field}'")
+    return True
+
+
+def legacy_parse_item_block(lines):
+    item = {}
+    try:
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            if ':' not in line:
+                raise InvalidDataFormatError(f"Malformed line in item data: {line}")
+            key, value = line.split(':', 1)
+            key = key.strip().lower()
+            value = value.strip()
+            if key == 'item_id':
+                item['item_id'] = value
+            elif key == 'name':
+                item['name'] = value
+            elif key == 'type':
+                item['type'] = value.lower()
+            elif key == 'effect':
+                item['effect'] = value
+            elif key == 'cost':
+                item['cost'] = int(value)
+            elif key == 'description':
+                item['description'] = value
+            else:
+                raise InvalidDataFormatError(f"Unknown field in item: {key}")
+    except ValueError as e:
+        raise InvalidDataFormatError(f"Could not convert value to correct type: {e}")
+    return item
+
+
+def legacy_validate_item_data(item_dict):
+    required_fields = {
+        'item_id': str,
+        'name': str,
+        'type': str,
+        'effect': (str, dict),
+        'cost': int,
+        'description': str
+    }
+    for field, field_type in required_fields.items():
+        if field not in item_dict:
+            raise InvalidDataFormatError(f"Missing required field: {field}")
+        if not isinstance(item_dict[field], field_type):
+            raise InvalidDataFormatError(f"Invalid type for field '{field}'")
+    if item_dict['type'] not in ['weapon', 'armor', 'consumable']:
+        raise InvalidDataFormatError(f"Invalid item type: {item_dict['type']}")
+    return True
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def read_blocks(filename):
+    with open(filename, 'r') as file:
+        content = file.read()
+    return [block.split('\n') for block in content.strip().split('\n\n')]
+
+
+def records_per_second(blocks, load_block):
+    start = time.perf_counter()
+    for lines in blocks:
+        load_block(lines)
+    return len(blocks) / (time.perf_counter() - start)
+
+
+def run(count):
+    def legacy_quest(lines):
+        quest = legacy_parse_quest_block(lines)
+        legacy_validate_quest_data(quest)
+        return quest
+
+    def legacy_item(lines):
+        item = legacy_parse_item_block(lines)
+        legacy_validate_item_data(item)
+        return item
+
+    with tempfile.TemporaryDirectory() as directory:
+        quest_file = os.path.join(directory, "quests.txt")
+        item_file = os.path.join(directory, "items.txt")
+        write_quest_file(quest_file, count)
+        write_item_file(item_file, count)
+
+        print(f"=== SCHEMA BENCHMARK ({count} records each) ===")
+        for name, filename, before, after in [
+            ("quests", quest_file, legacy_quest, game_data.QUEST_SCHEMA.load),
+            ("items", item_file, legacy_item, game_data.ITEM_SCHEMA.load)
+        ]:
+            # Only time parse + validate, the file is read beforehand.
+            # The schema also parses item effects into an ItemEffect, work
+            # the old code left for every use_item/equip_weapon call.
+            blocks = read_blocks(filename)
+            for lines in blocks[:100]:
+                # Records are read-only, so compare through a dict copy
+                record = dict(after(lines))
+                if 'effect' in record:
+                    record['effect'] = str(record['effect'])
+                assert record == before(lines)
+
+            before_rate = max(records_per_second(blocks, before) for _ in range(3))
+            after_rate = max(records_per_second(blocks, after) for _ in range(3))
+
+            print(f"\n{name}:")
+            print(f"  Before (if/elif + dict validation): {before_rate:12,.0f} records/s")
+            print(f"  After (compiled schema):            {after_rate:12,.0f} records/s")
+            print(f"  Speedup:                            {after_rate / before_rate:12.2f}x")
+
+
+if __name__ == "__main__":
+    record_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    run(record_count)
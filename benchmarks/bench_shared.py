@@ -0,0 +1,56 @@
+"""
+Benchmark: Shared Memory Catalog
+Compares handing a process pool a pickled copy of the item catalog against
+handing it a SharedCatalog, for worker start-up time and per-worker memory
+
+(Forked workers also count pages still shared with the parent.)
+
+Usage: python benchmarks/bench_shared.py [record_count] [workers]
+"""
+
+import os
+import sys
+import time
+import resource
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+from bench_snapshot import write_item_file
+
+
+def worker_start(items):
+    # One lookup, like a worker that only needs a few items
+    items['item_0']
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_pool(items, workers):
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        peaks = list(pool.map(worker_start, [items] * workers))
+    return time.perf_counter() - start, max(peaks)
+
+
+def run(count, workers):
+    with tempfile.TemporaryDirectory() as directory:
+        item_file = os.path.join(directory, "items.txt")
+        write_item_file(item_file, count)
+        items = game_data.load_items(item_file)
+
+        print(f"=== SHARED CATALOG ({count} items, {workers} workers) ===")
+        copy_time, copy_rss = run_pool(items, workers)
+        with game_data.SharedCatalog.publish(items) as shared:
+            shared_time, shared_rss = run_pool(shared, workers)
+
+        # ru_maxrss is in KiB on Linux
+        print(f"  Pickled copy:  {copy_time:8.3f}s  {copy_rss / 1024:8.1f} MiB peak per worker")
+        print(f"  SharedCatalog: {shared_time:8.3f}s  {shared_rss / 1024:8.1f} MiB peak per worker")
+
+
+if __name__ == "__main__":
+    record_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    worker_count = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    run(record_count, worker_count)
@@ -0,0 +1,88 @@
+"""
+Benchmark: Catalog Snapshot Cache
+Compares a cold parse of quests/items against loading the warm snapshot
+
+Usage: python benchmarks/bench_snapshot.py [record_count]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+
+
+def write_quest_file(filename, count):
+    with open(filename, 'w') as file:
+        for i in range(count):
+            prerequisite = f"quest_{i - 1}" if i > 0 else "NONE"
+            file.write(f"QUEST_ID: quest_{i}\n")
+            file.write(f"TITLE: Quest Number {i}\n")
+            file.write(f"DESCRIPTION: Benchmark quest {i} with a reasonably long description line\n")
+            file.write(f"REWARD_XP: {50 + i % 500}\n")
+            file.write(f"REWARD_GOLD: {25 + i % 250}\n")
+            file.write(f"REQUIRED_LEVEL: {1 + i % 50}\n")
+            file.write(f"PREREQUISITE: {prerequisite}\n\n")
+
+
+def write_item_file(filename, count):
+    item_types = ['weapon', 'armor', 'consumable']
+    stats = ['strength', 'magic', 'health', 'max_health']
+    with open(filename, 'w') as file:
+        for i in range(count):
+            file.write(f"ITEM_ID: item_{i}\n")
+            file.write(f"NAME: Item Number {i}\n")
+            file.write(f"TYPE: {item_types[i % 3]}\n")
+            file.write(f"EFFECT: {stats[i % 4]}:{1 + i % 20}\n")
+            file.write(f"COST: {10 + i % 1000}\n")
+            file.write(f"DESCRIPTION: Benchmark item {i} with a reasonably long description line\n\n")
+
+
+def time_call(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def run(count):
+    with tempfile.TemporaryDirectory() as directory:
+        quest_file = os.path.join(directory, "quests.txt")
+        item_file = os.path.join(directory, "items.txt")
+        write_quest_file(quest_file, count)
+        write_item_file(item_file, count)
+
+        # Age the files so the snapshot can trust size + mtime on its own
+        old_time = time.time() - 60
+        for filename in (quest_file, item_file):
+            os.utime(filename, (old_time, old_time))
+
+        print(f"=== SNAPSHOT BENCHMARK ({count} records each) ===")
+        for name, loader, filename in [
+            ("quests", game_data.load_quests, quest_file),
+            ("items", game_data.load_items, item_file)
+        ]:
+            cold_time, cold = time_call(loader, filename)
+
+            # First snapshot load parses and writes the snapshot
+            write_time, _ = time_call(loader, filename, use_snapshot=True)
+            warm_time, warm = time_call(loader, filename, use_snapshot=True)
+
+            # Touching the file forces the content hash check
+            os.utime(filename)
+            touched_time, _ = time_call(loader, filename, use_snapshot=True)
+
+            assert warm == cold
+            print(f"\n{name}:")
+            print(f"  Cold parse:            {cold_time * 1000:9.1f} ms")
+            print(f"  Parse + write snapshot:{write_time * 1000:9.1f} ms")
+            print(f"  Warm snapshot load:    {warm_time * 1000:9.1f} ms")
+            print(f"  Snapshot after touch:  {touched_time * 1000:9.1f} ms")
+            print(f"  Speedup (warm):        {cold_time / warm_time:9.1f}x")
+
+
+if __name__ == "__main__":
+    record_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    run(record_count)
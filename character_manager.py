@@ -10,6 +10,18 @@ This module handles character creation, loading, and saving.
 """
 
 import os
+import json
+import zlib
+import time
+import atexit
+import asyncio
+import sqlite3
+import itertools
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from record_schema import RecordSchema, split_list
 from custom_exceptions import (
     InvalidCharacterClassError,
     CharacterNotFoundError,
@@ -47,7 +59,7 @@ def create_character(name, character_class):
         magic = 15
     
     # Create and return character dictionary
-    character = {
+    character = Character({
         'name': name,
         'class': character_class,
         'level': 1,
@@ -60,138 +72,1161 @@ def create_character(name, character_class):
         'inventory': [],
         'active_quests': [],
         'completed_quests': []
-    }
+    })
     return character
 
 
 def save_character(character, save_directory="data/save_games"):
     
     
-    # Create directory if it doesn't exist
-    if not os.path.exists(save_directory):
-        os.makedirs(save_directory)
+    # Nothing changed since the last save here, so the save is current
+    if not is_dirty(character, save_directory):
+        SAVE_STATS['skipped'] += 1
+        return True
+    
+    # Read the version first; a change made while writing stays dirty
+    _write_save(character, save_directory, character, getattr(character, 'version', None))
+    return True
+
+
+def _write_save(character, save_directory, tracked, version):
+    # The configured backend (text files by default) does the writing.
+    # tracked is marked saved at version once the save is committed
+    destination = _save_destination(character['name'], save_directory)
+    backend = get_save_backend(save_directory)
+    backend.save(character)
+    SAVE_STATS['written'] += 1
+    if isinstance(tracked, Character):
+        backend.mark_saved(tracked, destination, version)
+
+
+def load_character(character_name, save_directory="data/save_games"):
+    
+    
+    character = Character(get_save_backend(save_directory).load(character_name))
+    character.saved_versions[_save_destination(character_name, save_directory)] = character.version
+    return character
+
+
+def list_saved_characters(save_directory="data/save_games"):
+  
+    
+    return get_save_backend(save_directory).list_names()
+
+
+def list_character_summaries(save_directory="data/save_games"):
+    """
+    Get a summary of every saved character without loading the saves
+    
+    Returns: List of {'name', 'class', 'level', 'saved_at'} dictionaries
+             sorted by name ('saved_at' is a time.time() timestamp)
+    """
+    return get_save_backend(save_directory).list_summaries()
+
+
+def delete_character(character_name, save_directory="data/save_games"):
+  
+    
+    get_save_backend(save_directory).delete(character_name)
+    
+    # Characters marked saved here no longer are
+    location = _save_location(character_name, save_directory)
+    with _backends_lock:
+        _delete_counts[location] = _delete_counts.get(location, 0) + 1
+    return True
+
+# ============================================================================
+# CHANGE TRACKING
+# ============================================================================
+
+# Saves written vs skipped because the character hadn't changed
+SAVE_STATS = {'written': 0, 'skipped': 0}
+
+
+class Character(dict):
+    """
+    Character dictionary that knows whether it changed since its last save
+    
+    version goes up on every change (see mark_dirty) and saved_versions
+    holds the version last written to (or loaded from) each place it is
+    saved, so save_character can skip characters that haven't changed
+    since they were saved there. Compares equal to a plain dict with the
+    same fields.
+    
+    Every function in character_manager, inventory_system and
+    quest_handler that changes a character calls mark_dirty; code that
+    changes a character's fields directly must call it too. Plain dicts
+    aren't tracked and are always saved.
+    """
     
-    # Construct the filename
-    filename = os.path.join(save_directory, f"{character['name']}_save.txt")
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+        # _save_destination() -> version saved there
+        self.saved_versions = {}
+
+
+def mark_dirty(character):
+    """Record that the character changed and needs saving"""
+    if isinstance(character, Character):
+        character.version += 1
+
+
+def is_dirty(character, save_directory="data/save_games"):
+    """
+    Check if the character changed since it was last saved to or loaded
+    from save_directory (with the current backend)
     
+    Returns: True if it needs saving (always True for plain dicts)
+    """
+    if not isinstance(character, Character):
+        return True
+    destination = _save_destination(character['name'], save_directory)
+    return character.saved_versions.get(destination) != character.version
+
+
+# How many times each save has been deleted, by _save_location()
+_delete_counts = {}
+
+
+def _save_location(character_name, save_directory):
+    return (SAVE_BACKEND, os.path.abspath(save_directory), character_name)
+
+
+def _save_destination(character_name, save_directory):
+    # The delete count makes a save deleted since it was marked a new
+    # destination, so the character is written again
+    location = _save_location(character_name, save_directory)
+    return location + (_delete_counts.get(location, 0),)
+
+# ============================================================================
+# ASYNC SAVE/LOAD
+# ============================================================================
+
+async def aload_character(character_name, save_directory="data/save_games", executor=None):
+    """
+    Async version of load_character for asyncio programs
+    
+    Reads and parses the save file in an executor (default: the loop's
+    thread pool) so many saves can be loaded with asyncio.gather().
+    
+    Returns: Character dictionary
+    Raises: Same as load_character
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, load_character, character_name, save_directory
+    )
+
+
+async def asave_character(character, save_directory="data/save_games", executor=None):
+    """
+    Async version of save_character; writes the file in an executor
+    
+    The character must not be changed until the save has finished.
+    
+    Returns: True if successful
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, save_character, character, save_directory
+    )
+
+# ============================================================================
+# SAVE BACKENDS
+# ============================================================================
+
+# Which backend save_character & co. use: "file" (one text file per
+# character), "sqlite" (one database per save directory) or "journal"
+# (a text file per character plus a journal of changes). Can be set with
+# the QUEST_SAVE_BACKEND environment variable or set_save_backend().
+SAVE_BACKEND = os.environ.get("QUEST_SAVE_BACKEND", "file")
+
+# fsync every save so it survives a crash or power cut; group_commit()
+# shares one fsync window between many saves
+SAVE_FSYNC = True
+
+# Open backends, by (backend name, absolute save directory)
+_open_backends = {}
+_backends_lock = threading.Lock()
+
+
+def set_save_backend(backend_name):
+    """
+    Choose the backend used by save_character, load_character, etc.
+    
+    Args:
+        backend_name: "file", "sqlite" or "journal"
+    Raises: ValueError for an unknown backend
+    """
+    global SAVE_BACKEND
+    if backend_name not in SAVE_BACKENDS:
+        raise ValueError(f"Unknown save backend: {backend_name}")
+    SAVE_BACKEND = backend_name
+
+
+def get_save_backend(save_directory="data/save_games", backend_name=None):
+    """
+    Get the (shared, already open) backend for a save directory
+    
+    Args:
+        save_directory: Directory the saves live in
+        backend_name: Backend to use (default: SAVE_BACKEND)
+    Returns: SaveBackend instance
+    """
+    backend_name = backend_name or SAVE_BACKEND
+    if backend_name not in SAVE_BACKENDS:
+        raise ValueError(f"Unknown save backend: {backend_name}")
+    
+    key = (backend_name, os.path.abspath(save_directory))
+    with _backends_lock:
+        backend = _open_backends.get(key)
+        if backend is None:
+            backend = SAVE_BACKENDS[backend_name](save_directory)
+            _open_backends[key] = backend
+    return backend
+
+
+def close_save_backends():
+    """Close every open backend (database connections etc.)"""
+    with _backends_lock:
+        for backend in _open_backends.values():
+            backend.close()
+        _open_backends.clear()
+
+
+@contextmanager
+def group_commit(save_directory="data/save_games"):
+    """
+    Batch every save made inside the 'with' block into one commit
+    
+    With the file backend each save is written to its own temp file as
+    usual, then at the end of the block all temp files are synced and
+    renamed into place together (one directory sync). With SQLite the
+    block is one transaction, and with the journal backend the journals
+    appended to are synced once at the end. Saves made by other threads
+    during the block join the batch. With the file backend, saves in the
+    block only show up in load_character once the block ends, and the
+    characters saved in it only count as saved (see is_dirty) once the
+    commit has succeeded.
+    
+    Usage:
+        with character_manager.group_commit():
+            for character in characters:
+                character_manager.save_character(character)
+    """
+    backend = get_save_backend(save_directory)
+    backend.begin_batch()
+    committed = False
     try:
-        with open(filename, 'w') as file:
-            # Write each character field to the file
-            file.write(f"NAME: {character['name']}\n")
-            file.write(f"CLASS: {character['class']}\n")
-            file.write(f"LEVEL: {character['level']}\n")
-            file.write(f"HEALTH: {character['health']}\n")
-            file.write(f"MAX_HEALTH: {character['max_health']}\n")
-            file.write(f"STRENGTH: {character['strength']}\n")
-            file.write(f"MAGIC: {character['magic']}\n")
-            file.write(f"EXPERIENCE: {character['experience']}\n")
-            file.write(f"GOLD: {character['gold']}\n")
-            
-            # Convert lists to comma-separated strings
-            inventory_str = ','.join(character['inventory'])
-            file.write(f"INVENTORY: {inventory_str}\n")
-            
-            active_quests_str = ','.join(character['active_quests'])
-            file.write(f"ACTIVE_QUESTS: {active_quests_str}\n")
+        yield backend
+    finally:
+        try:
+            backend.end_batch()
+            committed = True
+        finally:
+            backend.finish_batch(committed)
+
+
+def character_to_fields(character):
+    """
+    Get the saved form of a character
+    
+    Returns: List of (field name, value) in save file order, with lists
+             joined into comma-separated strings
+    """
+    fields = []
+    for name in CHARACTER_SCHEMA.field_names:
+        value = character[name]
+        if isinstance(value, list):
+            value = ','.join(value)
+        fields.append((name, value))
+    return fields
+
+
+class SaveBackend(ABC):
+    """
+    Where characters are stored
+    
+    Backends must implement save, load, list_names, list_summaries and
+    delete with the same behaviour and exceptions as the module-level
+    functions (a backend missing one can't be created), and can group saves made between begin_batch() and end_batch().
+    """
+    
+    def __init__(self):
+        self.batch_depth = 0
+        # (character, destination, version) saved in the current batch,
+        # marked saved only once the batch commits
+        self.uncommitted = []
+        self.uncommitted_lock = threading.Lock()
+    
+    def mark_saved(self, character, destination, version):
+        """Record the version of a character this backend has written"""
+        with self.uncommitted_lock:
+            if self.batch_depth:
+                self.uncommitted.append((character, destination, version))
+                return
+        character.saved_versions[destination] = version
+    
+    def finish_batch(self, committed):
+        """
+        Mark the characters saved in a batch once end_batch() has run
+        
+        Args:
+            committed: False if the commit failed, so none of them count
+                       as saved
+        """
+        with self.uncommitted_lock:
+            # Still inside another group_commit (maybe another thread's)
+            if self.batch_depth:
+                return
+            uncommitted = self.uncommitted
+            self.uncommitted = []
+        if committed:
+            for character, destination, version in uncommitted:
+                character.saved_versions[destination] = version
+    
+    @abstractmethod
+    def save(self, character):
+        raise NotImplementedError
+    
+    @abstractmethod
+    def load(self, character_name):
+        raise NotImplementedError
+    
+    @abstractmethod
+    def list_names(self):
+        raise NotImplementedError
+    
+    @abstractmethod
+    def list_summaries(self):
+        raise NotImplementedError
+    
+    @abstractmethod
+    def delete(self, character_name):
+        raise NotImplementedError
+    
+    def begin_batch(self):
+        pass
+    
+    def end_batch(self):
+        pass
+    
+    def close(self):
+        pass
+
+
+class FileSaveBackend(SaveBackend):
+    """
+    One '<name>_save.txt' file of "KEY: value" lines per character
+    
+    Saves are written to a temp file and renamed over the old save, so a
+    crash leaves either the old or the new save, never half of one.
+    
+    A 'manifest.jsonl' in the save directory gets a line with the name,
+    class, level and save time for every save and delete, so the saves
+    can be listed with one read. It isn't synced, since it can always be
+    rebuilt from the saves: that happens when it is missing, unreadable
+    or older than the directory (a save added or removed without it).
+    The directory is only compared while none of our own saves are under
+    way, since they change it before they reach the manifest.
+    """
+    
+    MANIFEST_NAME = "manifest.jsonl"
+    
+    # Rewrite the manifest when it has this many more lines than twice
+    # the number of saves it lists
+    MANIFEST_SLACK = 1000
+    
+    def __init__(self, save_directory, fsync=None):
+        super().__init__()
+        self.save_directory = save_directory
+        self.fsync = SAVE_FSYNC if fsync is None else fsync
+        self.lock = threading.Lock()
+        self.manifest_lock = threading.RLock()
+        # Save file -> (temp file, summary) waiting for the batch to commit
+        self.pending = {}
+        # Saves and deletes (or batches) started but not in the manifest yet
+        self.changes_in_progress = 0
+        self.manifest_is_stale = False
+    
+    def path(self, character_name):
+        return os.path.join(self.save_directory, f"{character_name}_save.txt")
+    
+    def save_files(self, character_name):
+        return [self.path(character_name)]
+    
+    def manifest_path(self):
+        return os.path.join(self.save_directory, self.MANIFEST_NAME)
+    
+    def save(self, character):
+        # Create directory if it doesn't exist (exist_ok in case another
+        # thread creates it at the same moment)
+        os.makedirs(self.save_directory, exist_ok=True)
+        
+        text = ''.join(f"{name.upper()}: {value}\n" for name, value in character_to_fields(character))
+        filename = self.path(character['name'])
+        summary = _character_summary(character)
+        
+        with self.lock:
+            if self.batch_depth:
+                # Replace any earlier save of this character in the batch
+                temp_file = _write_temp_file(filename, text, fsync=False)
+                old_save = self.pending.pop(filename, None)
+                if old_save is not None:
+                    os.remove(old_save[0])
+                self.pending[filename] = (temp_file, summary)
+                return True
+        
+        entries = []
+        self._begin_change()
+        try:
+            temp_file = _write_temp_file(filename, text, self.fsync)
+            os.replace(temp_file, filename)
+            if self.fsync:
+                _fsync_directory(self.save_directory)
+            entries.append(summary)
+        finally:
+            self._end_change(entries)
+        return True
+    
+    def begin_batch(self):
+        with self.lock:
+            if self.batch_depth == 0:
+                self._begin_change()
+            self.batch_depth += 1
+    
+    def end_batch(self):
+        with self.lock:
+            self.batch_depth -= 1
+            if self.batch_depth:
+                return
+            pending = self.pending
+            self.pending = {}
             
-            completed_quests_str = ','.join(character['completed_quests'])
-            file.write(f"COMPLETED_QUESTS: {completed_quests_str}\n")
+            entries = []
+            try:
+                # Sync every file first, then rename them all, then sync the
+                # directory once so the renames are durable too
+                if self.fsync:
+                    for temp_file, summary in pending.values():
+                        _fsync_file(temp_file)
+                for filename, (temp_file, summary) in pending.items():
+                    os.replace(temp_file, filename)
+                    entries.append(summary)
+                if self.fsync and pending:
+                    _fsync_directory(self.save_directory)
+            finally:
+                self._end_change(entries)
+    
+    def load(self, character_name):
+        filename = self.path(character_name)
+        
+        # Check if file exists
+        if not os.path.exists(filename):
+            raise CharacterNotFoundError(f"Character '{character_name}' not found.")
+        
+        # Try to read the file
+        try:
+            with open(filename, 'r') as file:
+                lines = file.readlines()
+        except Exception as e:
+            raise SaveFileCorruptedError(f"Could not read save file for '{character_name}': {e}")
+        
+        # Parse the file
+        try:
+            # Converts each line to the right type and checks every field is there
+            return CHARACTER_SCHEMA.load(lines)
+        except InvalidSaveDataError:
+            raise
+        except Exception as e:
+            raise InvalidSaveDataError(f"Invalid save data for '{character_name}': {e}")
+    
+    def list_names(self):
+        return [summary['name'] for summary in self.list_summaries()]
+    
+    def list_summaries(self):
+        if not os.path.exists(self.save_directory):
+            return []
         
+        with self.manifest_lock:
+            if self.changes_in_progress:
+                stale = self.manifest_is_stale
+            else:
+                stale = self._manifest_stale()
+            summaries = None if stale else self._read_manifest()
+            if summaries is None:
+                summaries = self._rebuild_manifest()
+        return sorted(summaries.values(), key=lambda summary: summary['name'])
+    
+    def delete(self, character_name):
+        filename = self.path(character_name)
+        if not os.path.exists(filename):
+            raise CharacterNotFoundError(f"Character '{character_name}' not found.")
+        
+        entries = []
+        self._begin_change()
+        try:
+            for save_file in self.save_files(character_name):
+                if os.path.exists(save_file):
+                    os.remove(save_file)
+            entries.append({'name': character_name, 'deleted': True})
+        finally:
+            self._end_change(entries)
         return True
     
-    except (PermissionError, IOError) as e:
-        raise e
+    def _manifest_stale(self):
+        """Check if the manifest is missing or older than the save directory"""
+        try:
+            manifest_time = os.stat(self.manifest_path()).st_mtime_ns
+            return os.stat(self.save_directory).st_mtime_ns > manifest_time
+        except FileNotFoundError:
+            return True
+    
+    def _begin_change(self):
+        # Call before touching the save directory
+        with self.manifest_lock:
+            if self.changes_in_progress == 0:
+                self.manifest_is_stale = self._manifest_stale()
+            self.changes_in_progress += 1
+    
+    def _end_change(self, entries):
+        """
+        Add save or delete entries to the manifest once a change is done
+        
+        Args:
+            entries: Summaries of saved characters, or {'name', 'deleted'}
+        """
+        with self.manifest_lock:
+            self.changes_in_progress -= 1
+            if self.manifest_is_stale:
+                self._rebuild_manifest()
+                self.manifest_is_stale = False
+            elif entries:
+                with open(self.manifest_path(), 'a', encoding='utf-8') as file:
+                    file.write(''.join(_manifest_line(entry) for entry in entries))
+    
+    def _read_manifest(self):
+        """
+        Read the manifest, rewriting it if it has many old entries
+        
+        Returns: Dictionary of name -> summary, or None if the manifest
+                 can't be read (a line cut short, bad JSON, ...)
+        """
+        summaries = {}
+        line_count = 0
+        try:
+            with open(self.manifest_path(), 'r', encoding='utf-8') as file:
+                for line in file:
+                    if not line.endswith("\n"):
+                        return None
+                    entry = json.loads(line)
+                    if entry.get('deleted'):
+                        summaries.pop(entry['name'], None)
+                    else:
+                        summaries[entry['name']] = entry
+                    line_count += 1
+        except (OSError, ValueError, KeyError, AttributeError):
+            return None
+        
+        if line_count > 2 * len(summaries) + self.MANIFEST_SLACK:
+            self._write_manifest(summaries)
+        return summaries
+    
+    def _rebuild_manifest(self):
+        """
+        Write a new manifest from the save files
+        
+        Returns: Dictionary of name -> summary
+        """
+        summaries = {}
+        # Nothing saved yet (a batch with no saves, or a failed first save)
+        if not os.path.isdir(self.save_directory):
+            return summaries
+        with self.manifest_lock:
+            for filename in os.listdir(self.save_directory):
+                if not filename.endswith("_save.txt"):
+                    continue
+                # Remove the '_save.txt' ending (9 characters)
+                name = filename[:-9]
+                try:
+                    summary = _character_summary(self._read_character(name))
+                    summary['saved_at'] = max(os.path.getmtime(save_file)
+                                              for save_file in self.save_files(name)
+                                              if os.path.exists(save_file))
+                except (CharacterNotFoundError, FileNotFoundError, ValueError):
+                    # Deleted while we were looking
+                    continue
+                except (SaveFileCorruptedError, InvalidSaveDataError):
+                    # Still listed, so it can be picked and the error shown
+                    summary = {'name': name, 'class': None, 'level': None,
+                               'saved_at': os.path.getmtime(self.path(name))}
+                summaries[name] = summary
+            self._write_manifest(summaries)
+        return summaries
+    
+    def _read_character(self, character_name):
+        # Load for a listing; backends override this to skip caching
+        return self.load(character_name)
+    
+    def _write_manifest(self, summaries):
+        manifest = self.manifest_path()
+        text = ''.join(_manifest_line(summary) for summary in summaries.values())
+        temp_file = _write_temp_file(manifest, text, fsync=False)
+        os.replace(temp_file, manifest)
+        # The rename made the directory newer than the manifest's contents
+        os.utime(manifest)
 
 
-def load_character(character_name, save_directory="data/save_games"):
-    # Construct the filename
-    filename = os.path.join(save_directory, f"{character_name}_save.txt")
+def _character_summary(character):
+    return {
+        'name': character['name'],
+        'class': character['class'],
+        'level': character['level'],
+        'saved_at': time.time()
+    }
+
+
+def _manifest_line(entry):
+    return json.dumps(entry, separators=(',', ':')) + "\n"
+
+
+def _write_temp_file(filename, text, fsync):
+    # Unique name next to the real file so os.replace() stays atomic
+    temp_file = f"{filename}.{os.getpid()}-{next(_temp_counter)}.tmp"
+    try:
+        with open(temp_file, 'w') as file:
+            file.write(text)
+            if fsync:
+                file.flush()
+                os.fsync(file.fileno())
+    except BaseException:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+    return temp_file
+
+
+def _fsync_file(filename):
+    with open(filename, 'rb+') as file:
+        os.fsync(file.fileno())
+
+
+def _fsync_directory(directory):
+    # Makes renames durable; not every platform can open a directory
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+_temp_counter = itertools.count()
+
+
+class SQLiteSaveBackend(SaveBackend):
+    """
+    All characters in one SQLite database ('saves.db' in the save directory)
     
-    # Check if file exists
-    if not os.path.exists(filename):
-        raise CharacterNotFoundError(f"Character '{character_name}' not found.")
+    Uses WAL mode so reads don't block writes, and indexes level and
+    class for queries over many characters (name is the primary key). One
+    connection is shared by all threads, guarded by a lock. Each save is
+    its own transaction, except inside group_commit() where the whole
+    batch is one.
+    """
     
-    # Try to read the file
-    try:
-        with open(filename, 'r') as file:
-            lines = file.readlines()
-    except Exception as e:
-        raise SaveFileCorruptedError(f"Could not read save file for '{character_name}': {e}")
+    DATABASE_NAME = "saves.db"
+    COLUMNS = ('name', 'class', 'level', 'health', 'max_health', 'strength', 'magic',
+               'experience', 'gold', 'inventory', 'active_quests', 'completed_quests')
     
-    # Parse the file
-    character = {}
-    try:
-        for line in lines:
-            line = line.strip()
-            
-            # Skip empty lines
-            if not line:
-                continue
-            
-            # Check for colon separator
-            if ":" not in line:
-                raise InvalidSaveDataError(f"Malformed line in save file: {line}")
+    # Statements are fixed strings, so sqlite3 prepares each one once and
+    # reuses it from its statement cache
+    SAVE_SQL = (f"INSERT OR REPLACE INTO characters ({', '.join(COLUMNS)}, saved_at) "
+                f"VALUES ({', '.join('?' * (len(COLUMNS) + 1))})")
+    LOAD_SQL = f"SELECT {', '.join(COLUMNS)} FROM characters WHERE name = ?"
+    LIST_SQL = "SELECT name FROM characters ORDER BY name"
+    SUMMARY_SQL = "SELECT name, class, level, saved_at FROM characters ORDER BY name"
+    DELETE_SQL = "DELETE FROM characters WHERE name = ?"
+    
+    def __init__(self, save_directory, fsync=None):
+        super().__init__()
+        self.save_directory = save_directory
+        self.lock = threading.RLock()
+        fsync = SAVE_FSYNC if fsync is None else fsync
+        os.makedirs(save_directory, exist_ok=True)
+        
+        try:
+            self.connection = sqlite3.connect(
+                os.path.join(save_directory, self.DATABASE_NAME),
+                check_same_thread=False, isolation_level=None
+            )
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            # FULL syncs the WAL on every commit; NORMAL leaves that to
+            # checkpoints (a crash can lose the last commits, not corrupt)
+            self.connection.execute(f"PRAGMA synchronous={'FULL' if fsync else 'NORMAL'}")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS characters ("
+                "name TEXT PRIMARY KEY, class TEXT NOT NULL, level INTEGER NOT NULL, "
+                "health INTEGER NOT NULL, max_health INTEGER NOT NULL, "
+                "strength INTEGER NOT NULL, magic INTEGER NOT NULL, "
+                "experience INTEGER NOT NULL, gold INTEGER NOT NULL, "
+                "inventory TEXT NOT NULL, active_quests TEXT NOT NULL, "
+                "completed_quests TEXT NOT NULL, saved_at REAL NOT NULL DEFAULT 0)"
+            )
+            columns = {row[1] for row in self.connection.execute("PRAGMA table_info(characters)")}
+            if 'saved_at' not in columns:
+                # Databases made before saves were timestamped
+                self.connection.execute(
+                    "ALTER TABLE characters ADD COLUMN saved_at REAL NOT NULL DEFAULT 0"
+                )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS characters_level ON characters (level)"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS characters_class ON characters (class)"
+            )
+        except sqlite3.Error as e:
+            raise SaveFileCorruptedError(f"Could not open save database: {e}")
+    
+    def save(self, character):
+        values = [value for name, value in character_to_fields(character)]
+        values.append(time.time())
+        with self.lock:
+            self.connection.execute(self.SAVE_SQL, values)
+        return True
+    
+    def load(self, character_name):
+        try:
+            with self.lock:
+                row = self.connection.execute(self.LOAD_SQL, (character_name,)).fetchone()
+        except sqlite3.Error as e:
+            raise SaveFileCorruptedError(f"Could not read save for '{character_name}': {e}")
+        
+        if row is None:
+            raise CharacterNotFoundError(f"Character '{character_name}' not found.")
+        
+        try:
+            return CHARACTER_SCHEMA.load_mapping(dict(zip(self.COLUMNS, row)))
+        except InvalidSaveDataError:
+            raise
+        except Exception as e:
+            raise InvalidSaveDataError(f"Invalid save data for '{character_name}': {e}")
+    
+    def list_names(self):
+        with self.lock:
+            return [row[0] for row in self.connection.execute(self.LIST_SQL)]
+    
+    def list_summaries(self):
+        with self.lock:
+            rows = self.connection.execute(self.SUMMARY_SQL).fetchall()
+        return [{'name': name, 'class': character_class, 'level': level, 'saved_at': saved_at}
+                for name, character_class, level, saved_at in rows]
+    
+    def begin_batch(self):
+        with self.lock:
+            if self.batch_depth == 0:
+                self.connection.execute("BEGIN")
+            self.batch_depth += 1
+    
+    def end_batch(self):
+        with self.lock:
+            self.batch_depth -= 1
+            if self.batch_depth == 0:
+                try:
+                    self.connection.execute("COMMIT")
+                except sqlite3.Error:
+                    # Don't leave the transaction open for every later save
+                    if self.connection.in_transaction:
+                        self.connection.execute("ROLLBACK")
+                    raise
+    
+    def delete(self, character_name):
+        with self.lock:
+            deleted = self.connection.execute(self.DELETE_SQL, (character_name,)).rowcount
+        if not deleted:
+            raise CharacterNotFoundError(f"Character '{character_name}' not found.")
+        return True
+    
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+# The journal backend rewrites a character's full save once its journal
+# would grow past this many bytes
+JOURNAL_COMPACT_SIZE = 16 * 1024
+# How many characters' last saved fields the journal backend keeps; the
+# least recently used are dropped and read from disk on their next save
+JOURNAL_CACHE_SIZE = 256
+
+
+class JournalSaveBackend(FileSaveBackend):
+    """
+    A '<name>_save.txt' snapshot plus a '<name>_save.journal' of changes
+    
+    Each save appends one JSON line holding only the fields that changed
+    since the last save, so a save costs bytes in proportion to the
+    change rather than the character. Lists that only grew or shrank are
+    stored as the items added ("inventory+") or removed ("inventory-").
+    load() reads the snapshot and replays the journal over it. When the
+    journal would pass JOURNAL_COMPACT_SIZE the full character is written
+    as a new snapshot (atomically, like FileSaveBackend) and the journal
+    starts again.
+    
+    The last saved fields are kept for up to JOURNAL_CACHE_SIZE recently
+    saved or loaded characters. Listing saves doesn't add to them.
+    
+    The journal's first line holds a checksum of the snapshot it applies
+    to, so a journal left behind by a crash during compaction (or by a
+    save from the plain file backend) is ignored instead of replayed
+    twice. A last line cut short by a crash is dropped.
+    """
+    
+    def __init__(self, save_directory, fsync=None):
+        super().__init__(save_directory, fsync)
+        # One lock for saves and the manifest, since each uses the other
+        self.lock = threading.RLock()
+        self.manifest_lock = self.lock
+        # Character name -> (saved fields, snapshot checksum, journal size),
+        # least recently used first
+        self.states = OrderedDict()
+        # Journals appended to during a batch, synced when it ends
+        self.unsynced = set()
+    
+    def journal_path(self, character_name):
+        return os.path.join(self.save_directory, f"{character_name}_save.journal")
+    
+    def save_files(self, character_name):
+        return [self.path(character_name), self.journal_path(character_name)]
+    
+    def save(self, character):
+        name = character['name']
+        with self.lock:
+            state = self.states.get(name)
+            if state is None:
+                # First save since opening (or since it was dropped from
+                # the cache): start from what is on disk
+                try:
+                    state = self._read(name)[1]
+                except (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError):
+                    pass
             
-            # Split on colon and strip whitespace
-            key, value = line.split(":", 1)
-            key = key.strip()
-            value = value.strip()
+            if state is None:
+                record = None
+            else:
+                fields, base, journal_size = state
+                record = _journal_record(fields, character)
+                if not record:
+                    return True
             
-            # Parse different field types
-            if key in {"NAME", "CLASS"}:
-                character[key.lower()] = value
-            elif key in {"LEVEL", "HEALTH", "MAX_HEALTH", "STRENGTH", "MAGIC", "EXPERIENCE", "GOLD"}:
-                character[key.lower()] = int(value)
-            elif key in {"INVENTORY", "ACTIVE_QUESTS", "COMPLETED_QUESTS"}:
-                # Handle empty lists properly
-                if value == "" or value is None:
-                    character[key.lower()] = []
+            entries = []
+            self._begin_change()
+            try:
+                if record is None:
+                    self._write_snapshot(character)
                 else:
-                    # Split on comma and filter out empty strings
-                    items = [item.strip() for item in value.split(',') if item.strip()]
-                    character[key.lower()] = items
-            else:
-                raise InvalidSaveDataError(f"Unexpected key '{key}' in save file.")
+                    line = (json.dumps(record, separators=(',', ':')) + "\n").encode('utf-8')
+                    if journal_size + len(line) > JOURNAL_COMPACT_SIZE:
+                        self._write_snapshot(character)
+                    else:
+                        journal_size = self._append(name, base, journal_size, line)
+                        self._remember(name, (_saved_fields(character), base, journal_size))
+                entries.append(_character_summary(character))
+            finally:
+                self._end_change(entries)
+        return True
+    
+    def _write_snapshot(self, character):
+        name = character['name']
+        os.makedirs(self.save_directory, exist_ok=True)
+        text = ''.join(f"{field.upper()}: {value}\n" for field, value in character_to_fields(character))
+        
+        temp_file = _write_temp_file(self.path(name), text, self.fsync)
+        os.replace(temp_file, self.path(name))
+        # The new snapshot already holds everything in the old journal
+        if os.path.exists(self.journal_path(name)):
+            os.remove(self.journal_path(name))
+        if self.fsync:
+            _fsync_directory(self.save_directory)
+        
+        self.unsynced.discard(self.journal_path(name))
+        self._remember(name, (_saved_fields(character), zlib.crc32(text.encode('utf-8')), 0))
+    
+    def _remember(self, name, state):
+        with self.lock:
+            self.states[name] = state
+            self.states.move_to_end(name)
+            while len(self.states) > JOURNAL_CACHE_SIZE:
+                self.states.popitem(last=False)
+    
+    def _append(self, name, base, journal_size, line):
+        journal = self.journal_path(name)
+        if journal_size == 0:
+            # New journal (replacing any stale one) for this snapshot
+            line = (json.dumps({'base': base}) + "\n").encode('utf-8') + line
+            mode = 'wb'
+        else:
+            mode = 'r+b'
         
-        # Validate loaded character data
-        validate_character_data(character)
+        with open(journal, mode) as file:
+            # Write over anything past the last good line
+            file.seek(journal_size)
+            file.truncate()
+            file.write(line)
+            if self.fsync and not self.batch_depth:
+                file.flush()
+                os.fsync(file.fileno())
+        
+        if self.batch_depth:
+            self.unsynced.add(journal)
+        elif self.fsync and journal_size == 0:
+            _fsync_directory(self.save_directory)
+        return journal_size + len(line)
+    
+    def begin_batch(self):
+        with self.lock:
+            self.batch_depth += 1
+    
+    def end_batch(self):
+        with self.lock:
+            self.batch_depth -= 1
+            if self.batch_depth or not self.unsynced:
+                return
+            unsynced = self.unsynced
+            self.unsynced = set()
+            
+            if self.fsync:
+                for journal in unsynced:
+                    _fsync_file(journal)
+                _fsync_directory(self.save_directory)
+    
+    def load(self, character_name):
+        character, state = self._read(character_name)
+        self._remember(character_name, state)
         return character
     
-    except InvalidSaveDataError:
-        raise
-    except Exception as e:
-        raise InvalidSaveDataError(f"Invalid save data for '{character_name}': {e}")
+    def _read_character(self, character_name):
+        return self._read(character_name)[0]
+    
+    def _read(self, character_name):
+        """
+        Read a character's snapshot and replay its journal
+        
+        Returns: Tuple of (character, state to keep in self.states)
+        """
+        filename = self.path(character_name)
+        journal = self.journal_path(character_name)
+        
+        if not os.path.exists(filename):
+            raise CharacterNotFoundError(f"Character '{character_name}' not found.")
+        
+        try:
+            with open(filename, 'r') as file:
+                text = file.read()
+            entries = b''
+            if os.path.exists(journal):
+                with open(journal, 'rb') as file:
+                    entries = file.read()
+        except Exception as e:
+            raise SaveFileCorruptedError(f"Could not read save file for '{character_name}': {e}")
+        
+        try:
+            character = CHARACTER_SCHEMA.load(text.splitlines())
+            base = zlib.crc32(text.encode('utf-8'))
+            journal_size = _replay_journal(character, entries, base)
+            CHARACTER_SCHEMA.validate(character)
+        except InvalidSaveDataError:
+            raise
+        except Exception as e:
+            raise InvalidSaveDataError(f"Invalid save data for '{character_name}': {e}")
+        
+        return character, (_saved_fields(character), base, journal_size)
+    
+    def delete(self, character_name):
+        with self.lock:
+            super().delete(character_name)
+            self.states.pop(character_name, None)
+        return True
 
 
-def list_saved_characters(save_directory="data/save_games"):
-  
-    if not os.path.exists(save_directory):
-        return []
+def _saved_fields(character):
+    # Copies lists so later changes to the character don't show up here
+    return {name: list(character[name]) if isinstance(character[name], list) else character[name]
+            for name in CHARACTER_SCHEMA.field_names}
+
+
+def _journal_record(fields, character):
+    # The changes from the saved fields to the character, as a journal record
+    record = {}
+    for name, before in fields.items():
+        after = character[name]
+        if after == before:
+            continue
+        if isinstance(after, list):
+            if after[:len(before)] == before:
+                record[name + '+'] = after[len(before):]
+                continue
+            removed = _removed_items(before, after)
+            if removed is not None:
+                record[name + '-'] = removed
+                continue
+            after = list(after)
+        record[name] = after
+    return record
+
+
+def _removed_items(before, after):
+    # The items list.remove() takes out of before to leave after, if any
+    if len(after) >= len(before):
+        return None
+    removed = list((Counter(before) - Counter(after)).elements())
+    remaining = list(before)
+    for item in removed:
+        remaining.remove(item)
+    return removed if remaining == after else None
+
+
+def _replay_journal(character, entries, base):
+    """
+    Apply journal records to a character loaded from its snapshot
     
-    # Get all saved character names
-    character_names = []
-    for filename in os.listdir(save_directory):
-        if filename.endswith("_save.txt"):
-            # Remove the '_save.txt' extension (9 characters)
-            character_name = filename[:-9]
-            character_names.append(character_name)
+    Returns: Size in bytes of the journal up to its last complete line,
+             or 0 if there is no journal for this snapshot
+    """
+    # Anything after the last newline is a write cut short by a crash
+    end = entries.rfind(b"\n") + 1
+    lines = entries[:end].splitlines()
+    if not lines or json.loads(lines[0]).get('base') != base:
+        return 0
     
-    return character_names
+    for line in lines[1:]:
+        for key, value in json.loads(line).items():
+            if key.endswith('+'):
+                character[key[:-1]].extend(value)
+            elif key.endswith('-'):
+                for item in value:
+                    character[key[:-1]].remove(item)
+            elif key in character:
+                character[key] = value
+            else:
+                raise InvalidSaveDataError(f"Unexpected key '{key}' in save journal.")
+    return end
 
 
-def delete_character(character_name, save_directory="data/save_games"):
-  
+SAVE_BACKENDS = {
+    'file': FileSaveBackend,
+    'sqlite': SQLiteSaveBackend,
+    'journal': JournalSaveBackend
+}
+
+# ============================================================================
+# AUTOSAVE
+# ============================================================================
+
+# Seconds the autosave thread waits between writes
+AUTOSAVE_INTERVAL = 5.0
+
+
+class AutosaveWriter:
+    """
+    Background thread that writes saves so the game never waits on disk
+    
+    submit() copies the character and returns straight away. Saves of
+    the same character that pile up before the next write are merged, so
+    only the newest copy is written. Pending saves are written every
+    `interval` seconds (as one group commit), whenever flush() is called,
+    and on close() or interpreter exit.
     
-    # Construct the filename
-    filename = os.path.join(save_directory, f"{character_name}_save.txt")
+    Errors from the thread are collected in self.errors for the caller
+    to report.
+    """
     
-    # Check if file exists
-    if not os.path.exists(filename):
-        raise CharacterNotFoundError(f"Character '{character_name}' not found.")
+    def __init__(self, save_directory="data/save_games", interval=AUTOSAVE_INTERVAL):
+        self.save_directory = save_directory
+        self.interval = interval
+        self.pending = {}
+        self.errors = []
+        self.written = 0
+        self.writing = False
+        self.flush_requested = False
+        self.closed = False
+        self.condition = threading.Condition()
+        
+        self.thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
     
-    # Delete the file
-    os.remove(filename)
-    return True
+    def submit(self, character):
+        """Queue a save of the character as it is right now"""
+        if not is_dirty(character, self.save_directory):
+            SAVE_STATS['skipped'] += 1
+            return
+        
+        snapshot = {key: list(value) if isinstance(value, list) else value
+                    for key, value in character.items()}
+        version = getattr(character, 'version', None)
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("Autosave writer is closed")
+            # The character itself is kept so it can be marked saved
+            self.pending[character['name']] = (character, snapshot, version)
+    
+    def flush(self):
+        """Write every pending save now and wait until they are on disk"""
+        with self.condition:
+            self.flush_requested = True
+            self.condition.notify_all()
+            self.condition.wait_for(lambda: not self.pending and not self.writing)
+    
+    def close(self):
+        """Write what is pending and stop the thread"""
+        with self.condition:
+            if self.closed:
+                return
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join()
+        atexit.unregister(self.close)
+    
+    def _run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(
+                    lambda: self.closed or self.flush_requested, timeout=self.interval
+                )
+                batch = self.pending
+                self.pending = {}
+                self.writing = True
+                self.flush_requested = False
+                closing = self.closed
+            
+            if batch:
+                self._write(batch)
+            
+            with self.condition:
+                self.writing = False
+                self.condition.notify_all()
+            
+            if closing:
+                return
+    
+    def _write(self, batch):
+        try:
+            with group_commit(self.save_directory):
+                for character, snapshot, version in batch.values():
+                    try:
+                        # The character is marked saved when the batch commits
+                        _write_save(snapshot, self.save_directory, character, version)
+                        self.written += 1
+                    except Exception as e:
+                        self.errors.append(e)
+        except Exception as e:
+            self.errors.append(e)
 
 # ============================================================================
 # CHARACTER OPERATIONS
@@ -205,6 +1240,7 @@ def gain_experience(character, xp_amount):
     
     # Add experience
     character['experience'] += xp_amount
+    mark_dirty(character)
     
     # Check for level ups (can level up multiple times)
     while character['experience'] >= character['level'] * 100:
@@ -235,6 +1271,7 @@ def add_gold(character, amount):
     
     # Add the gold
     character['gold'] += amount
+    mark_dirty(character)
     return character['gold']
 
 
@@ -249,6 +1286,7 @@ def heal_character(character, amount):
     
     # Apply healing
     character['health'] += actual_heal
+    mark_dirty(character)
     return actual_heal
 
 
@@ -278,43 +1316,39 @@ def revive_character(character):
     
     # Revive with 50% health
     character['health'] = character['max_health'] // 2
+    mark_dirty(character)
     return True
 
 # ============================================================================
 # VALIDATION
 # ============================================================================
 
+CHARACTER_SCHEMA = RecordSchema(
+    "character",
+    [
+        ('name', str),
+        ('class', str),
+        ('level', int),
+        ('health', int),
+        ('max_health', int),
+        ('strength', int),
+        ('magic', int),
+        ('experience', int),
+        ('gold', int),
+        # Lists are saved as comma-separated strings
+        ('inventory', list, split_list),
+        ('active_quests', list, split_list),
+        ('completed_quests', list, split_list)
+    ],
+    InvalidSaveDataError,
+    malformed_message="Malformed line in save file: {line}",
+    unknown_message="Unexpected key '{key}' in save file."
+)
+
+
 def validate_character_data(character):
    
-    required_fields = {
-        'name': str,
-        'class': str,
-        'level': int,
-        'health': int,
-        'max_health': int,
-        'strength': int,
-        'magic': int,
-        'experience': int,
-        'gold': int,
-        'inventory': list,
-        'active_quests': list,
-        'completed_quests': list
-    }
-    
-    # Check each required field
-    for field, field_type in required_fields.items():
-        # Check if field exists
-        if field not in character:
-            raise InvalidSaveDataError(f"Missing required field: {field}")
-        
-        # Check field type
-        if not isinstance(character[field], field_type):
-            raise InvalidSaveDataError(
-                f"Invalid type for field '{field}': expected {field_type.__name__}, "
-                f"got {type(character[field]).__name__}"
-            )
-    
-    return True
+    return CHARACTER_SCHEMA.validate(character)
 
 # ============================================================================
 # TESTING
@@ -10,167 +10,1608 @@ This module handles loading and validating game data from text files.
 """
 
 import os
+import csv
+import json
+import hashlib
+import pickle
+import time
+import mmap
+import bisect
+import struct
+import asyncio
+from functools import partial
+from array import array
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from record_schema import Record, RecordSchema, LazyText
 from custom_exceptions import (
     InvalidDataFormatError,
     MissingDataFileError,
     CorruptedDataError
 )
 
+# NumPy is optional: column views fall back to the array module without it
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Bump this whenever the shape of loaded records changes so old snapshots
+# are ignored instead of handing back stale data
+SNAPSHOT_VERSION = 3
+
+# Catalog file formats, picked by extension (see get_catalog_format)
+CATALOG_EXTENSIONS = ('.txt', '.jsonl', '.csv')
+
+# Files changed this recently (in nanoseconds) are checked by content hash
+RACY_MTIME_WINDOW_NS = 2 * 10**9
+
 # ============================================================================
 # DATA LOADING FUNCTIONS
 # ============================================================================
 
-def load_quests(filename="data/quests.txt"):
-   
+def load_quests(filename="data/quests.txt", use_snapshot=False, workers=None, strict=True,
+                lazy_fields=()):
+    """
+    Load and validate all quests from a quest file or directory of files
+    
+    Args:
+        filename: Quest file, or a directory of quest files. Files can
+                  be .txt ("KEY: value" blocks), .jsonl or .csv
+        use_snapshot: Reuse/write the snapshot cache next to the file
+        workers: Processes used for a directory (default: CPU count)
+        strict: If False, keep going past bad quests and collect them
+        lazy_fields: Text fields to leave in the file until first used,
+                     e.g. ('description', 'title'). Saves memory when the
+                     text is rarely shown; the file must not be edited
+                     while the quests are in use. Only for .txt files.
+    
+    Returns: Dictionary of quest_id -> quest, or (quests, errors) when
+             strict is False. Each error is a dictionary with 'file',
+             'line', 'record_id' and 'message'.
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
     # Check if file exists
     if not os.path.exists(filename):
         #raises custom exception if file not found
         raise MissingDataFileError(f"Quest file not found: {filename}")
     
-    # Try to read the file
-    try:
-        with open(filename, 'r') as file:
-            content = file.read()
-    except Exception as e:
-        #raises corrupted data error if file cannot be read
-        raise CorruptedDataError(f"Could not read quest file: {e}")
+    return _load_catalog(filename, QUEST_SCHEMA, load_quests, use_snapshot, workers, strict,
+                         lazy_fields)
+
+
+def load_items(filename="data/items.txt", use_snapshot=False, workers=None, strict=True,
+               lazy_fields=()):
+    """
+    Load and validate all items from an item file or directory of files
     
-    # Parse quests separates them by blank lines)
-    quests = {}
-    quest_blocks = content.strip().split('\n\n')
+    Takes the same arguments and returns the same way as load_quests.
+    """
+    # Check if file exists
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"Item file not found: {filename}")
     
-    try:
-        for block in quest_blocks:
-            if not block.strip():
+    return _load_catalog(filename, ITEM_SCHEMA, load_items, use_snapshot, workers, strict,
+                         lazy_fields)
+
+
+def _load_catalog(filename, schema, load_file, use_snapshot, workers, strict, lazy_fields):
+    # With strict=False every bad record is collected instead of raised,
+    # and (records, errors) is returned
+    kind = schema.record_name + "s"
+    if lazy_fields:
+        # Lazy records hold file offsets, so they get their own snapshot
+        kind += "-lazy-" + "-".join(sorted(lazy_fields))
+    
+    # A directory holds several data files that are loaded in parallel
+    if os.path.isdir(filename):
+        return _load_shards(filename, load_file, schema.record_name,
+                            use_snapshot, workers, strict, lazy_fields)
+    
+    # Reuse the already-validated records if the file hasn't changed
+    if use_snapshot:
+        records = load_snapshot(filename, kind)
+        if records is not None:
+            # Snapshots are only written for files without errors
+            return records if strict else (records, [])
+    
+    # Stat before reading so the snapshot never claims a newer file
+    stat = os.stat(filename)
+    digest = hashlib.sha1() if use_snapshot else None
+    errors = None if strict else []
+    
+    # Store each record by its ID
+    records = {}
+    id_field = schema.id_field
+    for line_number, record in _iter_records(filename, schema, digest, errors, lazy_fields):
+        records[record[id_field]] = record
+    
+    if use_snapshot and not errors:
+        save_snapshot(filename, kind, records, stat, digest.hexdigest())
+    
+    if strict:
+        return records
+    return records, errors
+
+
+def _load_shards(directory, load_file, record_name, use_snapshot, workers, strict, lazy_fields):
+    # Every catalog file in the directory is one shard of the catalog
+    shard_files = sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if os.path.splitext(name)[1].lower() in CATALOG_EXTENSIONS
+    )
+    if not shard_files:
+        raise MissingDataFileError(f"No {record_name} files found in: {directory}")
+    
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(shard_files))
+    
+    shard_count = len(shard_files)
+    if workers <= 1:
+        shards = [load_file(shard_file, use_snapshot, 1, strict, lazy_fields)
+                  for shard_file in shard_files]
+    else:
+        # Hand out several files per task so hundreds of small shards
+        # don't spend all their time on process round trips
+        chunk_size = max(1, shard_count // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            shards = list(pool.map(
+                load_file, shard_files, [use_snapshot] * shard_count,
+                [1] * shard_count, [strict] * shard_count,
+                [lazy_fields] * shard_count, chunksize=chunk_size
+            ))
+    
+    # Merge in file name order so the result doesn't depend on timing
+    records = {}
+    sources = {}
+    errors = []
+    for shard_file, shard in zip(shard_files, shards):
+        if not strict:
+            shard, shard_errors = shard
+            errors.extend(shard_errors)
+        
+        for record_id, record in shard.items():
+            if record_id in records:
+                message = (f"Duplicate {record_name} ID '{record_id}' in {shard_file} "
+                           f"(already defined in {sources[record_id]})")
+                if strict:
+                    raise InvalidDataFormatError(message)
+                errors.append(_data_error(shard_file, None, record_id, message))
                 continue
-            
-            # Parse this quest block
-            lines = block.strip().split('\n')
+            records[record_id] = record
+            sources[record_id] = shard_file
+    
+    if strict:
+        return records
+    return records, errors
 
-            #reads lines and converts them into a quest dictionary
-            quest = parse_quest_block(lines)
-            
-            # Validate the quest
-            validate_quest_data(quest)
-            
-            # Stores each quest by its quest_id
-            quests[quest['quest_id']] = quest
+
+def iter_quests(filename="data/quests.txt", errors=None):
+    """
+    Read quests one at a time without loading the whole file
     
-    except InvalidDataFormatError:
-        raise
-    except Exception as e:
-        raise CorruptedDataError(f"Error parsing quest data: {e}")
+    Only the lines of the current quest are kept in memory, so this works
+    on catalogs of any size.
     
-    return quests
+    Args:
+        filename: Path of the quest file
+        errors: Optional list; bad quests are added to it (see
+                load_quests strict=False) and skipped instead of raised
+    
+    Yields: (line_number, quest) where line_number is the first line of
+            the quest in the file
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    return _iter_records(filename, QUEST_SCHEMA, errors=errors)
 
 
-def load_items(filename="data/items.txt"):
-  
-    # Check if file exists
+def iter_items(filename="data/items.txt", errors=None):
+    """
+    Read items one at a time without loading the whole file
+    
+    Args:
+        filename: Path of the item file
+        errors: Optional list; bad items are added to it and skipped
+    
+    Yields: (line_number, item) where line_number is the first line of
+            the item in the file
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    return _iter_records(filename, ITEM_SCHEMA, errors=errors)
+
+
+async def aload_quests(filename="data/quests.txt", executor=None, **options):
+    """
+    Async version of load_quests for asyncio programs
+    
+    The file is read and parsed in an executor so the event loop keeps
+    running, and several loads can be awaited together with
+    asyncio.gather(). Parsing is CPU work, so pass a ProcessPoolExecutor
+    as executor for loads that should really run side by side; the
+    default thread pool mostly overlaps the file I/O.
+    
+    Args:
+        filename: Quest file or directory (see load_quests)
+        executor: concurrent.futures executor to use (default: the loop's)
+        **options: Passed on to load_quests (use_snapshot, strict, ...)
+    
+    Returns: Same as load_quests
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(load_quests, filename, **options))
+
+
+async def aload_items(filename="data/items.txt", executor=None, **options):
+    """
+    Async version of load_items; works the same way as aload_quests
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(load_items, filename, **options))
+
+
+def _iter_records(filename, schema, digest=None, errors=None, lazy_fields=()):
+    # Check if file exists here so the error is raised when the caller asks
+    # for the records, not later on the first next()
     if not os.path.exists(filename):
-        raise MissingDataFileError(f"Item file not found: {filename}")
+        raise MissingDataFileError(f"{schema.record_name.title()} file not found: {filename}")
     
-    # Try to read the file
+    if lazy_fields and get_catalog_format(filename) != 'txt':
+        raise ValueError("lazy_fields only works with .txt catalogs")
+    for field in lazy_fields:
+        if field not in schema.converters or schema.converters[field] is not None:
+            raise ValueError(f"{field} is not a text field of a {schema.record_name}")
+    
+    return _read_records(filename, schema, digest, errors, lazy_fields)
+
+
+def _read_records(filename, schema, digest, errors, lazy_fields):
+    kind = schema.record_name
+    data_format = get_catalog_format(filename)
+    
+    # Try to open the file
     try:
-        with open(filename, 'r') as file:
-            content = file.read()
+        file = open(filename, 'rb')
     except Exception as e:
-        raise CorruptedDataError(f"Could not read item file: {e}")
+        raise CorruptedDataError(f"Could not read {kind} file: {e}")
     
-    # Parse items (separated by blank lines)
-    items = {}
-    item_blocks = content.strip().split('\n\n')
+    with file:
+        # Each format splits the file into blocks (one per record) and has
+        # a function that turns a block into a validated record
+        if data_format == 'jsonl':
+            blocks = _iter_json_lines(file, digest)
+            load_block = _json_loader(schema)
+        elif data_format == 'csv':
+            blocks = _iter_csv_rows(file, kind, digest)
+            load_block = schema.load_mapping
+        elif lazy_fields:
+            # Byte offset of each line in the current block
+            offsets = []
+            blocks = _iter_blocks(file, kind, digest, offsets)
+            load_block = _lazy_loader(schema, os.path.abspath(filename), offsets, lazy_fields)
+        else:
+            blocks = _iter_blocks(file, kind, digest)
+            load_block = schema.load
+        
+        for line_number, block in blocks:
+            try:
+                # Converts the block into a validated record
+                record = load_block(block)
+            except InvalidDataFormatError as e:
+                # Collect the error and keep going if the caller asked to
+                if errors is not None:
+                    record_id = _record_id(block, schema.id_field)
+                    errors.append(_data_error(filename, line_number, record_id, str(e)))
+                    continue
+                raise InvalidDataFormatError(
+                    f"{filename}, line {line_number}: {e}"
+                ) from e
+            except Exception as e:
+                raise CorruptedDataError(
+                    f"Error parsing {kind} data at {filename}, line {line_number}: {e}"
+                ) from e
+            
+            yield line_number, record
+
+
+def get_catalog_format(filename):
+    """
+    Work out a catalog file's format from its extension
+    
+    Returns: 'jsonl' for .jsonl, 'csv' for .csv, otherwise 'txt' (the
+             "KEY: value" blocks format)
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension in ('.jsonl', '.csv'):
+        return extension[1:]
+    return 'txt'
+
+
+def _iter_json_lines(file, digest):
+    # One JSON object per line; blank lines are skipped
+    for line_number, raw_line in enumerate(file, 1):
+        if digest is not None:
+            digest.update(raw_line)
+        if raw_line.strip():
+            yield line_number, raw_line
+
+
+def _json_loader(schema):
+    load_mapping = schema.load_mapping
+    decode = json.JSONDecoder().decode
+    
+    def load(raw_line):
+        # Straight to the C decoder; json.loads would first sniff the
+        # encoding of every line
+        try:
+            values = decode(raw_line.decode('utf-8'))
+        except ValueError as e:
+            raise InvalidDataFormatError(f"Invalid JSON: {e}")
+        if not isinstance(values, dict):
+            raise InvalidDataFormatError(f"Expected a JSON object, got {type(values).__name__}")
+        return load_mapping(values)
+    
+    return load
+
+
+def _iter_csv_rows(file, kind, digest):
+    # The first row names the fields; each later row is one record
+    reader = csv.DictReader(_iter_text_lines(file, kind, digest), restkey="(extra values)")
+    for row in reader:
+        yield reader.line_num, row
+
+
+def _iter_text_lines(file, kind, digest):
+    for raw_line in file:
+        if digest is not None:
+            digest.update(raw_line)
+        try:
+            yield raw_line.decode('utf-8')
+        except UnicodeDecodeError as e:
+            raise CorruptedDataError(f"Could not read {kind} file: {e}")
+
+
+def _lazy_loader(schema, filename, offsets, lazy_fields):
+    load = schema.load
+    
+    def load_lazy(lines):
+        kept, values = _split_lazy_fields(filename, lines, offsets, lazy_fields)
+        return load(kept, values)
+    
+    return load_lazy
+
+
+def _record_id(block, id_field):
+    # Best-effort ID of a block that failed to load, for error reports
+    if isinstance(block, dict):
+        return block.get(id_field)
+    if isinstance(block, bytes):
+        try:
+            return json.loads(block).get(id_field)
+        except Exception:
+            return None
+    return _block_id(block, id_field)
+
+
+def _split_lazy_fields(filename, lines, offsets, lazy_fields):
+    # Swap the lines of lazy fields for LazyText placeholders that point at
+    # the value's bytes in the file
+    kept = []
+    values = {}
+    for line, offset in zip(lines, offsets):
+        key, separator, value = line.partition(':')
+        name = key.strip().lower()
+        if separator and name in lazy_fields:
+            text = value.strip().encode('utf-8')
+            start = offset + len(line.encode('utf-8')) - len(text)
+            values[name] = LazyText(filename, start, len(text))
+        else:
+            kept.append(line)
+    return kept, values
+
+
+def _data_error(filename, line_number, record_id, message):
+    return {
+        'file': filename,
+        'line': line_number,
+        'record_id': record_id,
+        'message': message
+    }
+
+
+def _iter_blocks(file, kind, digest=None, offsets=None):
+    # Records are separated by blank lines, so collect lines until one shows up.
+    # If an offsets list is given it is filled with the byte offset of each
+    # line in the block being yielded.
+    lines = []
+    start_line = 0
+    position = 0
+    
+    for line_number, raw_line in enumerate(file, 1):
+        if digest is not None:
+            digest.update(raw_line)
+        
+        try:
+            line = raw_line.decode('utf-8').strip()
+        except UnicodeDecodeError as e:
+            raise CorruptedDataError(f"Could not read {kind} file: {e}")
+        
+        if line:
+            if not lines:
+                start_line = line_number
+                if offsets is not None:
+                    offsets.clear()
+            lines.append(line)
+            if offsets is not None:
+                # Skip leading whitespace so the offset points at the text
+                offsets.append(position + len(raw_line) - len(raw_line.lstrip()))
+        elif lines:
+            yield start_line, lines
+            lines = []
+        
+        position += len(raw_line)
+    
+    if lines:
+        yield start_line, lines
+
+
+# ============================================================================
+# SNAPSHOT CACHE
+# ============================================================================
+
+def get_snapshot_path(filename):
+    """
+    Get the path of the snapshot file that caches a data file
+    
+    Returns: Path next to the data file ending in '.snapshot'
+    """
+    return filename + ".snapshot"
+
+
+def load_snapshot(filename, kind, snapshot_file=None):
+    """
+    Load cached records for a data file if the file hasn't changed
+    
+    The snapshot is trusted right away when the file's size and mtime
+    match. If only the mtime moved (file touched or copied) the content
+    hash decides, so an unchanged file never has to be parsed again.
+    
+    Args:
+        filename: Path of the original data file
+        kind: What the snapshot holds, e.g. "quests" or "items"
+        snapshot_file: Where the snapshot lives (default: get_snapshot_path)
+    
+    Returns: Dictionary of records, or None if there is no usable snapshot
+    """
+    if snapshot_file is None:
+        snapshot_file = get_snapshot_path(filename)
     
     try:
-        for block in item_blocks:
-            if not block.strip():
-                continue
+        with open(snapshot_file, 'rb') as file:
+            snapshot = pickle.load(file)
+        stat = os.stat(filename)
+    except Exception:
+        # Missing or unreadable snapshot just means we parse normally
+        return None
+    
+    if not isinstance(snapshot, dict):
+        return None
+    if snapshot.get('version') != SNAPSHOT_VERSION or snapshot.get('kind') != kind:
+        return None
+    if snapshot.get('source') != os.path.abspath(filename):
+        return None
+    if snapshot.get('size') != stat.st_size:
+        return None
+    
+    if snapshot.get('mtime') != stat.st_mtime_ns:
+        # Same size but touched, only trust it if the content is identical
+        try:
+            content_hash = _file_hash(filename)
+        except Exception:
+            return None
+        if content_hash != snapshot.get('hash'):
+            return None
+    
+    return snapshot['records']
+
+
+def save_snapshot(filename, kind, records, stat, content_hash, snapshot_file=None):
+    """
+    Write validated records to the snapshot file for a data file
+    
+    Args:
+        filename: Path of the original data file
+        kind: What the snapshot holds, e.g. "quests" or "items"
+        records: Dictionary of validated records
+        stat: os.stat() of the data file taken before it was read
+        content_hash: SHA-1 hex digest of the bytes the records came from
+        snapshot_file: Where to write it (default: get_snapshot_path)
+    
+    Returns: True if the snapshot was written, False otherwise
+    """
+    if snapshot_file is None:
+        snapshot_file = get_snapshot_path(filename)
+    temp_file = snapshot_file + ".tmp"
+    
+    try:
+        # A file modified within the last couple of seconds could be edited
+        # again without its mtime changing, so only the hash is trusted then
+        mtime = stat.st_mtime_ns
+        if time.time_ns() - mtime < RACY_MTIME_WINDOW_NS:
+            mtime = None
+        
+        snapshot = {
+            'version': SNAPSHOT_VERSION,
+            'kind': kind,
+            'source': os.path.abspath(filename),
+            'size': stat.st_size,
+            'mtime': mtime,
+            'hash': content_hash,
+            'records': records
+        }
+        
+        # Write to a temp file first so a half-written snapshot is never read
+        with open(temp_file, 'wb') as file:
+            pickle.dump(snapshot, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file, snapshot_file)
+        return True
+    
+    except Exception:
+        # The snapshot is only a cache, so failing to write it is not fatal
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        return False
+
+
+def _file_hash(filename):
+    digest = hashlib.sha1()
+    with open(filename, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ============================================================================
+# MEMORY-MAPPED CATALOG
+# ============================================================================
+
+class MmapCatalog(Mapping):
+    """
+    Read-only quest or item catalog that only parses records when used
+    
+    The data file is memory-mapped and an index of ID -> byte range is
+    built (or loaded from '<filename>.index'), so opening even a huge
+    catalog is cheap. Each record is parsed and validated the first time
+    it is looked up and then cached. Works anywhere the normal quest/item
+    dictionaries are used ('in', [], .get(), .items()).
+    
+    The data file must not be edited while the catalog is open.
+    """
+    
+    def __init__(self, filename, kind):
+        schema = _catalog_schema(kind)
+        self.record_name = schema.record_name
+        self.id_field = schema.id_field
+        self.load_block = schema.load
+        
+        if not os.path.exists(filename):
+            raise MissingDataFileError(f"{self.record_name.title()} file not found: {filename}")
+        
+        self.filename = filename
+        self.kind = kind
+        self.records = {}
+        
+        try:
+            stat = os.stat(filename)
+            with open(filename, 'rb') as file:
+                # mmap can't map an empty file
+                if stat.st_size > 0:
+                    self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    self.data = b''
+        except Exception as e:
+            raise CorruptedDataError(f"Could not read {self.record_name} file: {e}")
+        
+        index_file = filename + ".index"
+        self.index = load_snapshot(filename, kind + "-index", index_file)
+        if self.index is None:
+            self.index = self._build_index()
+            save_snapshot(
+                filename, kind + "-index", self.index, stat,
+                hashlib.sha1(self.data).hexdigest(), index_file
+            )
+    
+    def _build_index(self):
+        # Scan the file once, remembering where each block starts and ends
+        id_key = self.id_field.encode()
+        index = {}
+        offset = 0
+        line_number = 0
+        block_start = None
+        
+        while True:
+            line_end = self.data.find(b'\n', offset)
+            if line_end == -1:
+                line_end = len(self.data)
+            else:
+                line_end += 1
+            if offset >= line_end:
+                break
             
-            # Parse this item block
-            lines = block.strip().split('\n')
-            item = parse_item_block(lines)
+            line_number += 1
+            line = self.data[offset:line_end].strip()
             
-            # Validate the item
-            validate_item_data(item)
+            if line:
+                if block_start is None:
+                    block_start = offset
+                    block_line = line_number
+                    block_id = None
+                
+                key, separator, value = line.partition(b':')
+                if separator and block_id is None and key.strip().lower() == id_key:
+                    block_id = value.strip().decode('utf-8')
+                block_end = line_end
             
-            # Store by item_id
-            items[item['item_id']] = item
+            elif block_start is not None:
+                self._add_to_index(index, block_id, block_start, block_end, block_line)
+                block_start = None
+            
+            offset = line_end
+        
+        if block_start is not None:
+            self._add_to_index(index, block_id, block_start, block_end, block_line)
+        
+        return index
     
-    except InvalidDataFormatError:
-        raise
-    except Exception as e:
-        raise CorruptedDataError(f"Error parsing item data: {e}")
+    def _add_to_index(self, index, block_id, start, end, line_number):
+        if block_id is None:
+            raise InvalidDataFormatError(
+                f"{self.filename}, line {line_number}: "
+                f"Missing required field: {self.id_field}"
+            )
+        index[block_id] = (start, end, line_number)
+    
+    def __getitem__(self, record_id):
+        # Already parsed records come straight from the cache
+        if record_id in self.records:
+            return self.records[record_id]
+        
+        start, end, line_number = self.index[record_id]
+        
+        try:
+            block = self.data[start:end].decode('utf-8')
+            record = self.load_block(block.split('\n'))
+        except InvalidDataFormatError as e:
+            raise InvalidDataFormatError(f"{self.filename}, line {line_number}: {e}") from e
+        except Exception as e:
+            raise CorruptedDataError(
+                f"Error parsing {self.record_name} data at {self.filename}, line {line_number}: {e}"
+            ) from e
+        
+        self.records[record_id] = record
+        return record
+    
+    def __contains__(self, record_id):
+        # Don't parse the record just to answer 'in'
+        return record_id in self.index
+    
+    def __iter__(self):
+        return iter(self.index)
+    
+    def __len__(self):
+        return len(self.index)
     
-    return items
+    def close(self):
+        """Release the memory map"""
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
 
 # ============================================================================
-# VALIDATION FUNCTIONS
+# SHARED MEMORY CATALOG
 # ============================================================================
 
-def validate_quest_data(quest_dict):
+class SharedCatalog(Mapping):
+    """
+    Read-only catalog stored once in shared memory for worker processes
     
-    required_fields = {
-        'quest_id': str,
-        'title': str,
-        'description': str,
-        'reward_xp': int,
-        'reward_gold': int,
-        'required_level': int,
-        'prerequisite': str
-    }
+    The parent process publishes a loaded catalog with
+    SharedCatalog.publish(all_items); workers attach to it by name.
+    Attaching only reads a small header, and each lookup binary-searches
+    the shared index and unpickles just the one record, so starting a
+    worker costs the same for any catalog size. A SharedCatalog sent to a
+    process pool (as a task argument) travels as just its name.
+    
+    Layout: header (magic, record count), then one index entry per record
+    sorted by ID (ID offset/length, record offset/length), then the IDs
+    and pickled records.
     
-    #Ai used to help with for loop structure and isinstance checks
-    # Check each required field
-    for field, field_type in required_fields.items():
-        # Check if field exists
-        if field not in quest_dict:
-            raise InvalidDataFormatError(f"Missing required field: {field}")
+    The publisher must call unlink() (or use 'with') when every worker is
+    done; other processes only call close(). Before Python 3.13, attach
+    only from processes the publisher started (like pool workers), or the
+    segment may be removed when the attaching process exits.
+    """
+    
+    MAGIC = b'GDC1'
+    HEADER = struct.Struct('<4sI')
+    ENTRY = struct.Struct('<QIQI')
+    
+    def __init__(self, name, shm=None):
+        """Attach to a catalog published under the given name"""
+        # publish() passes in the block it just created
+        self.shm = shm if shm is not None else _attach_shared_memory(name)
+        self.name = name
+        self.owner = False
+        self.buf = self.shm.buf
+        magic, self.count = self.HEADER.unpack_from(self.buf, 0)
+        if magic != self.MAGIC:
+            self.close()
+            raise CorruptedDataError(f"Shared memory '{name}' is not a catalog")
+    
+    @classmethod
+    def publish(cls, records, name=None):
+        """
+        Copy a catalog into a new shared memory block
         
-        # Check field type
-        if not isinstance(quest_dict[field], field_type):
-            raise InvalidDataFormatError(
-                f"Invalid type for field '{field}': expected {field_type.__name__}, "
-                f"got {type(quest_dict[field]).__name__}"
+        Args:
+            records: Dictionary of id -> record (quests or items)
+            name: Shared memory name (default: a random one)
+        Returns: SharedCatalog owned by this process
+        """
+        entries = sorted(
+            (record_id.encode('utf-8'), pickle.dumps(record, pickle.HIGHEST_PROTOCOL))
+            for record_id, record in records.items()
+        )
+        
+        data_start = cls.HEADER.size + cls.ENTRY.size * len(entries)
+        size = data_start + sum(len(key) + len(data) for key, data in entries)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        
+        buf = shm.buf
+        cls.HEADER.pack_into(buf, 0, cls.MAGIC, len(entries))
+        offset = data_start
+        for position, (key, data) in enumerate(entries):
+            cls.ENTRY.pack_into(
+                buf, cls.HEADER.size + position * cls.ENTRY.size,
+                offset, len(key), offset + len(key), len(data)
             )
+            buf[offset:offset + len(key)] = key
+            buf[offset + len(key):offset + len(key) + len(data)] = data
+            offset += len(key) + len(data)
+        del buf
+        
+        catalog = cls(shm.name, shm)
+        catalog.owner = True
+        return catalog
     
-    return True
+    def _entry(self, position):
+        return self.ENTRY.unpack_from(self.buf, self.HEADER.size + position * self.ENTRY.size)
+    
+    def _key(self, position):
+        key_offset, key_length, data_offset, data_length = self._entry(position)
+        return bytes(self.buf[key_offset:key_offset + key_length])
+    
+    def _find(self, record_id):
+        # Binary search the sorted index; returns the position or -1
+        if not isinstance(record_id, str):
+            return -1
+        key = record_id.encode('utf-8')
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self._key(low) == key:
+            return low
+        return -1
+    
+    def __getitem__(self, record_id):
+        position = self._find(record_id)
+        if position < 0:
+            raise KeyError(record_id)
+        key_offset, key_length, data_offset, data_length = self._entry(position)
+        return pickle.loads(self.buf[data_offset:data_offset + data_length])
+    
+    def __contains__(self, record_id):
+        return self._find(record_id) >= 0
+    
+    def __iter__(self):
+        for position in range(self.count):
+            yield self._key(position).decode('utf-8')
+    
+    def __len__(self):
+        return self.count
+    
+    def __reduce__(self):
+        # Workers re-attach by name instead of receiving a copy
+        return (SharedCatalog, (self.name,))
+    
+    def close(self):
+        """Detach from the shared memory (the catalog can't be used after)"""
+        if self.buf is not None:
+            self.buf.release()
+            self.buf = None
+            self.shm.close()
+    
+    def unlink(self):
+        """Close and free the shared memory; only the publisher should call this"""
+        self.close()
+        self.shm.unlink()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.owner:
+            self.unlink()
+        else:
+            self.close()
 
 
-def validate_item_data(item_dict):
+def _attach_shared_memory(name):
+    try:
+        try:
+            # Attached workers must not remove the block when they exit
+            return shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # track= is new in Python 3.13
+            return shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        raise MissingDataFileError(f"Shared catalog not found: {name}")
+
+
+# ============================================================================
+# HOT RELOADING
+# ============================================================================
+
+class CatalogReloader:
+    """
+    Keeps a loaded quest or item dictionary in sync with its data file
     
-    required_fields = {
-        'item_id': str,
-        'name': str,
-        'type': str,
-        'effect': (str, dict),  # Accept both string and dict formats
-        'cost': int,
-        'description': str
-    }
+    Every block in the file is hashed; poll() re-reads the file only when
+    its size or mtime moved, and then parses and validates just the blocks
+    whose hash is new. Nothing in the live dictionary changes unless every
+    changed block is valid, and then all changes are applied together.
+    
+    The hashes are taken on the first poll that finds the file changed
+    (comparing every record with the catalog that one time), so creating
+    a reloader doesn't read the file.
+    """
     
-    # Check each required field
-    for field, field_type in required_fields.items():
-        # Check if field exists
-        if field not in item_dict:
-            raise InvalidDataFormatError(f"Missing required field: {field}")
-        
-        # Check field type
-        # Handle tuple of types (allows multiple types)
-        #Ai used to help with isinstance checks for multiple types and error message formatting
-        if isinstance(field_type, tuple):
-            if not isinstance(item_dict[field], field_type):
-                type_names = " or ".join(t.__name__ for t in field_type)
+    def __init__(self, filename, kind, catalog):
+        schema = _catalog_schema(kind)
+        self.record_name = schema.record_name
+        self.id_field = schema.id_field
+        self.load_block = schema.load
+        
+        self.filename = filename
+        self.kind = kind
+        self.catalog = catalog
+        
+        # block hash -> record ID for every block in the file (None until
+        # the first change is seen)
+        self.block_ids = None
+        self.signature = self._file_signature()
+    
+    def poll(self):
+        """
+        Check the data file and apply any edited records to the catalog
+        
+        Returns: Dictionary with sorted 'added', 'removed' and 'changed'
+                 lists of record IDs (all empty if nothing changed)
+        Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+                (the catalog is left untouched when an error is raised)
+        """
+        changes = {'added': [], 'removed': [], 'changed': []}
+        
+        signature = self._file_signature()
+        if signature is not None and signature == self.signature:
+            return changes
+        
+        block_ids = self.block_ids
+        new_block_ids = {}
+        updated = {}
+        
+        for line_number, lines in self._read_blocks():
+            block_hash = _block_hash(lines)
+            
+            # Blocks we've already seen don't need to be parsed again
+            if block_ids is not None and block_hash in block_ids:
+                new_block_ids[block_hash] = block_ids[block_hash]
+                continue
+            
+            try:
+                record = self.load_block(lines)
+            except InvalidDataFormatError as e:
                 raise InvalidDataFormatError(
-                    f"Invalid type for field '{field}': expected {type_names}, "
-                    f"got {type(item_dict[field]).__name__}"
-                )
+                    f"{self.filename}, line {line_number}: {e}"
+                ) from e
+            
+            record_id = record[self.id_field]
+            new_block_ids[block_hash] = record_id
+            # Without hashes yet, unchanged records are found by comparing
+            if block_ids is None and self.catalog.get(record_id) == record:
+                continue
+            updated[record_id] = record
+        
+        old_ids = set(self.catalog) if block_ids is None else set(block_ids.values())
+        new_ids = set(new_block_ids.values())
+        removed = old_ids - new_ids
+        
+        # Swap everything in at once now that all changed blocks are valid
+        self.catalog.update(updated)
+        for record_id in removed:
+            self.catalog.pop(record_id, None)
+        
+        self.block_ids = new_block_ids
+        self.signature = signature
+        
+        changes['added'] = sorted(record_id for record_id in updated if record_id not in old_ids)
+        changes['changed'] = sorted(record_id for record_id in updated if record_id in old_ids)
+        changes['removed'] = sorted(removed)
+        return changes
+    
+    def _file_signature(self):
+        if not os.path.exists(self.filename):
+            raise MissingDataFileError(
+                f"{self.record_name.title()} file not found: {self.filename}"
+            )
+        
+        stat = os.stat(self.filename)
+        
+        # A recently modified file could change again without its mtime
+        # moving, so keep re-checking it until it settles
+        if time.time_ns() - stat.st_mtime_ns < RACY_MTIME_WINDOW_NS:
+            return None
+        return (stat.st_size, stat.st_mtime_ns)
+    
+    def _read_blocks(self):
+        try:
+            file = open(self.filename, 'rb')
+        except OSError as e:
+            raise CorruptedDataError(f"Could not read {self.record_name} file: {e}")
+        
+        with file:
+            yield from _iter_blocks(file, self.record_name)
+
+
+def _block_hash(lines):
+    return hashlib.sha1('\n'.join(lines).encode('utf-8')).digest()
+
+
+def _block_id(lines, id_field):
+    # Find a block's ID without parsing the whole block
+    for line in lines:
+        key, separator, value = line.partition(':')
+        if separator and key.strip().lower() == id_field:
+            return value.strip()
+    return None
+
+
+# ============================================================================
+# CATALOGS
+# ============================================================================
+
+class Catalog(dict):
+    """
+    Record dictionary (id -> record) that knows when it has changed
+    
+    Subclasses keep their own indexes in sync by overriding _index and
+    _unindex, which run for every record added or removed. Anything built
+    from the whole catalog (like column views) is cached in self.views and
+    thrown away on every change, so a reload never leaves stale data.
+    
+    self.id_map gives every ID the catalog has ever held a dense integer
+    index (see IdMap); removing a record keeps its index reserved.
+    """
+    
+    def __init__(self, records=None):
+        super().__init__()
+        self.views = {}
+        self.id_map = IdMap()
+        if records:
+            self.update(records)
+    
+    # ------------------------------------------------------------------
+    # Keep indexes and views in sync with every change
+    # ------------------------------------------------------------------
+    
+    def __setitem__(self, record_id, record):
+        self.views.clear()
+        if record_id in self:
+            self._unindex(record_id, self[record_id])
         else:
-            if not isinstance(item_dict[field], field_type):
-                raise InvalidDataFormatError(
-                    f"Invalid type for field '{field}': expected {field_type.__name__}, "
-                    f"got {type(item_dict[field]).__name__}"
-                )
+            self.id_map.add(record_id)
+        super().__setitem__(record_id, record)
+        self._index(record_id, record)
+    
+    def __delitem__(self, record_id):
+        self.views.clear()
+        self._unindex(record_id, self[record_id])
+        super().__delitem__(record_id)
+    
+    def update(self, *args, **kwargs):
+        # __setitem__ inlined, since whole catalogs are loaded through here
+        self.views.clear()
+        index, unindex, add_id = self._index, self._unindex, self.id_map.add
+        set_record = super().__setitem__
+        for record_id, record in dict(*args, **kwargs).items():
+            if record_id in self:
+                unindex(record_id, self[record_id])
+            else:
+                add_id(record_id)
+            set_record(record_id, record)
+            index(record_id, record)
+    
+    def pop(self, record_id, *default):
+        if record_id not in self:
+            return super().pop(record_id, *default)
+        record = self[record_id]
+        del self[record_id]
+        return record
+    
+    def popitem(self):
+        record_id = next(reversed(self))
+        return record_id, self.pop(record_id)
+    
+    def setdefault(self, record_id, record=None):
+        if record_id not in self:
+            self[record_id] = record
+        return self[record_id]
+    
+    def clear(self):
+        super().clear()
+        self.views.clear()
+    
+    def copy(self):
+        return type(self)(self)
+    
+    def __reduce__(self):
+        # Rebuild through __init__ so indexes exist before records are
+        # added; the IdMap goes along so integer forms stay valid
+        return (type(self), (dict(self),), {'id_map': self.id_map})
+    
+    def get_view(self, name, build):
+        """
+        Get a cached view of the catalog, building it on first use
+        
+        Args:
+            name: Cache key for the view
+            build: Function(catalog) that builds the view
+        Returns: The cached view (rebuilt after any change to the catalog)
+        """
+        if name not in self.views:
+            self.views[name] = build(self)
+        return self.views[name]
+    
+    def _index(self, record_id, record):
+        pass
+    
+    def _unindex(self, record_id, record):
+        pass
+
+
+class IdMap:
+    """
+    Two-way map between record IDs and dense integer indexes
+    
+    Indexes are handed out in order (0, 1, 2, ...) and never change or
+    get reused, so integer forms stay valid across reloads. Lists of IDs
+    can be stored as compact arrays of indexes with encode()/decode(), and
+    flags() gives a bytearray that answers "is index i in this list" in
+    O(1) without hashing strings.
+    """
+    
+    def __init__(self, ids=()):
+        self.ids = []
+        self.indexes = {}
+        for record_id in ids:
+            self.add(record_id)
+    
+    def add(self, record_id):
+        """Returns: The ID's index, assigning the next free one if it is new"""
+        index = self.indexes.get(record_id)
+        if index is None:
+            index = len(self.ids)
+            self.indexes[record_id] = index
+            self.ids.append(record_id)
+        return index
+    
+    def index_of(self, record_id):
+        """Returns: Index of a record ID (KeyError if it was never added)"""
+        return self.indexes[record_id]
+    
+    def id_of(self, index):
+        """Returns: Record ID at an index (IndexError if out of range)"""
+        return self.ids[index]
+    
+    def encode(self, ids):
+        """
+        Convert a list of IDs to an array of indexes
+        
+        Raises: KeyError if an ID isn't in the map
+        """
+        indexes = self.indexes
+        return array('I', [indexes[record_id] for record_id in ids])
+    
+    def decode(self, indexes):
+        """Returns: List of the record IDs for a sequence of indexes"""
+        ids = self.ids
+        return [ids[index] for index in indexes]
+    
+    def flags(self, ids):
+        """
+        Mark a list of IDs in a bytearray with one byte per index
+        
+        IDs that aren't in the map are ignored.
+        
+        Returns: bytearray where flags[index] is 1 for every listed ID
+        """
+        flags = bytearray(len(self.ids))
+        indexes = self.indexes
+        for record_id in ids:
+            index = indexes.get(record_id)
+            if index is not None:
+                flags[index] = 1
+        return flags
+    
+    def __len__(self):
+        return len(self.ids)
+    
+    def __contains__(self, record_id):
+        return record_id in self.indexes
+
+
+def get_id_map(catalog):
+    """
+    Get the IdMap of a catalog
+    
+    A Catalog keeps its map for its whole life. For a plain dictionary a
+    new map is built (in catalog order) on every call, so its indexes
+    don't stay the same and are only good for that call.
+    """
+    if isinstance(catalog, Catalog):
+        return catalog.id_map
+    return IdMap(catalog)
+
+
+class QuestCatalog(Catalog):
+    """Quest dictionary (quest_id -> quest) with cached views"""
+
+
+class ItemCatalog(Catalog):
+    """
+    Item dictionary (item_id -> item) that also keeps search indexes
+    
+    Works exactly like the dictionary from load_items, but keeps items
+    grouped by type, sorted by cost and grouped by the stats their effect
+    changes. The indexes are updated on every change, so queries never
+    have to scan the whole catalog.
+    """
+    
+    # Adding more items than this at once sorts the cost index once at
+    # the end instead of inserting every item into it
+    BULK_SIZE = 32
+    
+    def __init__(self, items=None):
+        self.type_index = {}
+        self.stat_index = {}
+        # Sorted list of (cost, item_id) for bisect range queries
+        self.cost_index = []
+        self.bulk_loading = False
+        super().__init__(items)
+    
+    def update(self, *args, **kwargs):
+        items = dict(*args, **kwargs)
+        if len(items) <= self.BULK_SIZE:
+            super().update(items)
+            return
+        
+        self.bulk_loading = True
+        try:
+            super().update(items)
+        finally:
+            self.bulk_loading = False
+            self.cost_index = sorted((item.get('cost', 0), item_id) for item_id, item in self.items())
+    
+    def clear(self):
+        super().clear()
+        self.type_index.clear()
+        self.stat_index.clear()
+        self.cost_index.clear()
+    
+    def _index(self, item_id, item):
+        self.type_index.setdefault(item.get('type'), {})[item_id] = None
+        for stat_name in _effect_stats(item.get('effect')):
+            self.stat_index.setdefault(stat_name, {})[item_id] = None
+        if not self.bulk_loading:
+            bisect.insort(self.cost_index, (item.get('cost', 0), item_id))
+    
+    def _unindex(self, item_id, item):
+        _remove_from_index(self.type_index, item.get('type'), item_id)
+        for stat_name in _effect_stats(item.get('effect')):
+            _remove_from_index(self.stat_index, stat_name, item_id)
+        if not self.bulk_loading:
+            position = bisect.bisect_left(self.cost_index, (item.get('cost', 0), item_id))
+            del self.cost_index[position]
+    
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    
+    def items_of_type(self, item_type):
+        """Returns: List of items of the given type ('weapon', 'armor', ...)"""
+        return [self[item_id] for item_id in self.type_index.get(item_type, ())]
+    
+    def items_with_stat(self, stat_name):
+        """Returns: List of items whose effect changes the given stat"""
+        return [self[item_id] for item_id in self.stat_index.get(stat_name.lower(), ())]
+    
+    def items_in_cost_range(self, min_cost=None, max_cost=None):
+        """
+        Find items whose cost is between min_cost and max_cost (inclusive)
+        
+        Returns: List of items sorted by cost
+        """
+        start, end = self._cost_bounds(min_cost, max_cost)
+        return [self[item_id] for cost, item_id in self.cost_index[start:end]]
+    
+    def find_items(self, item_type=None, stat_name=None, min_cost=None, max_cost=None):
+        """
+        Find items matching every filter that is given
+        
+        Starts from whichever index gives the fewest candidates, so the
+        work depends on the number of matches rather than the catalog size.
+        
+        Returns: List of matching items sorted by cost
+        """
+        candidates = []
+        if item_type is not None:
+            candidates.append(self.type_index.get(item_type, {}))
+        if stat_name is not None:
+            candidates.append(self.stat_index.get(stat_name.lower(), {}))
+        
+        start, end = self._cost_bounds(min_cost, max_cost)
+        if not candidates or end - start <= min(len(ids) for ids in candidates):
+            matches = [item_id for cost, item_id in self.cost_index[start:end]
+                       if all(item_id in ids for ids in candidates)]
+        else:
+            candidates.sort(key=len)
+            smallest, others = candidates[0], candidates[1:]
+            matches = [item_id for item_id in smallest
+                       if all(item_id in ids for ids in others)
+                       and _cost_between(self[item_id].get('cost', 0), min_cost, max_cost)]
+            matches.sort(key=lambda item_id: (self[item_id].get('cost', 0), item_id))
+        
+        return [self[item_id] for item_id in matches]
+    
+    def _cost_bounds(self, min_cost, max_cost):
+        # Positions in cost_index covering min_cost..max_cost
+        start = 0
+        end = len(self.cost_index)
+        if min_cost is not None:
+            start = bisect.bisect_left(self.cost_index, (min_cost,))
+        if max_cost is not None:
+            # (max_cost + 1,) sorts after every (max_cost, item_id) pair
+            end = bisect.bisect_left(self.cost_index, (max_cost + 1,))
+        return start, max(start, end)
+
+
+def _remove_from_index(index, key, item_id):
+    ids = index.get(key)
+    if ids is not None:
+        ids.pop(item_id, None)
+        if not ids:
+            del index[key]
+
+
+def _cost_between(cost, min_cost, max_cost):
+    if min_cost is not None and cost < min_cost:
+        return False
+    if max_cost is not None and cost > max_cost:
+        return False
+    return True
+
+
+def _effect_stats(effect):
+    # Stat names an item's effect changes, or [] if it can't be parsed
+    try:
+        return [stat_name for stat_name, value in parse_effect(effect)]
+    except ValueError:
+        return []
+
+
+# ============================================================================
+# COLUMN VIEWS
+# ============================================================================
+
+# Numeric fields exported as columns, with the default for a missing value
+QUEST_COLUMNS = {'reward_xp': 0, 'reward_gold': 0, 'required_level': 1}
+ITEM_COLUMNS = {'cost': 0}
+
+
+class CatalogColumns:
+    """
+    Column-by-column copy of a catalog's numeric fields
+    
+    ids[i] is the record ID for row i, and columns[field][i] is that
+    record's value. Columns are array('q') objects, or NumPy int64 arrays
+    when NumPy is installed, so sums and range filters run over packed
+    integers instead of looking up every record dictionary.
+    """
+    
+    def __init__(self, catalog, fields):
+        """
+        Args:
+            catalog: Dictionary of id -> record
+            fields: Dictionary of field name -> default for missing values
+        """
+        records = list(catalog.values())
+        self.ids = list(catalog)
+        self.rows = {record_id: row for row, record_id in enumerate(self.ids)}
+        self.columns = {}
+        for field, default in fields.items():
+            column = array('q', [record.get(field, default) for record in records])
+            if numpy is not None:
+                column = numpy.frombuffer(column, dtype=numpy.int64)
+            self.columns[field] = column
+    
+    def __len__(self):
+        return len(self.ids)
     
+    def total(self, field, ids=None):
+        """
+        Sum a column, over every row or only the given record IDs
+        
+        IDs that aren't in the catalog are skipped.
+        """
+        column = self.columns[field]
+        if ids is None:
+            return int(column.sum()) if numpy is not None else sum(column)
+        
+        rows = [self.rows[record_id] for record_id in ids if record_id in self.rows]
+        if numpy is not None:
+            return int(column[rows].sum())
+        return sum(column[row] for row in rows)
+    
+    def ids_between(self, field, low=None, high=None):
+        """
+        Find IDs whose value in a column is between low and high (inclusive)
+        
+        Returns: List of record IDs in catalog order
+        """
+        column = self.columns[field]
+        if numpy is not None:
+            mask = numpy.ones(len(column), dtype=bool)
+            if low is not None:
+                mask &= column >= low
+            if high is not None:
+                mask &= column <= high
+            return [self.ids[row] for row in numpy.flatnonzero(mask)]
+        
+        ids = self.ids
+        return [ids[row] for row, value in enumerate(column)
+                if _cost_between(value, low, high)]
+
+
+def get_quest_columns(quests):
+    """
+    Get column views of the numeric quest fields
+    
+    Cached on a QuestCatalog until the catalog next changes; built fresh
+    every call for a plain dictionary.
+    
+    Returns: CatalogColumns with reward_xp, reward_gold and required_level
+    """
+    return _get_columns(quests, QUEST_COLUMNS)
+
+
+def get_item_columns(items):
+    """
+    Get column views of the numeric item fields
+    
+    Returns: CatalogColumns with a cost column
+    """
+    return _get_columns(items, ITEM_COLUMNS)
+
+
+def _get_columns(catalog, fields):
+    def build(records):
+        return CatalogColumns(records, fields)
+    
+    if isinstance(catalog, Catalog):
+        return catalog.get_view(('columns', tuple(fields)), build)
+    return build(catalog)
+
+
+# ============================================================================
+# PREREQUISITE GRAPH
+# ============================================================================
+
+class PrerequisiteGraph:
+    """
+    Quest prerequisites compiled into a graph once per catalog
+    
+    Attributes:
+        order: Quest IDs in topological order (prerequisites first)
+        depth: quest_id -> number of prerequisites before it (0 for a root)
+        cycles: Lists of quest IDs that form prerequisite loops
+        missing: quest_id -> prerequisite ID that isn't in the catalog
+    
+    Quests in a loop, or that lead into one, have no depth and are left
+    out of order. Chains are worked out on first use and remembered.
+    """
+    
+    def __init__(self, quests):
+        self.quests = quests
+        self.missing = {}
+        self.depth = {}
+        self.order = []
+        self.cycles = []
+        self._chains = {}
+        
+        # Map each quest to the quests that need it, and start from every
+        # quest with no (known) prerequisite
+        dependents = {}
+        for quest_id, quest in quests.items():
+            prerequisite = quest.get('prerequisite', 'NONE')
+            if prerequisite == 'NONE':
+                self.depth[quest_id] = 0
+            elif prerequisite not in quests:
+                self.missing[quest_id] = prerequisite
+                self.depth[quest_id] = 0
+            else:
+                dependents.setdefault(prerequisite, []).append(quest_id)
+        
+        # Breadth-first from the roots; a loop while walking would need
+        # recursion as deep as the longest chain
+        self.order = list(self.depth)
+        for quest_id in self.order:
+            child_depth = self.depth[quest_id] + 1
+            for child_id in dependents.get(quest_id, ()):
+                self.depth[child_id] = child_depth
+                self.order.append(child_id)
+        
+        if len(self.order) < len(quests):
+            self._find_cycles()
+    
+    def _find_cycles(self):
+        # Every quest has at most one prerequisite, so following them from
+        # an unreached quest always ends in a loop
+        seen = set(self.depth)
+        for start in self.quests:
+            if start in seen:
+                continue
+            path = {}
+            quest_id = start
+            while quest_id not in seen and quest_id not in path:
+                path[quest_id] = len(path)
+                quest_id = self.quests[quest_id]['prerequisite']
+            if quest_id in path:
+                self.cycles.append(list(path)[path[quest_id]:])
+            seen.update(path)
+    
+    def chain(self, quest_id):
+        """
+        Get a quest's prerequisite chain, from the first quest to quest_id
+        
+        Returns: New list of quest IDs (safe for the caller to change)
+        Raises: KeyError if the quest isn't in the catalog
+        """
+        if quest_id not in self.quests:
+            raise KeyError(quest_id)
+        
+        chain = self._chains.get(quest_id)
+        if chain is None:
+            chain = self._build_chain(quest_id)
+            self._chains[quest_id] = chain
+        return list(chain)
+    
+    def _build_chain(self, quest_id):
+        if quest_id not in self.depth:
+            # Part of a loop: follow it round once and stop
+            ids = []
+            visited = set()
+            current_id = quest_id
+            while current_id not in visited:
+                ids.append(current_id)
+                visited.add(current_id)
+                current_id = self.quests[current_id]['prerequisite']
+            ids.reverse()
+            return tuple(ids)
+        
+        # Climb until a remembered chain (or the root), then extend it
+        ids = []
+        current_id = quest_id
+        while True:
+            ids.append(current_id)
+            if self.depth[current_id] == 0:
+                prefix = ()
+                break
+            current_id = self.quests[current_id]['prerequisite']
+            if current_id in self._chains:
+                prefix = self._chains[current_id]
+                break
+        ids.reverse()
+        return prefix + tuple(ids)
+
+
+def get_prerequisite_graph(quests):
+    """
+    Get the compiled prerequisite graph of a quest catalog
+    
+    Cached on a QuestCatalog until the catalog next changes; built fresh
+    every call for a plain dictionary.
+    
+    Returns: PrerequisiteGraph
+    """
+    if isinstance(quests, Catalog):
+        return quests.get_view('prerequisites', PrerequisiteGraph)
+    return PrerequisiteGraph(quests)
+
+
+# ============================================================================
+# VALIDATION FUNCTIONS
+# ============================================================================
+
+class ItemEffect(tuple):
+    """
+    Parsed item effect: an immutable tuple of (stat_name, value) pairs
+    
+    For example "strength:5,defense:3" becomes
+    (('strength', 5), ('defense', 3)). str() gives back the text form.
+    """
+    
+    __slots__ = ()
+    
+    def __str__(self):
+        return ",".join(f"{stat_name}:{value}" for stat_name, value in self)
+    
+    def __repr__(self):
+        return f"ItemEffect({str(self)!r})"
+
+
+def parse_effect(effect):
+    """
+    Turn an item effect into an ItemEffect
+    
+    Args:
+        effect: "stat:value" string (several separated by commas),
+                {'stat': value} dict, an ItemEffect, or None for no effect
+    
+    Returns: ItemEffect with lowercase stat names and int values
+    Raises: ValueError if the effect can't be parsed
+    """
+    if isinstance(effect, ItemEffect):
+        return effect
+    if effect is None:
+        return ItemEffect()
+    
+    if isinstance(effect, dict):
+        pairs = effect.items()
+    elif isinstance(effect, str):
+        pairs = []
+        for part in effect.split(','):
+            stat_name, separator, value = part.partition(':')
+            if not separator or not stat_name.strip():
+                raise ValueError(f"Invalid effect format: {effect}")
+            pairs.append((stat_name, value))
+    else:
+        raise ValueError(f"Invalid effect format: {effect}")
+    
+    return ItemEffect((stat_name.strip().lower(), int(value)) for stat_name, value in pairs)
+
+
+def _check_item_type(item_dict):
     # Validate item type
     valid_item_types = ['weapon', 'armor', 'consumable']
     if item_dict['type'] not in valid_item_types:
@@ -178,61 +1619,94 @@ def validate_item_data(item_dict):
             f"Invalid item type: {item_dict['type']}. "
             f"Must be one of: {', '.join(valid_item_types)}"
         )
+
+
+class QuestRecord(Record):
+    """Read-only quest produced by load_quests (use it like a dictionary)"""
+    __slots__ = ('quest_id', 'title', 'description', 'reward_xp',
+                 'reward_gold', 'required_level', 'prerequisite')
+    _interned = ('quest_id', 'prerequisite')
+
+
+class ItemRecord(Record):
+    """Read-only item produced by load_items (use it like a dictionary)"""
+    __slots__ = ('item_id', 'name', 'type', 'effect', 'cost', 'description')
+    _interned = ('item_id', 'type')
+
+
+# Each record type is described once here and compiled into its
+# parse/validate functions (see record_schema.py)
+QUEST_SCHEMA = RecordSchema(
+    "quest",
+    [
+        ('quest_id', str),
+        ('title', str),
+        ('description', str),
+        ('reward_xp', int),
+        ('reward_gold', int),
+        ('required_level', int),
+        ('prerequisite', str)
+    ],
+    InvalidDataFormatError,
+    malformed_message="Malformed line in quest data: {line}",
+    unknown_message="Unknown field in quest: {key}",
+    id_field='quest_id',
+    record_class=QuestRecord
+)
+
+ITEM_SCHEMA = RecordSchema(
+    "item",
+    [
+        ('item_id', str),
+        ('name', str),
+        ('type', str, str.lower),
+        # Effects are parsed once here; hand-made items may still use
+        # "stat:value" strings or {'stat': value} dicts
+        ('effect', (ItemEffect, str, dict), parse_effect),
+        ('cost', int),
+        ('description', str)
+    ],
+    InvalidDataFormatError,
+    malformed_message="Malformed line in item data: {line}",
+    unknown_message="Unknown field in item: {key}",
+    check=_check_item_type,
+    id_field='item_id',
+    record_class=ItemRecord
+)
+
+
+def validate_quest_data(quest_dict):
     
-    return True
+    return QUEST_SCHEMA.validate(quest_dict)
 
 
+def validate_item_data(item_dict):
+    
+    return ITEM_SCHEMA.validate(item_dict)
+
+
+def _catalog_schema(kind):
+    if kind == "quests":
+        return QUEST_SCHEMA
+    if kind == "items":
+        return ITEM_SCHEMA
+    raise ValueError(f"Unknown catalog kind: {kind}")
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
 def parse_quest_block(lines):
+    """
+    Parse a block of lines into a quest dictionary
     
-    quest = {}
-    
-    try:
-        for line in lines:
-            line = line.strip()
-            
-            # Skip empty lines
-            if not line:
-                continue
-            
-            # Check for colon separator
-            if ':' not in line:
-                raise InvalidDataFormatError(f"Malformed line in quest data: {line}")
-            
-            # Split on colon and strip whitespace
-            key, value = line.split(':', 1)
-            key = key.strip().lower()
-            value = value.strip()
-            
-            # Parse different field types
-            if key == 'quest_id':
-                quest['quest_id'] = value
-            elif key == 'title':
-                quest['title'] = value
-            elif key == 'description':
-                quest['description'] = value
-            elif key == 'reward_xp':
-                quest['reward_xp'] = int(value)
-            elif key == 'reward_gold':
-                quest['reward_gold'] = int(value)
-            elif key == 'required_level':
-                quest['required_level'] = int(value)
-            elif key == 'prerequisite':
-                quest['prerequisite'] = value
-            else:
-                raise InvalidDataFormatError(f"Unknown field in quest: {key}")
-    
-    except ValueError as e:
-        raise InvalidDataFormatError(f"Could not convert value to correct type: {e}")
-    except InvalidDataFormatError:
-        raise
-    except Exception as e:
-        raise InvalidDataFormatError(f"Error parsing quest block: {e}")
+    Args:
+        lines: List of strings representing one quest
     
-    return quest
+    Returns: Dictionary with quest data
+    Raises: InvalidDataFormatError if parsing fails
+    """
+    return QUEST_SCHEMA.parse(lines)
 
 
 def parse_item_block(lines):
@@ -245,51 +1719,7 @@ def parse_item_block(lines):
     Returns: Dictionary with item data
     Raises: InvalidDataFormatError if parsing fails
     """
-    item = {}
-    
-    try:
-        for line in lines:
-            line = line.strip()
-            
-            # Skip empty lines
-            if not line:
-                continue
-            
-            # Check for colon separator
-            if ':' not in line:
-                raise InvalidDataFormatError(f"Malformed line in item data: {line}")
-            
-            # Split on colon and strip whitespace
-            key, value = line.split(':', 1)
-            key = key.strip().lower()
-            value = value.strip()
-            
-            # Parse different field types
-            if key == 'item_id':
-                item['item_id'] = value
-            elif key == 'name':
-                item['name'] = value
-            elif key == 'type':
-                item['type'] = value.lower()
-            elif key == 'effect':
-                # Keep effect as STRING format for now
-                # This allows both "stat:value" and conversion to dict later
-                item['effect'] = value
-            elif key == 'cost':
-                item['cost'] = int(value)
-            elif key == 'description':
-                item['description'] = value
-            else:
-                raise InvalidDataFormatError(f"Unknown field in item: {key}")
-    
-    except ValueError as e:
-        raise InvalidDataFormatError(f"Could not convert value to correct type: {e}")
-    except InvalidDataFormatError:
-        raise
-    except Exception as e:
-        raise InvalidDataFormatError(f"Error parsing item block: {e}")
-    
-    return item
+    return ITEM_SCHEMA.parse(lines)
 
 
 def create_default_data_files():
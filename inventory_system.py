@@ -9,6 +9,8 @@ AI Usage: [Document any AI assistance used]
 This module handles inventory management, item usage, and equipment.
 """
 
+import game_data
+import character_manager
 from custom_exceptions import (
     InventoryFullError,
     ItemNotFoundError,
@@ -32,6 +34,7 @@ def add_item_to_inventory(character, item_id):
     
     # Add item to inventory
     character['inventory'].append(item_id)
+    character_manager.mark_dirty(character)
     return True
 
 
@@ -44,6 +47,7 @@ def remove_item_from_inventory(character, item_id):
     
     # Remove item from inventory
     character['inventory'].remove(item_id)
+    character_manager.mark_dirty(character)
     return True
 
 
@@ -72,6 +76,7 @@ def clear_inventory(character):
     
     # Clear inventory
     character['inventory'] = []
+    character_manager.mark_dirty(character)
     
     return removed_items
 
@@ -95,31 +100,23 @@ def use_item(character, item_id, item_data):
         )
     
     # Apply effect
-    if 'effect' in item_data:
-        effect = item_data['effect']
-        
-        # Parse string format: "stat:value"
-        if isinstance(effect, str):
-            try:
-                stat_name, value_str = effect.split(':')
-                value = int(value_str)
-                apply_stat_effect(character, stat_name, value)
-            except (ValueError, IndexError):
-                raise InvalidItemTypeError(f"Invalid effect format: {effect}")
-        
-        # Parse dict format: {'stat': value}
-        elif isinstance(effect, dict):
-            for stat_name, value in effect.items():
-                apply_stat_effect(character, stat_name, value)
+    for stat_name, value in get_item_effect(item_data):
+        apply_stat_effect(character, stat_name, value)
     
     # Remove used item
     character['inventory'].remove(item_id)
+    character_manager.mark_dirty(character)
     
     return f"Used {item_id}"
 
 
-def equip_weapon(character, item_id, item_data):
-   
+def equip_weapon(character, item_id, item_data, item_data_dict=None):
+    """
+    Equip a weapon from the inventory, adding its bonus
+    
+    Pass item_data_dict (all items) so the bonus of a weapon already
+    equipped is taken away when it is swapped out.
+    """
     
     # Check item exists
     if not has_item(character, item_id):
@@ -129,11 +126,13 @@ def equip_weapon(character, item_id, item_data):
     if item_data.get('type') != 'weapon':
         raise InvalidItemTypeError(f"'{item_id}' is not a weapon")
     
+    effect = get_item_effect(item_data)
+    
     # Unequip current weapon if any
     if character.get('equipped_weapon'):
         old_weapon = character['equipped_weapon']
         try:
-            unequip_weapon(character)
+            unequip_weapon(character, item_data_dict)
         except InventoryFullError:
             # Inventory full, can't unequip
             raise InventoryFullError("Cannot unequip: inventory full")
@@ -142,31 +141,23 @@ def equip_weapon(character, item_id, item_data):
     character['inventory'].remove(item_id)
     
     # Apply weapon bonus
-    if 'effect' in item_data:
-        effect = item_data['effect']
-        
-        # Parse effect if it's a string (format: "stat:value")
-        if isinstance(effect, str):
-            try:
-                stat_name, value_str = effect.split(':')
-                value = int(value_str)
-                character[stat_name] = character.get(stat_name, 0) + value
-            except (ValueError, IndexError):
-                raise InvalidItemTypeError(f"Invalid effect format: {effect}")
-        
-        # Or apply if it's a dict
-        elif isinstance(effect, dict):
-            for stat_name, value in effect.items():
-                character[stat_name] = character.get(stat_name, 0) + value
+    for stat_name, value in effect:
+        character[stat_name] = character.get(stat_name, 0) + value
     
     # Set equipped weapon
     character['equipped_weapon'] = item_id
+    character_manager.mark_dirty(character)
     
     return f"Equipped {item_id}"
 
 
-def equip_armor(character, item_id, item_data):
+def equip_armor(character, item_id, item_data, item_data_dict=None):
+    """
+    Equip armor from the inventory, adding its bonus
     
+    Pass item_data_dict (all items) so the bonus of armor already worn
+    is taken away when it is swapped out.
+    """
     
     # Check if character has the item
     if not has_item(character, item_id):
@@ -178,16 +169,15 @@ def equip_armor(character, item_id, item_data):
     
     # Unequip current armor if exists
     if 'equipped_armor' in character and character['equipped_armor'] is not None:
-        unequip_armor(character)
+        unequip_armor(character, item_data_dict)
     
-    # Parse effect and apply
-    effect = item_data.get('effect', {})
-    if isinstance(effect, dict):
-        for stat_name, value in effect.items():
-            apply_stat_effect(character, stat_name, value)
+    # Apply armor bonus
+    for stat_name, value in get_item_effect(item_data):
+        apply_stat_effect(character, stat_name, value)
     
     # Store equipped armor
     character['equipped_armor'] = item_id
+    character_manager.mark_dirty(character)
     
     # Remove item from inventory
     remove_item_from_inventory(character, item_id)
@@ -195,8 +185,15 @@ def equip_armor(character, item_id, item_data):
     return f"Equipped {item_data.get('name', item_id)}!"
 
 
-def unequip_weapon(character):
-   
+def unequip_weapon(character, item_data_dict=None):
+    """
+    Move the equipped weapon back to the inventory
+    
+    With item_data_dict (all items) the weapon's bonus is taken away;
+    without it the caller has to remove the bonus.
+    
+    Returns: The weapon's item ID, or None if no weapon is equipped
+    """
     
     # Check if weapon is equipped
     if 'equipped_weapon' not in character or character['equipped_weapon'] is None:
@@ -208,20 +205,29 @@ def unequip_weapon(character):
     if len(character['inventory']) >= MAX_INVENTORY_SIZE:
         raise InventoryFullError("Inventory is full! Cannot unequip weapon.")
     
-    # We would need weapon_data to remove bonuses, so for now just store the item
-    # The calling function should handle removing stat bonuses
+    # Remove weapon bonus
+    if item_data_dict is not None and weapon_id in item_data_dict:
+        remove_item_bonus(character, item_data_dict[weapon_id])
     
     # Add weapon back to inventory
     character['inventory'].append(weapon_id)
     
     # Clear equipped weapon
     character['equipped_weapon'] = None
+    character_manager.mark_dirty(character)
     
     return weapon_id
 
 
-def unequip_armor(character):
-   
+def unequip_armor(character, item_data_dict=None):
+    """
+    Move the equipped armor back to the inventory
+    
+    With item_data_dict (all items) the armor's bonus is taken away;
+    without it the caller has to remove the bonus.
+    
+    Returns: The armor's item ID, or None if no armor is equipped
+    """
     
     # Check if armor is equipped
     if 'equipped_armor' not in character or character['equipped_armor'] is None:
@@ -233,11 +239,16 @@ def unequip_armor(character):
     if len(character['inventory']) >= MAX_INVENTORY_SIZE:
         raise InventoryFullError("Inventory is full! Cannot unequip armor.")
     
+    # Remove armor bonus
+    if item_data_dict is not None and armor_id in item_data_dict:
+        remove_item_bonus(character, item_data_dict[armor_id])
+    
     # Add armor back to inventory
     character['inventory'].append(armor_id)
     
     # Clear equipped armor
     character['equipped_armor'] = None
+    character_manager.mark_dirty(character)
     
     return armor_id
 
@@ -263,6 +274,7 @@ def purchase_item(character, item_id, item_data):
     
     # Subtract gold
     character['gold'] -= cost
+    character_manager.mark_dirty(character)
     
     # Add item to inventory
     add_item_to_inventory(character, item_id)
@@ -286,6 +298,7 @@ def sell_item(character, item_id, item_data):
     
     # Add gold to character
     character['gold'] += sell_price
+    character_manager.mark_dirty(character)
     
     return sell_price
 
@@ -293,20 +306,32 @@ def sell_item(character, item_id, item_data):
 # HELPER FUNCTIONS
 # ============================================================================
 
-def parse_item_effect(effect_string):
-    
+def get_item_effect(item_data):
+    """
+    Get an item's effect as (stat_name, value) pairs
     
-    if ':' not in effect_string:
-        return None
+    Items from game_data.load_items already hold a parsed ItemEffect, so
+    this is just a lookup; hand-made items with "stat:value" strings or
+    dicts are parsed here.
     
-    parts = effect_string.split(':')
-    stat_name = parts[0].strip()
+    Raises: InvalidItemTypeError if the effect can't be parsed
+    """
+    effect = item_data.get('effect')
+    try:
+        return game_data.parse_effect(effect)
+    except ValueError:
+        raise InvalidItemTypeError(f"Invalid effect format: {effect}")
+
+
+def parse_item_effect(effect_string):
     
+    # Returns the first (stat_name, value) pair, or None if invalid
     try:
-        value = int(parts[1].strip())
-        return (stat_name, value)
-    except (ValueError, IndexError):
+        effect = game_data.parse_effect(effect_string)
+    except ValueError:
         return None
+    
+    return effect[0] if effect else None
 
 
 def apply_stat_effect(character, stat_name, value):
@@ -317,12 +342,26 @@ def apply_stat_effect(character, stat_name, value):
     # Apply the stat modification
     if stat_name in character:
         character[stat_name] += value
+        character_manager.mark_dirty(character)
         
         # Ensure health doesn't exceed max_health
         if stat_name == 'health' and 'max_health' in character:
             character['health'] = min(character['health'], character['max_health'])
 
 
+def remove_item_bonus(character, item_data):
+    """Take away a bonus added when the item was equipped"""
+    for stat_name, value in get_item_effect(item_data):
+        stat_name = stat_name.lower()
+        if stat_name in character:
+            character[stat_name] -= value
+            character_manager.mark_dirty(character)
+    
+    # Losing max_health can leave health above it
+    if 'max_health' in character and 'health' in character:
+        character['health'] = min(character['health'], character['max_health'])
+
+
 def display_inventory(character, item_data_dict): 
     inventory = character.get('inventory', [])
     
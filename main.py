@@ -10,6 +10,8 @@ This is the main game file that ties all modules together.
 Demonstrates module integration and complete game flow.
 """
 
+import os
+
 # Import all our custom modules
 import character_manager
 import inventory_system
@@ -28,6 +30,13 @@ all_quests = {}
 all_items = {}
 game_running = False
 
+# Watch the data files so edits show up without restarting
+quest_reloader = None
+item_reloader = None
+
+# Writes saves in the background while a game is running
+autosave = None
+
 # ============================================================================
 # MAIN MENU
 # ============================================================================
@@ -113,8 +122,9 @@ def load_game():
     print("LOAD GAME")
     print("=" * 50)
     
-    # Get saved characters
-    saved_chars = character_manager.list_saved_characters()
+    # Get saved characters (from the save manifest, without loading them)
+    summaries = character_manager.list_character_summaries()
+    saved_chars = [summary['name'] for summary in summaries]
     
     if not saved_chars:
         print("No saved characters found.")
@@ -122,8 +132,11 @@ def load_game():
     
     # Display saved characters
     print("\nSaved characters:")
-    for i, char_name in enumerate(saved_chars, 1):
-        print(f"{i}. {char_name}")
+    for i, summary in enumerate(summaries, 1):
+        if summary['class'] is None:
+            print(f"{i}. {summary['name']} (unreadable save)")
+        else:
+            print(f"{i}. {summary['name']} - Level {summary['level']} {summary['class']}")
     
     # Get player choice
     while True:
@@ -161,11 +174,31 @@ def game_loop():
     """
     Main game loop - shows game menu and processes actions
     """
-    global game_running, current_character
+    global game_running, current_character, autosave
     
     game_running = True
-     
+    autosave = character_manager.AutosaveWriter()
+    # SAVE_STATS counts for the whole process; report this game's share
+    stats_before = dict(character_manager.SAVE_STATS)
+    
+    try:
+        run_game_actions()
+    finally:
+        # Make sure every queued save reaches the disk before leaving
+        autosave.close()
+        report_autosave_errors()
+        autosave = None
+        written = character_manager.SAVE_STATS['written'] - stats_before['written']
+        skipped = character_manager.SAVE_STATS['skipped'] - stats_before['skipped']
+        print(f"Saves: {written} written, {skipped} skipped (no changes)")
+
+
+def run_game_actions():
+    global game_running
+    
     while game_running:
+        reload_game_data()
+        
         if current_character['health'] <= 0:
             handle_character_death()
             if not game_running:
@@ -186,7 +219,10 @@ def game_loop():
             shop()
         elif choice == 6:
             save_game()
-            print("\n✓ Game saved!")
+            autosave.flush()
+            # Only claim success if the flush itself wrote everything
+            if not report_autosave_errors():
+                print("\n✓ Game saved!")
             game_running = False
         else:
             print("Invalid choice.")
@@ -297,7 +333,7 @@ def view_inventory():
                 if item_id in all_items:
                     try:
                         message = inventory_system.equip_weapon(
-                            current_character, item_id, all_items[item_id]
+                            current_character, item_id, all_items[item_id], all_items
                         )
                         print(f"✓ {message}")
                     except (ItemNotFoundError, InvalidItemTypeError, InventoryFullError) as e:
@@ -311,7 +347,7 @@ def view_inventory():
                 if item_id in all_items:
                     try:
                         message = inventory_system.equip_armor(
-                            current_character, item_id, all_items[item_id]
+                            current_character, item_id, all_items[item_id], all_items
                         )
                         print(f"✓ {message}")
                     except (ItemNotFoundError, InvalidItemTypeError, InventoryFullError) as e:
@@ -322,7 +358,7 @@ def view_inventory():
             elif choice == 4:
                 # Unequip weapon
                 try:
-                    weapon_id = inventory_system.unequip_weapon(current_character)
+                    weapon_id = inventory_system.unequip_weapon(current_character, all_items)
                     if weapon_id:
                         print(f"✓ Unequipped weapon")
                     else:
@@ -333,7 +369,7 @@ def view_inventory():
             elif choice == 5:
                 # Unequip armor
                 try:
-                    armor_id = inventory_system.unequip_armor(current_character)
+                    armor_id = inventory_system.unequip_armor(current_character, all_items)
                     if armor_id:
                         print(f"✓ Unequipped armor")
                     else:
@@ -459,13 +495,15 @@ def explore():
     try:
         battle = combat_system.SimpleBattle(current_character, enemy)
         result = battle.start_battle()
+        # The battle changes the character's health
+        character_manager.mark_dirty(current_character)
         
         if result['winner'] == 'player':
             # Award XP and gold
             xp_gained = result['xp_gained']
             gold_gained = result['gold_gained']
             
-            current_character['gold'] += gold_gained
+            character_manager.add_gold(current_character, gold_gained)
             character_manager.gain_experience(current_character, xp_gained)
             
             print(f"\n✓ Victory!")
@@ -498,11 +536,12 @@ def shop():
         
         print("\n1. Buy Item")
         print("2. Sell Item")
-        print("3. Back")
+        print("3. Search Items")
+        print("4. Back")
         print("=" * 50)
         
         try:
-            choice = int(input("\nEnter your choice (1-3): "))
+            choice = int(input("\nEnter your choice (1-4): "))
             
             if choice == 1:
                 # Buy item
@@ -533,6 +572,9 @@ def shop():
                     print(f"Item '{item_id}' not found.")
             
             elif choice == 3:
+                search_shop()
+            
+            elif choice == 4:
                 break
             
             else:
@@ -542,6 +584,27 @@ def shop():
             print("Invalid input.")
 
 
+def search_shop():
+    """Filter shop items by type, stat and price"""
+    item_type = input("\nItem type (weapon/armor/consumable, blank for any): ").strip().lower()
+    stat_name = input("Stat it affects (e.g. strength, blank for any): ").strip().lower()
+    max_cost = input("Maximum cost (blank for any): ").strip()
+    
+    matches = all_items.find_items(
+        item_type=item_type or None,
+        stat_name=stat_name or None,
+        max_cost=int(max_cost) if max_cost else None
+    )
+    
+    if not matches:
+        print("\nNo items match your search.")
+        return
+    
+    print("\nMatching Items:")
+    for item in matches:
+        print(f"  {item['item_id']}: {item['name']} - {item['cost']} Gold ({item['type']})")
+
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -550,7 +613,11 @@ def save_game():
    
     global current_character
     
-   
+    # During play the autosave thread does the writing
+    if autosave is not None:
+        autosave.submit(current_character)
+        report_autosave_errors()
+        return
     
     try:
         character_manager.save_character(current_character)
@@ -558,23 +625,82 @@ def save_game():
         print(f"Warning: Could not save game: {e}")
 
 
+def report_autosave_errors():
+    """
+    Print any errors from the autosave thread
+    
+    Returns: True if there were errors
+    """
+    if autosave is None or not autosave.errors:
+        return False
+    while autosave.errors:
+        print(f"Warning: Could not save game: {autosave.errors.pop(0)}")
+    return True
+
+
 def load_game_data():
     
-    global all_quests, all_items
+    global all_quests, all_items, quest_reloader, item_reloader
+    
     
     
+    # Split catalogs in data/quests.d and data/items.d win over single files
+    quest_source = _catalog_source("data/quests.d", "data/quests.txt")
+    item_source = _catalog_source("data/items.d", "data/items.txt")
     
     try:
-        all_quests = game_data.load_quests()
-        all_items = game_data.load_items()
+        all_quests = game_data.load_quests(quest_source, use_snapshot=True)
+        all_items = game_data.load_items(item_source, use_snapshot=True)
     except MissingDataFileError:
         print("Game data files not found. Creating defaults...")
         game_data.create_default_data_files()
-        all_quests = game_data.load_quests()
-        all_items = game_data.load_items()
+        all_quests = game_data.load_quests(quest_source, use_snapshot=True)
+        all_items = game_data.load_items(item_source, use_snapshot=True)
     except (InvalidDataFormatError, CorruptedDataError) as e:
         print(f"Error loading game data: {e}")
         raise
+    
+    # Index items by type, cost and stat for the shop; both catalogs cache
+    # their column views until the next reload changes them
+    all_quests = game_data.QuestCatalog(all_quests)
+    all_items = game_data.ItemCatalog(all_items)
+    
+    # Hot reload only follows single data files
+    if os.path.isfile(quest_source):
+        quest_reloader = game_data.CatalogReloader(quest_source, "quests", all_quests)
+    if os.path.isfile(item_source):
+        item_reloader = game_data.CatalogReloader(item_source, "items", all_items)
+
+
+def _catalog_source(directory, filename):
+    # Use the split directory only if it holds catalog files, so an empty
+    # one falls back to (or gets) the default single file
+    if os.path.isdir(directory) and any(
+        os.path.splitext(name)[1].lower() in game_data.CATALOG_EXTENSIONS
+        for name in os.listdir(directory)
+    ):
+        return directory
+    return filename
+
+
+def reload_game_data():
+    """Apply any edits made to the data files since the last check"""
+    for name, reloader in [("quests", quest_reloader), ("items", item_reloader)]:
+        if reloader is None:
+            continue
+        
+        try:
+            changes = reloader.poll()
+        except (MissingDataFileError, InvalidDataFormatError, CorruptedDataError) as e:
+            # Keep playing with the old data until the file is fixed
+            print(f"Warning: Could not reload {name}: {e}")
+            continue
+        
+        changed_count = len(changes['added']) + len(changes['removed']) + len(changes['changed'])
+        if changed_count:
+            print(f"✓ Reloaded {changed_count} {name} "
+                  f"(added: {len(changes['added'])}, removed: {len(changes['removed'])}, "
+                  f"changed: {len(changes['changed'])})")
 
 
 def handle_character_death():
@@ -9,12 +9,15 @@ AI Usage: [Document any AI assistance used]
 This module handles quest management, dependencies, and completion.
 """
 
+import game_data
+import character_manager
 from custom_exceptions import (
     QuestNotFoundError,
     QuestRequirementsNotMetError,
     QuestAlreadyCompletedError,
     QuestNotActiveError,
-    InsufficientLevelError
+    InsufficientLevelError,
+    InvalidDataFormatError
 )
 
 # ============================================================================
@@ -47,6 +50,7 @@ def accept_quest(character, quest_id, quest_data_dict):
     if 'active_quests' not in character:
         character['active_quests'] = []
     character['active_quests'].append(quest_id)
+    character_manager.mark_dirty(character)
     
     return True
 
@@ -71,12 +75,10 @@ def complete_quest(character, quest_id, quest_data_dict):
     
     # Award XP (causes leveling if needed)
     if xp_reward > 0:
-        import character_manager
         character_manager.gain_experience(character, xp_reward)
     
     # Award gold
     if gold_reward > 0:
-        import character_manager
         character_manager.add_gold(character, gold_reward)
     
     # Move from active to completed
@@ -84,6 +86,7 @@ def complete_quest(character, quest_id, quest_data_dict):
     if 'completed_quests' not in character:
         character['completed_quests'] = []
     character['completed_quests'].append(quest_id)
+    character_manager.mark_dirty(character)
     
     # Return result
     return {
@@ -100,6 +103,7 @@ def abandon_quest(character, quest_id):
         raise QuestNotActiveError(f"Quest '{quest_id}' is not active")
     
     character['active_quests'].remove(quest_id)
+    character_manager.mark_dirty(character)
     return True
 
 
@@ -128,21 +132,33 @@ def get_completed_quests(character, quest_data_dict):
 def get_available_quests(character, quest_data_dict):
    
     
+    # Mark completed/active quests by integer index once, instead of
+    # searching both lists for every quest in the catalog
+    id_map = game_data.get_id_map(quest_data_dict)
+    indexes = id_map.indexes
+    completed = id_map.flags(character.get('completed_quests', []))
+    active = id_map.flags(character.get('active_quests', []))
+    level = character['level']
+    
     available = []
     
     for quest_id, quest in quest_data_dict.items():
-        if quest_id in character.get('completed_quests', []):
-            continue
-        if quest_id in character.get('active_quests', []):
+        index = indexes[quest_id]
+        if completed[index] or active[index]:
             continue
         
         required_level = quest.get('required_level', 1)
-        if character['level'] < required_level:
+        if level < required_level:
             continue
         
         prerequisite = quest.get('prerequisite', 'NONE')
         if prerequisite != 'NONE':
-            if prerequisite not in character.get('completed_quests', []):
+            prerequisite_index = indexes.get(prerequisite)
+            if prerequisite_index is None:
+                # Not in the catalog, so only the list can say
+                if prerequisite not in character.get('completed_quests', []):
+                    continue
+            elif not completed[prerequisite_index]:
                 continue
         
         available.append(quest)
@@ -194,11 +210,14 @@ def can_accept_quest(character, quest_id, quest_data_dict):
 
 def get_quest_prerequisite_chain(quest_id, quest_data_dict):
    
-    # TODO: Implement prerequisite chain tracing
     
     if quest_id not in quest_data_dict:
         raise QuestNotFoundError(f"Quest '{quest_id}' not found")
     
+    # A QuestCatalog keeps its compiled graph, so this is a lookup + copy
+    if isinstance(quest_data_dict, game_data.Catalog):
+        return game_data.get_prerequisite_graph(quest_data_dict).chain(quest_id)
+    
     chain = []
     current_id = quest_id
     visited = set()
@@ -211,7 +230,7 @@ def get_quest_prerequisite_chain(quest_id, quest_data_dict):
         if current_id not in quest_data_dict:
             break
         
-        chain.insert(0, current_id)
+        chain.append(current_id)
         
         quest = quest_data_dict[current_id]
         prerequisite = quest.get('prerequisite', 'NONE')
@@ -221,6 +240,8 @@ def get_quest_prerequisite_chain(quest_id, quest_data_dict):
         
         current_id = prerequisite
     
+    # Built from the quest back to the start, so flip it
+    chain.reverse()
     return chain
 
 # ============================================================================
@@ -243,10 +264,21 @@ def get_quest_completion_percentage(character, quest_data_dict):
 def get_total_quest_rewards_earned(character, quest_data_dict):
     
     
+    completed = character.get('completed_quests', [])
+    
+    # A Catalog keeps its reward columns cached, so sum over those; for a
+    # plain dict, building columns would cost more than the lookups
+    if isinstance(quest_data_dict, game_data.Catalog):
+        columns = game_data.get_quest_columns(quest_data_dict)
+        return {
+            'total_xp': columns.total('reward_xp', completed),
+            'total_gold': columns.total('reward_gold', completed)
+        }
+    
     total_xp = 0
     total_gold = 0
     
-    for quest_id in character.get('completed_quests', []):
+    for quest_id in completed:
         if quest_id in quest_data_dict:
             quest = quest_data_dict[quest_id]
             total_xp += quest.get('reward_xp', 0)
@@ -261,6 +293,11 @@ def get_total_quest_rewards_earned(character, quest_data_dict):
 def get_quests_by_level(quest_data_dict, min_level, max_level):
    
     
+    if isinstance(quest_data_dict, game_data.Catalog):
+        columns = game_data.get_quest_columns(quest_data_dict)
+        quest_ids = columns.ids_between('required_level', min_level, max_level)
+        return [quest_data_dict[quest_id] for quest_id in quest_ids]
+    
     quests = []
     
     for quest_id, quest in quest_data_dict.items():
@@ -342,19 +379,23 @@ def display_character_quest_progress(character, quest_data_dict):
 def validate_quest_prerequisites(quest_data_dict):
    
     
-    for quest_id, quest in quest_data_dict.items():
-        prerequisite = quest.get('prerequisite', 'NONE')
-        
-        if prerequisite != 'NONE':
-            if prerequisite not in quest_data_dict:
-                raise QuestNotFoundError(
-                    f"Quest '{quest_id}' has invalid prerequisite '{prerequisite}'"
-                )
+    graph = game_data.get_prerequisite_graph(quest_data_dict)
+    
+    if graph.missing:
+        quest_id, prerequisite = next(iter(graph.missing.items()))
+        raise QuestNotFoundError(
+            f"Quest '{quest_id}' has invalid prerequisite '{prerequisite}'"
+        )
+    
+    if graph.cycles:
+        descriptions = [" -> ".join(cycle + cycle[:1]) for cycle in graph.cycles]
+        raise InvalidDataFormatError(
+            f"Prerequisite cycles found: {'; '.join(descriptions)}"
+        )
     
     return True
 
 
-
 # ============================================================================
 # TESTING
 # ============================================================================
@@ -0,0 +1,462 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Record Schema Module
+
+Name: [Cam'Ren Lilly]
+
+AI Usage: [Document any AI assistance used]
+
+This module describes the "KEY: value" records used by the data files and
+save files. Each record type is described once as a list of fields and
+compiled into fast parse/validate functions, so game_data and
+character_manager don't each need their own if/elif chains.
+"""
+
+import sys
+from functools import lru_cache
+from collections.abc import Mapping
+
+# How many lazily loaded text values to keep in memory at once
+TEXT_CACHE_SIZE = 1024
+
+# ============================================================================
+# CONVERTERS
+# ============================================================================
+
+def split_list(value):
+    """
+    Convert a comma-separated string into a list, skipping empty entries
+
+    Returns: List of stripped strings ([] for an empty value)
+    """
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+# ============================================================================
+# LAZY TEXT
+# ============================================================================
+
+class LazyText:
+    """
+    Placeholder for a text value that is still in the data file
+
+    Stores where the text is (file, byte offset and length) instead of the
+    text itself. Records read it the first time the field is used, through
+    a small shared cache. The file must not change while records holding
+    LazyText are in use.
+    """
+
+    __slots__ = ('filename', 'offset', 'length')
+
+    def __init__(self, filename, offset, length):
+        self.filename = filename
+        self.offset = offset
+        self.length = length
+
+    def read(self):
+        """Returns: The text, read from the file (or the cache)"""
+        return _read_text(self.filename, self.offset, self.length)
+
+    def __reduce__(self):
+        return (LazyText, (self.filename, self.offset, self.length))
+
+    def __repr__(self):
+        return f"LazyText({self.filename!r}, {self.offset}, {self.length})"
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def _read_text(filename, offset, length):
+    with open(filename, 'rb') as file:
+        file.seek(offset)
+        return file.read(length).decode('utf-8')
+
+# ============================================================================
+# RECORDS
+# ============================================================================
+
+class Record(Mapping):
+    """
+    Compact read-only record with one slot per field
+
+    Subclasses list their fields in __slots__ (in schema order) and get a
+    generated positional __init__ that fills each slot directly. They can
+    name fields in _interned for RecordSchema's loaders to intern, so
+    repeated IDs and types share one string. Records work like read-only dictionaries: record['cost'],
+    record.get('reward_xp', 0), 'title' in record, .items() and
+    comparing equal to a dict with the same data all behave the same.
+    A field holding a LazyText is read from disk when it is looked up.
+    """
+
+    __slots__ = ()
+    _interned = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._field_set = frozenset(cls.__slots__)
+        if cls.__slots__:
+            cls.__init__ = _make_init(cls)
+
+    @classmethod
+    def from_dict(cls, values):
+        """Build a record from a dictionary holding every field"""
+        return cls(*[values[name] for name in cls.__slots__])
+
+    def __getitem__(self, key):
+        if key not in self._field_set:
+            raise KeyError(key)
+        value = getattr(self, key)
+        if type(value) is LazyText:
+            return value.read()
+        return value
+
+    def __contains__(self, key):
+        return key in self._field_set
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __reduce__(self):
+        # Pickle as the class plus a tuple of values (no field names)
+        return (type(self), tuple(getattr(self, name) for name in self.__slots__))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+def _make_init(cls):
+    # Write out "def __init__(self, a, b): _set_a(self, a); ..." so a record
+    # is filled with one slot store per field and no loop or checks. The
+    # slot descriptors' __set__ skips Record.__setattr__
+    names = cls.__slots__
+    namespace = {f"_set_{name}": cls.__dict__[name].__set__ for name in names}
+    source = f"def __init__(self, {', '.join(names)}):\n"
+    source += "".join(f"    _set_{name}(self, {name})\n" for name in names)
+    exec(source, namespace)
+    return namespace['__init__']
+
+
+# ============================================================================
+# SCHEMA
+# ============================================================================
+
+class RecordSchema:
+    """
+    Description of one record type, compiled into parse/validate functions
+
+    Each field is a tuple of (name, type) or (name, type, converter). The
+    type can be a tuple of types like isinstance() takes. The converter
+    turns the text value into the right type; int fields use int() and
+    str fields keep the text when no converter is given.
+
+    After creating a schema use:
+        schema.parse(lines)    - lines -> dictionary (types converted)
+        schema.validate(dict)  - full field and type check of any dict
+        schema.load(lines)     - parse + validate in one step, returning
+                                 a record_class instance if one was given
+        schema.load(lines, values)
+                               - same, with some fields given directly
+                                 instead of read from the lines
+        schema.load_mapping(d) - the same for a dictionary of field values
+                                 (from JSON or CSV); text values go through
+                                 the converters like lines do
+    """
+
+    def __init__(self, record_name, fields, error_class,
+                 malformed_message, unknown_message, check=None, id_field=None,
+                 record_class=None):
+        """
+        Args:
+            record_name: Name used in error messages ("quest", "item", ...)
+            fields: List of field tuples (see class docstring)
+            error_class: Exception raised for any bad record
+            malformed_message: Message for a line without a colon, may use {line}
+            unknown_message: Message for an unknown key, may use {key}
+            check: Optional function(record) for checks beyond types
+            id_field: Field that identifies a record in a catalog, if any
+            record_class: Optional Record subclass that load() returns
+        """
+        self.record_name = record_name
+        self.id_field = id_field
+        self.record_class = record_class
+        self.field_names = [field[0] for field in fields]
+        self.error_class = error_class
+        self.malformed_message = malformed_message
+        self.unknown_message = unknown_message
+        self.check = check
+
+        # Work out every field's converter and type names once, up front
+        self.converters = {}
+        self.type_checks = []
+        for field in fields:
+            name, field_type = field[0], field[1]
+            if len(field) > 2:
+                converter = field[2]
+            elif field_type is int:
+                converter = int
+            else:
+                converter = None
+            self.converters[name] = converter
+
+            if isinstance(field_type, tuple):
+                type_names = " or ".join(t.__name__ for t in field_type)
+            else:
+                type_names = field_type.__name__
+            self.type_checks.append((name, field_type, type_names))
+
+        if record_class is not None and tuple(record_class.__slots__) != tuple(self.field_names):
+            raise ValueError(f"{record_class.__name__} slots must match the {record_name} fields")
+
+        self.parse = self._compile_parse()
+        self.validate = self._compile_validate()
+        self.load = self._compile_load()
+        self.load_mapping = self._compile_load_mapping()
+
+    def _compile_parse(self):
+        # Bind everything the loop needs to locals so each line is just
+        # a dictionary lookup and a converter call
+        converters = self.converters
+        error_class = self.error_class
+        malformed_message = self.malformed_message
+        unknown_message = self.unknown_message
+        record_name = self.record_name
+
+        def parse(lines):
+            record = {}
+
+            try:
+                for line in lines:
+                    line = line.strip()
+
+                    # Skip empty lines
+                    if not line:
+                        continue
+
+                    key, separator, value = line.partition(':')
+                    if not separator:
+                        raise error_class(malformed_message.format(line=line))
+
+                    key = key.strip()
+                    name = key.lower()
+                    if name not in converters:
+                        raise error_class(unknown_message.format(key=key))
+
+                    converter = converters[name]
+                    if converter is None:
+                        record[name] = value.strip()
+                    else:
+                        record[name] = converter(value.strip())
+
+            except error_class:
+                raise
+            except ValueError as e:
+                raise error_class(f"Could not convert value to correct type: {e}")
+            except Exception as e:
+                raise error_class(f"Error parsing {record_name} block: {e}")
+
+            return record
+
+        return parse
+
+    def _compile_validate(self):
+        type_checks = self.type_checks
+        error_class = self.error_class
+        check = self.check
+
+        def validate(record):
+            # Check each required field exists and has the right type
+            for name, field_type, type_names in type_checks:
+                if name not in record:
+                    raise error_class(f"Missing required field: {name}")
+
+                value = record[name]
+                if not isinstance(value, field_type):
+                    raise error_class(
+                        f"Invalid type for field '{name}': expected {type_names}, "
+                        f"got {type(value).__name__}"
+                    )
+
+            if check is not None:
+                check(record)
+
+            return True
+
+        return validate
+
+    def _compile_load(self):
+        if self.record_class is not None:
+            return self._compile_load_record()
+
+        parse = self.parse
+        field_names = self.field_names
+        field_count = len(field_names)
+        error_class = self.error_class
+        check = self.check
+
+        def load(lines, values=None):
+            record = parse(lines)
+            if values:
+                record.update(values)
+
+            # parse() already converted every value to its field's type and
+            # rejected unknown keys, so only missing fields are left to find
+            if len(record) != field_count:
+                for name in field_names:
+                    if name not in record:
+                        raise error_class(f"Missing required field: {name}")
+
+            if check is not None:
+                check(record)
+
+            return record
+
+        return load
+
+    def _compile_load_record(self):
+        # Same as parse() + load(), but each value goes straight into its
+        # place in a row for the record class, with no dictionary between
+        field_names = self.field_names
+        field_count = len(field_names)
+        error_class = self.error_class
+        malformed_message = self.malformed_message
+        unknown_message = self.unknown_message
+        record_name = self.record_name
+        check = self.check
+        record_class = self.record_class
+        # Field name -> (position in the row, converter)
+        plan = {name: (index, self.converters[name]) for index, name in enumerate(field_names)}
+        interned = [index for index, name in enumerate(field_names)
+                    if name in record_class._interned]
+        missing = object()
+        intern = sys.intern
+
+        def load(lines, values=None):
+            row = [missing] * field_count
+
+            try:
+                for line in lines:
+                    line = line.strip()
+
+                    # Skip empty lines
+                    if not line:
+                        continue
+
+                    key, separator, value = line.partition(':')
+                    if not separator:
+                        raise error_class(malformed_message.format(line=line))
+
+                    key = key.strip()
+                    name = key.lower()
+                    entry = plan.get(name)
+                    if entry is None:
+                        raise error_class(unknown_message.format(key=key))
+
+                    index, converter = entry
+                    if converter is None:
+                        row[index] = value.strip()
+                    else:
+                        row[index] = converter(value.strip())
+
+            except error_class:
+                raise
+            except ValueError as e:
+                raise error_class(f"Could not convert value to correct type: {e}")
+            except Exception as e:
+                raise error_class(f"Error parsing {record_name} block: {e}")
+
+            if values:
+                for name, value in values.items():
+                    row[plan[name][0]] = value
+
+            if missing in row:
+                raise error_class(f"Missing required field: {field_names[row.index(missing)]}")
+
+            for index in interned:
+                if type(row[index]) is str:
+                    row[index] = intern(row[index])
+
+            record = record_class(*row)
+            if check is not None:
+                check(record)
+            return record
+
+        return load
+
+    def _compile_load_mapping(self):
+        converters = self.converters
+        field_names = self.field_names
+        field_set = frozenset(field_names)
+        error_class = self.error_class
+        unknown_message = self.unknown_message
+        record_name = self.record_name
+        check = self.check
+        record_class = self.record_class
+        # (name, converter, type, type names) for each field, in order
+        plan = [(name, converters[name], field_type, type_names)
+                for name, field_type, type_names in self.type_checks]
+        # Positions in the row of fields the record class interns
+        interned = [index for index, name in enumerate(field_names)
+                    if record_class is not None and name in record_class._interned]
+
+        def load_mapping(values):
+            # Files written by our tools use the exact field names, so only
+            # other spellings ("Quest_ID", " cost") need normalising
+            if values.keys() != field_set:
+                named = {}
+                for key, value in values.items():
+                    name = key.strip().lower() if isinstance(key, str) else key
+                    if name not in converters:
+                        raise error_class(unknown_message.format(key=key))
+                    named[name] = value
+                values = named
+
+            row = []
+            try:
+                for name, converter, field_type, type_names in plan:
+                    if name not in values:
+                        raise error_class(f"Missing required field: {name}")
+                    value = values[name]
+
+                    # Text is converted like a "KEY: value" line would be.
+                    # Other JSON values only go through converters that
+                    # take more than text (like item effects)
+                    if type(value) is str:
+                        value = value.strip()
+                        if converter is not None:
+                            value = converter(value)
+                    elif converter is not None and converter is not int and value is not None:
+                        value = converter(value)
+
+                    if not isinstance(value, field_type):
+                        raise error_class(
+                            f"Invalid type for field '{name}': expected {type_names}, "
+                            f"got {type(value).__name__}"
+                        )
+                    row.append(value)
+
+            except error_class:
+                raise
+            except ValueError as e:
+                raise error_class(f"Could not convert value to correct type: {e}")
+            except Exception as e:
+                raise error_class(f"Error parsing {record_name} record: {e}")
+
+            if record_class is not None:
+                for index in interned:
+                    if type(row[index]) is str:
+                        row[index] = sys.intern(row[index])
+                record = record_class(*row)
+            else:
+                record = dict(zip(field_names, row))
+            if check is not None:
+                check(record)
+            return record
+
+        return load_mapping
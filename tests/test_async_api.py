@@ -0,0 +1,84 @@
+"""
+Test Async API
+Tests the asyncio versions of the catalog and save loaders
+"""
+
+import pytest
+import sys
+import os
+import time
+import asyncio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+import character_manager
+from custom_exceptions import CharacterNotFoundError
+
+SAVE_COUNT = 1000
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Default catalogs plus SAVE_COUNT saved characters"""
+    monkeypatch.chdir(tmp_path)
+    game_data.create_default_data_files()
+    save_directory = str(tmp_path / "saves")
+
+    for i in range(SAVE_COUNT):
+        character = character_manager.create_character(f"hero_{i}", "Warrior")
+        character['gold'] = i
+        character_manager.save_character(character, save_directory)
+
+    return "data/quests.txt", "data/items.txt", save_directory
+
+def test_async_matches_sync_and_timing(data_dir):
+    """Test loading catalogs and 1,000 saves concurrently against the sync path"""
+    quest_file, item_file, save_directory = data_dir
+    names = [f"hero_{i}" for i in range(SAVE_COUNT)]
+
+    start = time.perf_counter()
+    sync_quests = game_data.load_quests(quest_file)
+    sync_items = game_data.load_items(item_file)
+    sync_characters = [character_manager.load_character(name, save_directory) for name in names]
+    sync_time = time.perf_counter() - start
+
+    async def load_everything():
+        return await asyncio.gather(
+            game_data.aload_quests(quest_file),
+            game_data.aload_items(item_file),
+            *[character_manager.aload_character(name, save_directory) for name in names]
+        )
+
+    start = time.perf_counter()
+    quests, items, *characters = asyncio.run(load_everything())
+    async_time = time.perf_counter() - start
+
+    print(f"\nsync: {sync_time:.3f}s  async: {async_time:.3f}s "
+          f"({SAVE_COUNT} saves + catalogs)")
+
+    assert quests == sync_quests
+    assert items == sync_items
+    assert characters == sync_characters
+    assert characters[7]['gold'] == 7
+
+def test_async_save_round_trip(tmp_path):
+    """Test asave_character and aload_character with many saves at once"""
+    save_directory = str(tmp_path / "saves")
+    characters = [character_manager.create_character(f"mage_{i}", "Mage") for i in range(SAVE_COUNT)]
+
+    async def save_and_load():
+        await asyncio.gather(*[
+            character_manager.asave_character(character, save_directory)
+            for character in characters
+        ])
+        return await asyncio.gather(*[
+            character_manager.aload_character(character['name'], save_directory)
+            for character in characters
+        ])
+
+    assert asyncio.run(save_and_load()) == characters
+
+def test_async_errors_propagate(tmp_path):
+    """Test that the async loaders raise the same exceptions"""
+    with pytest.raises(CharacterNotFoundError):
+        asyncio.run(character_manager.aload_character("nobody", str(tmp_path)))
@@ -0,0 +1,644 @@
+"""
+Test Data Loading
+Tests the catalog loading features of game_data
+"""
+
+import pytest
+import sys
+import os
+import pickle
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+import quest_handler
+from record_schema import LazyText
+from concurrent.futures import ProcessPoolExecutor
+from custom_exceptions import InvalidDataFormatError, MissingDataFileError
+
+QUEST_TEXT = """QUEST_ID: first_quest
+TITLE: First Quest
+DESCRIPTION: The first one
+REWARD_XP: 50
+REWARD_GOLD: 25
+REQUIRED_LEVEL: 1
+PREREQUISITE: NONE
+
+QUEST_ID: second_quest
+TITLE: Second Quest
+DESCRIPTION: The second one
+REWARD_XP: 100
+REWARD_GOLD: 50
+REQUIRED_LEVEL: 2
+PREREQUISITE: first_quest
+"""
+
+ITEM_TEXT = """ITEM_ID: health_potion
+NAME: Health Potion
+TYPE: consumable
+EFFECT: health:20
+COST: 25
+DESCRIPTION: Restores 20 health points
+
+ITEM_ID: iron_sword
+NAME: Iron Sword
+TYPE: weapon
+EFFECT: strength:5
+COST: 100
+DESCRIPTION: A sturdy iron sword
+"""
+
+
+def write_file(path, text):
+    with open(path, 'w') as f:
+        f.write(text)
+    return str(path)
+
+# ============================================================================
+# SNAPSHOT CACHE TESTS
+# ============================================================================
+
+def test_snapshot_matches_parsed_data(tmp_path):
+    """Test that a warm snapshot load returns the same quests as a parse"""
+    filename = write_file(tmp_path / "quests.txt", QUEST_TEXT)
+
+    parsed = game_data.load_quests(filename)
+    first = game_data.load_quests(filename, use_snapshot=True)
+
+    assert os.path.exists(game_data.get_snapshot_path(filename))
+    assert game_data.load_snapshot(filename, "quests") == parsed
+    assert game_data.load_quests(filename, use_snapshot=True) == first == parsed
+
+def test_snapshot_ignored_after_edit(tmp_path):
+    """Test that changing the data file invalidates the snapshot"""
+    filename = write_file(tmp_path / "items.txt", ITEM_TEXT)
+    game_data.load_items(filename, use_snapshot=True)
+
+    write_file(filename, ITEM_TEXT.replace("COST: 25", "COST: 30"))
+
+    items = game_data.load_items(filename, use_snapshot=True)
+    assert items['health_potion']['cost'] == 30
+
+def test_snapshot_reused_after_touch(tmp_path):
+    """Test that a touched but unchanged file still uses the snapshot"""
+    filename = write_file(tmp_path / "items.txt", ITEM_TEXT)
+    game_data.load_items(filename, use_snapshot=True)
+
+    stat = os.stat(filename)
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert game_data.load_snapshot(filename, "items") is not None
+
+    # Same size but different content must not use the snapshot
+    write_file(filename, ITEM_TEXT.replace("COST: 25", "COST: 26"))
+    assert game_data.load_snapshot(filename, "items") is None
+
+# ============================================================================
+# STREAMING TESTS
+# ============================================================================
+
+def test_iter_quests_reports_line_numbers(tmp_path):
+    """Test that iter_quests yields each quest with its starting line"""
+    filename = write_file(tmp_path / "quests.txt", "\n\n" + QUEST_TEXT)
+
+    results = list(game_data.iter_quests(filename))
+
+    assert [line for line, quest in results] == [3, 11]
+    assert [quest['quest_id'] for line, quest in results] == ['first_quest', 'second_quest']
+
+def test_iter_items_error_has_line_number(tmp_path):
+    """Test that a bad record reports where it is in the file"""
+    filename = write_file(tmp_path / "items.txt", ITEM_TEXT.replace("COST: 100", "COST: lots"))
+
+    items = game_data.iter_items(filename)
+    line, item = next(items)
+    assert item['item_id'] == 'health_potion'
+
+    with pytest.raises(game_data.InvalidDataFormatError, match="line 8"):
+        next(items)
+
+def test_iter_missing_file_raises_immediately():
+    """Test that a missing file is reported before iterating"""
+    with pytest.raises(game_data.MissingDataFileError):
+        game_data.iter_quests("nonexistent_file.txt")
+
+# ============================================================================
+# MEMORY-MAPPED CATALOG TESTS
+# ============================================================================
+
+def test_mmap_catalog_matches_load_items(tmp_path):
+    """Test that MmapCatalog behaves like the loaded item dictionary"""
+    filename = write_file(tmp_path / "items.txt", ITEM_TEXT)
+    items = game_data.load_items(filename)
+
+    with game_data.MmapCatalog(filename, "items") as catalog:
+        assert len(catalog) == 2
+        assert 'iron_sword' in catalog
+        assert 'missing_item' not in catalog
+        assert catalog.records == {}
+
+        assert catalog['iron_sword'] == items['iron_sword']
+        assert list(catalog.records) == ['iron_sword']
+        assert dict(catalog.items()) == items
+
+def test_mmap_catalog_reuses_index(tmp_path):
+    """Test that the offset index is saved and loaded again"""
+    filename = write_file(tmp_path / "quests.txt", QUEST_TEXT)
+
+    with game_data.MmapCatalog(filename, "quests") as catalog:
+        index = catalog.index
+
+    assert os.path.exists(filename + ".index")
+    assert game_data.load_snapshot(filename, "quests-index", filename + ".index") == index
+
+def test_mmap_catalog_errors_on_access(tmp_path):
+    """Test that a bad record only fails when it is looked up"""
+    filename = write_file(tmp_path / "items.txt", ITEM_TEXT.replace("COST: 100", "COST: lots"))
+
+    with game_data.MmapCatalog(filename, "items") as catalog:
+        assert catalog['health_potion']['cost'] == 25
+        with pytest.raises(game_data.InvalidDataFormatError, match="line 8"):
+            catalog['iron_sword']
+
+# ============================================================================
+# HOT RELOAD TESTS
+# ============================================================================
+
+def test_reloader_applies_only_changes(tmp_path):
+    """Test that the reloader reports and applies edited records"""
+    filename = write_file(tmp_path / "items.txt", ITEM_TEXT)
+    items = game_data.load_items(filename)
+    potion = items['health_potion']
+    reloader = game_data.CatalogReloader(filename, "items", items)
+
+    assert reloader.poll() == {'added': [], 'removed': [], 'changed': []}
+
+    new_text = ITEM_TEXT.replace("COST: 100", "COST: 120").replace(
+        "ITEM_ID: health_potion", "ITEM_ID: mana_potion"
+    )
+    write_file(filename, new_text)
+    changes = reloader.poll()
+
+    assert changes == {'added': ['mana_potion'], 'removed': ['health_potion'],
+                       'changed': ['iron_sword']}
+    assert items == game_data.load_items(filename)
+    assert 'health_potion' not in items
+    assert items['mana_potion'] == dict(potion, item_id='mana_potion')
+
+def test_reloader_reads_file_only_after_change(tmp_path, monkeypatch):
+    """Test that creating a reloader doesn't read the file"""
+    filename = write_file(tmp_path / "items.txt", ITEM_TEXT)
+    items = game_data.load_items(filename)
+
+    def no_reading(self):
+        raise AssertionError("file read at startup")
+    monkeypatch.setattr(game_data.CatalogReloader, "_read_blocks", no_reading)
+    reloader = game_data.CatalogReloader(filename, "items", items)
+    monkeypatch.undo()
+
+    write_file(filename, ITEM_TEXT.replace("COST: 100", "COST: 120"))
+    assert reloader.poll() == {'added': [], 'removed': [], 'changed': ['iron_sword']}
+    assert items == game_data.load_items(filename)
+
+def test_reloader_keeps_catalog_on_error(tmp_path):
+    """Test that an invalid edit leaves the live catalog unchanged"""
+    filename = write_file(tmp_path / "quests.txt", QUEST_TEXT)
+    quests = game_data.load_quests(filename)
+    original = dict(quests)
+    reloader = game_data.CatalogReloader(filename, "quests", quests)
+
+    write_file(filename, QUEST_TEXT.replace("REWARD_XP: 100", "REWARD_XP: many")
+               .replace("REWARD_XP: 50", "REWARD_XP: 60"))
+
+    with pytest.raises(game_data.InvalidDataFormatError, match="line 9"):
+        reloader.poll()
+    assert quests == original
+
+# ============================================================================
+# SHARDED CATALOG TESTS
+# ============================================================================
+
+def test_load_sharded_directory(tmp_path):
+    """Test that a directory of shard files loads like one big file"""
+    first, second = QUEST_TEXT.split("\n\n")
+    shard_dir = tmp_path / "quests.d"
+    shard_dir.mkdir()
+    write_file(shard_dir / "a.txt", first)
+    write_file(shard_dir / "b.txt", second)
+    write_file(shard_dir / "notes.md", "not a shard")
+
+    expected = game_data.load_quests(write_file(tmp_path / "quests.txt", QUEST_TEXT))
+
+    assert game_data.load_quests(str(shard_dir), workers=1) == expected
+    assert game_data.load_quests(str(shard_dir), workers=2) == expected
+
+def test_sharded_duplicate_ids_rejected(tmp_path):
+    """Test that the same ID in two shards is an error"""
+    shard_dir = tmp_path / "items.d"
+    shard_dir.mkdir()
+    write_file(shard_dir / "a.txt", ITEM_TEXT)
+    write_file(shard_dir / "b.txt", ITEM_TEXT)
+
+    with pytest.raises(game_data.InvalidDataFormatError, match="Duplicate item ID"):
+        game_data.load_items(str(shard_dir), workers=2)
+
+# ============================================================================
+# RECORD SCHEMA TESTS
+# ============================================================================
+
+def test_schema_load_matches_parse_and_validate():
+    """Test that the compiled loader gives the same record as parse + validate"""
+    lines = QUEST_TEXT.split("\n\n")[0].split("\n")
+
+    quest = game_data.parse_quest_block(lines)
+    assert game_data.validate_quest_data(quest) == True
+    assert game_data.QUEST_SCHEMA.load(lines) == quest
+    assert quest['reward_xp'] == 50
+
+def test_schema_reports_bad_records():
+    """Test the schema's error messages for bad records"""
+    with pytest.raises(game_data.InvalidDataFormatError, match="Missing required field: title"):
+        game_data.QUEST_SCHEMA.load(["QUEST_ID: q", "DESCRIPTION: d", "REWARD_XP: 1",
+                                     "REWARD_GOLD: 1", "REQUIRED_LEVEL: 1",
+                                     "PREREQUISITE: NONE"])
+    with pytest.raises(game_data.InvalidDataFormatError, match="Unknown field in item"):
+        game_data.parse_item_block(["ITEM_ID: x", "COLOR: red"])
+    with pytest.raises(game_data.InvalidDataFormatError, match="Invalid item type"):
+        game_data.validate_item_data({'item_id': 'x', 'name': 'X', 'type': 'hat',
+                                      'effect': 'magic:1', 'cost': 1, 'description': ''})
+
+# ============================================================================
+# COLLECT-ALL-ERRORS TESTS
+# ============================================================================
+
+def test_non_strict_collects_every_error(tmp_path):
+    """Test that strict=False returns good records and all errors"""
+    bad_text = (QUEST_TEXT.replace("REWARD_XP: 50", "REWARD_XP: lots")
+                + "\nQUEST_ID: third_quest\nTITLE: Third\n"
+                + "\nQUEST_ID: fourth_quest\nTITLE: Fourth\nDESCRIPTION: d\n"
+                + "REWARD_XP: 1\nREWARD_GOLD: 1\nREQUIRED_LEVEL: 1\nPREREQUISITE: NONE\n")
+    filename = write_file(tmp_path / "quests.txt", bad_text)
+
+    quests, errors = game_data.load_quests(filename, strict=False)
+
+    assert list(quests) == ['second_quest', 'fourth_quest']
+    assert [(e['line'], e['record_id']) for e in errors] == [(1, 'first_quest'), (17, 'third_quest')]
+    assert all(e['file'] == filename for e in errors)
+    assert "Missing required field" in errors[1]['message']
+
+    # Strict mode still stops at the first problem
+    with pytest.raises(game_data.InvalidDataFormatError, match="line 1"):
+        game_data.load_quests(filename)
+
+def test_non_strict_reports_duplicate_shards(tmp_path):
+    """Test that duplicate IDs across shards become errors when not strict"""
+    shard_dir = tmp_path / "items.d"
+    shard_dir.mkdir()
+    write_file(shard_dir / "a.txt", ITEM_TEXT)
+    write_file(shard_dir / "b.txt", ITEM_TEXT)
+
+    items, errors = game_data.load_items(str(shard_dir), workers=1, strict=False)
+
+    assert len(items) == 2
+    assert sorted(e['record_id'] for e in errors) == ['health_potion', 'iron_sword']
+
+# ============================================================================
+# ITEM CATALOG TESTS
+# ============================================================================
+
+def test_item_catalog_queries():
+    """Test the type, stat and cost indexes of ItemCatalog"""
+    items = game_data.ItemCatalog(game_data.load_items("data/items.txt"))
+
+    assert items == game_data.load_items("data/items.txt")
+    assert {item['item_id'] for item in items.items_of_type('armor')} == \
+        {'leather_armor', 'steel_armor', 'magic_robe'}
+    assert {item['item_id'] for item in items.items_with_stat('magic')} == \
+        {'fire_staff', 'magic_robe', 'wisdom_elixir'}
+    assert [item['cost'] for item in items.items_in_cost_range(50, 100)] == [50, 50, 75, 75, 100]
+
+    found = items.find_items(item_type='weapon', max_cost=200)
+    assert [item['item_id'] for item in found] == ['iron_sword', 'fire_staff']
+    assert items.find_items(item_type='armor', stat_name='magic', min_cost=100) == \
+        [items['magic_robe']]
+
+def test_item_catalog_updates_indexes():
+    """Test that changing the catalog keeps the indexes correct"""
+    items = game_data.ItemCatalog()
+    items['club'] = {'item_id': 'club', 'type': 'weapon', 'effect': 'strength:2', 'cost': 5}
+    items['club'] = {'item_id': 'club', 'type': 'weapon', 'effect': 'magic:2', 'cost': 9}
+
+    assert items.items_with_stat('strength') == []
+    assert items.items_in_cost_range(max_cost=8) == []
+    assert items.find_items(stat_name='magic') == [items['club']]
+
+    items.pop('club')
+    assert items.items_of_type('weapon') == []
+    assert items.cost_index == []
+
+def test_item_catalog_bulk_update():
+    """Test that adding many items at once gives the same indexes"""
+    many = {f"item_{i}": {'item_id': f"item_{i}", 'type': 'weapon', 'effect': 'strength:1',
+                          'cost': (i * 37) % 101}
+            for i in range(200)}
+    items = game_data.ItemCatalog(many)
+    one_by_one = game_data.ItemCatalog()
+    for item_id, item in many.items():
+        one_by_one[item_id] = item
+    assert items.cost_index == one_by_one.cost_index
+
+    # Replacing items in bulk drops their old costs
+    items.update({item_id: dict(item, cost=5) for item_id, item in many.items()})
+    assert items.cost_index == sorted((5, item_id) for item_id in many)
+
+def count_armor(items):
+    # Runs in a worker process; items arrives pickled
+    return len(items.items_of_type('armor'))
+
+def test_catalogs_pickle_and_reach_workers():
+    """Test that catalogs survive pickling, indexes and ID map included"""
+    items = game_data.ItemCatalog(game_data.load_items("data/items.txt"))
+    quests = game_data.QuestCatalog(game_data.load_quests("data/quests.txt"))
+    items.pop('iron_sword')
+
+    copy = pickle.loads(pickle.dumps(items))
+    assert type(copy) is game_data.ItemCatalog and copy == items
+    assert copy.cost_index == items.cost_index
+    assert copy.id_map.ids == items.id_map.ids
+    assert pickle.loads(pickle.dumps(quests)) == quests
+
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        assert pool.submit(count_armor, items).result() == 3
+
+# ============================================================================
+# SLOTTED RECORD TESTS
+# ============================================================================
+
+def test_loaded_records_act_like_dicts(tmp_path):
+    """Test that quest and item records support the dict access patterns"""
+    quests = game_data.load_quests(write_file(tmp_path / "quests.txt", QUEST_TEXT))
+    quest = quests['second_quest']
+
+    assert isinstance(quest, game_data.QuestRecord)
+    assert quest['reward_xp'] == 100
+    assert quest.get('reward_gold', 0) == 50
+    assert quest.get('missing', 'default') == 'default'
+    assert 'title' in quest and 'get' not in quest
+    assert dict(quest) == game_data.parse_quest_block(QUEST_TEXT.split("\n\n")[1].split("\n"))
+    assert quest['prerequisite'] is quests['first_quest']['quest_id']
+
+    with pytest.raises(KeyError):
+        quest['missing']
+
+def test_records_are_read_only_and_picklable(tmp_path):
+    """Test that records can't be changed and survive pickling"""
+    import pickle
+
+    items = game_data.load_items(write_file(tmp_path / "items.txt", ITEM_TEXT))
+    sword = items['iron_sword']
+
+    with pytest.raises(AttributeError):
+        sword.cost = 1
+    with pytest.raises(TypeError):
+        sword['cost'] = 1
+
+    copy = pickle.loads(pickle.dumps(sword))
+    assert copy == sword
+    assert type(copy) is game_data.ItemRecord
+
+# ============================================================================
+# COLUMN VIEW TESTS
+# ============================================================================
+
+def test_quest_columns_match_records(tmp_path):
+    """Test that column totals and filters agree with the quest records"""
+    quests = game_data.QuestCatalog(game_data.load_quests(write_file(tmp_path / "quests.txt", QUEST_TEXT)))
+    columns = game_data.get_quest_columns(quests)
+
+    assert columns.ids == ['first_quest', 'second_quest']
+    assert columns.total('reward_xp') == 150
+    assert columns.total('reward_gold', ['second_quest', 'missing']) == 50
+    assert columns.ids_between('required_level', 2, 5) == ['second_quest']
+    assert game_data.get_quest_columns(quests) is columns
+
+def test_columns_rebuilt_after_change(tmp_path):
+    """Test that changing a catalog throws away its cached columns"""
+    items = game_data.ItemCatalog(game_data.load_items(write_file(tmp_path / "items.txt", ITEM_TEXT)))
+    columns = game_data.get_item_columns(items)
+
+    items.pop('iron_sword')
+
+    assert game_data.get_item_columns(items) is not columns
+    assert game_data.get_item_columns(items).total('cost') == 25
+
+def test_quest_queries_on_catalogs_and_dicts(tmp_path):
+    """Test that reward totals and level filters agree for both inputs"""
+    plain = game_data.load_quests(write_file(tmp_path / "quests.txt", QUEST_TEXT))
+    catalog = game_data.QuestCatalog(plain)
+    character = {'completed_quests': ['second_quest', 'missing']}
+
+    for quests in [plain, catalog]:
+        assert quest_handler.get_total_quest_rewards_earned(character, quests) == \
+            quest_handler.get_total_quest_rewards_earned(character, dict(plain))
+        assert quest_handler.get_quests_by_level(quests, 2, 5) == [plain['second_quest']]
+
+    # Plain dicts only look at the completed quests
+    odd = dict(plain, odd_quest={'quest_id': 'odd_quest', 'reward_xp': 2**70, 'reward_gold': 'lots'})
+    assert quest_handler.get_total_quest_rewards_earned(character, odd) == \
+        quest_handler.get_total_quest_rewards_earned(character, plain)
+
+# ============================================================================
+# PREREQUISITE GRAPH TESTS
+# ============================================================================
+
+def make_quest(quest_id, prerequisite):
+    return {'quest_id': quest_id, 'required_level': 1, 'prerequisite': prerequisite}
+
+def test_prerequisite_graph_order_and_chains():
+    """Test topological order, depth and chains of a quest catalog"""
+    quests = game_data.QuestCatalog({
+        'c': make_quest('c', 'b'),
+        'b': make_quest('b', 'a'),
+        'a': make_quest('a', 'NONE'),
+        'd': make_quest('d', 'a')
+    })
+    graph = game_data.get_prerequisite_graph(quests)
+
+    assert graph.order.index('a') < graph.order.index('b') < graph.order.index('c')
+    assert graph.depth == {'a': 0, 'b': 1, 'c': 2, 'd': 1}
+    assert graph.cycles == []
+
+    chain = quest_handler.get_quest_prerequisite_chain('c', quests)
+    assert chain == ['a', 'b', 'c']
+    chain.append('changed')
+    assert quest_handler.get_quest_prerequisite_chain('c', quests) == ['a', 'b', 'c']
+
+def test_prerequisite_cycles_reported():
+    """Test that a prerequisite loop is found and rejected"""
+    quests = {
+        'a': make_quest('a', 'b'),
+        'b': make_quest('b', 'a'),
+        'c': make_quest('c', 'a')
+    }
+    graph = game_data.get_prerequisite_graph(quests)
+
+    assert graph.cycles == [['a', 'b']]
+    assert 'c' not in graph.depth
+    assert graph.chain('c') == quest_handler.get_quest_prerequisite_chain('c', quests)
+    with pytest.raises(InvalidDataFormatError):
+        quest_handler.validate_quest_prerequisites(quests)
+
+def test_deep_prerequisite_chain():
+    """Test a chain thousands of quests deep"""
+    quests = game_data.QuestCatalog(
+        (f"q{i}", make_quest(f"q{i}", f"q{i - 1}" if i else 'NONE')) for i in range(5000)
+    )
+
+    assert quest_handler.get_quest_prerequisite_chain('q4999', quests) == [f"q{i}" for i in range(5000)]
+    assert quest_handler.get_quest_prerequisite_chain('q2000', quests)[-1] == 'q2000'
+    assert game_data.get_prerequisite_graph(quests).depth['q4999'] == 4999
+
+# ============================================================================
+# LAZY TEXT TESTS
+# ============================================================================
+
+def test_lazy_fields_match_eager_load(tmp_path):
+    """Test that lazily loaded text reads back exactly as an eager load"""
+    text = QUEST_TEXT.replace("The first one", "  Première quête – ünïcode  ").replace("\n", "\r\n")
+    filename = write_file(tmp_path / "quests.txt", text)
+
+    eager = game_data.load_quests(filename)
+    lazy = game_data.load_quests(filename, lazy_fields=('description', 'title'))
+
+    assert isinstance(lazy['first_quest'].description, LazyText)
+    assert lazy == eager
+    assert lazy['first_quest']['description'] == "Première quête – ünïcode"
+
+def test_lazy_fields_survive_snapshot(tmp_path):
+    """Test that lazy and eager loads keep separate snapshots"""
+    filename = write_file(tmp_path / "items.txt", ITEM_TEXT)
+
+    game_data.load_items(filename, use_snapshot=True)
+    lazy = game_data.load_items(filename, use_snapshot=True, lazy_fields=('description',))
+    cached = game_data.load_items(filename, use_snapshot=True, lazy_fields=('description',))
+
+    assert isinstance(cached['iron_sword'].description, LazyText)
+    assert cached['iron_sword']['description'] == "A sturdy iron sword"
+    assert cached == lazy
+
+def test_lazy_fields_must_be_text(tmp_path):
+    """Test that only text fields can be loaded lazily"""
+    filename = write_file(tmp_path / "items.txt", ITEM_TEXT)
+    with pytest.raises(ValueError):
+        game_data.load_items(filename, lazy_fields=('cost',))
+
+# ============================================================================
+# JSONL AND CSV FORMAT TESTS
+# ============================================================================
+
+QUEST_JSONL = (
+    '{"quest_id": "first_quest", "title": "First Quest", "description": "The first one", '
+    '"reward_xp": 50, "reward_gold": 25, "required_level": 1, "prerequisite": "NONE"}\n'
+    '\n'
+    '{"QUEST_ID": "second_quest", "Title": "Second Quest", "description": "The second one", '
+    '"reward_xp": "100", "reward_gold": 50, "required_level": 2, "prerequisite": "first_quest"}\n'
+)
+
+ITEM_CSV = """item_id,name,type,effect,cost,description
+health_potion,Health Potion,consumable,health:20,25,Restores 20 health points
+iron_sword,Iron Sword,Weapon,strength:5,100,A sturdy iron sword
+"""
+
+def test_jsonl_and_csv_match_text_format(tmp_path):
+    """Test that every format loads to the same records"""
+    quests = game_data.load_quests(write_file(tmp_path / "quests.txt", QUEST_TEXT))
+    items = game_data.load_items(write_file(tmp_path / "items.txt", ITEM_TEXT))
+
+    assert game_data.load_quests(write_file(tmp_path / "quests.jsonl", QUEST_JSONL)) == quests
+    assert game_data.load_items(write_file(tmp_path / "items.csv", ITEM_CSV)) == items
+
+def test_jsonl_and_csv_errors_have_lines(tmp_path):
+    """Test that bad JSON lines and CSV rows are reported with line numbers"""
+    jsonl = QUEST_JSONL + '{"quest_id": "broken", "reward_xp": 5.5}\nnot json\n'
+    quests, errors = game_data.load_quests(write_file(tmp_path / "quests.jsonl", jsonl), strict=False)
+
+    assert len(quests) == 2
+    assert [(error['line'], error['record_id']) for error in errors] == [(4, 'broken'), (5, None)]
+
+    csv_text = ITEM_CSV + "bad_item,Bad,weapon,strength:1,lots,Oops\n"
+    with pytest.raises(InvalidDataFormatError, match="line 4"):
+        game_data.load_items(write_file(tmp_path / "items.csv", csv_text))
+
+def test_mixed_format_shards(tmp_path):
+    """Test a sharded directory holding files in different formats"""
+    shard_dir = tmp_path / "items.d"
+    shard_dir.mkdir()
+    write_file(shard_dir / "a.csv", ITEM_CSV.replace("iron_sword", "steel_sword"))
+    write_file(shard_dir / "b.txt", ITEM_TEXT.replace("health_potion", "big_potion"))
+
+    items = game_data.load_items(str(shard_dir), workers=1)
+    assert sorted(items) == ['big_potion', 'health_potion', 'iron_sword', 'steel_sword']
+
+# ============================================================================
+# SHARED MEMORY CATALOG TESTS
+# ============================================================================
+
+def count_weapons(items):
+    # Runs in a worker process; items arrives as a SharedCatalog name
+    with items:
+        return sum(1 for item_id in items if items[item_id]['type'] == 'weapon')
+
+def test_shared_catalog_lookups(tmp_path):
+    """Test that a shared catalog reads back the published records"""
+    items = game_data.load_items(write_file(tmp_path / "items.txt", ITEM_TEXT))
+
+    with game_data.SharedCatalog.publish(items) as shared:
+        attached = game_data.SharedCatalog(shared.name)
+        assert dict(attached) == items
+        assert attached['iron_sword']['effect'] == (('strength', 5),)
+        assert 'missing' not in attached and 5 not in attached
+        with pytest.raises(KeyError):
+            attached['missing']
+        attached.close()
+
+    with pytest.raises(MissingDataFileError):
+        game_data.SharedCatalog(shared.name)
+
+def test_shared_catalog_in_process_pool(tmp_path):
+    """Test that pool workers attach to the catalog by name"""
+    items = game_data.load_items(write_file(tmp_path / "items.txt", ITEM_TEXT))
+
+    with game_data.SharedCatalog.publish(items) as shared:
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            assert list(pool.map(count_weapons, [shared] * 4)) == [1, 1, 1, 1]
+
+# ============================================================================
+# DENSE ID TESTS
+# ============================================================================
+
+def test_id_map_is_stable_across_reloads(tmp_path):
+    """Test that catalog indexes never move or get reused"""
+    items = game_data.ItemCatalog(game_data.load_items(write_file(tmp_path / "items.txt", ITEM_TEXT)))
+    id_map = items.id_map
+    sword = id_map.index_of('iron_sword')
+
+    removed = items.pop('health_potion')
+    items['shield'] = removed
+    items['health_potion'] = removed
+
+    assert id_map.index_of('iron_sword') == sword
+    assert id_map.ids == ['health_potion', 'iron_sword', 'shield']
+    assert id_map.decode(id_map.encode(['shield', 'iron_sword'])) == ['shield', 'iron_sword']
+    assert id_map.flags(['shield', 'unknown']) == bytearray([0, 0, 1])
+
+def test_available_quests_on_integer_ids(tmp_path):
+    """Test quest availability through IdMap flags on catalogs and dicts"""
+    quests = game_data.load_quests(write_file(tmp_path / "quests.txt", QUEST_TEXT))
+    character = {'level': 2, 'active_quests': [], 'completed_quests': ['first_quest']}
+
+    for catalog in (game_data.QuestCatalog(quests), dict(quests)):
+        available = quest_handler.get_available_quests(character, catalog)
+        assert [quest['quest_id'] for quest in available] == ['second_quest']
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
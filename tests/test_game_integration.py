@@ -249,6 +249,18 @@ def test_load_game_data():
         assert 'type' in item
         assert 'cost' in item
 
+def test_load_game_data_with_empty_split_directory(tmp_path, monkeypatch):
+    """Test that an empty quests.d falls back to the default data files"""
+    import main
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("data/quests.d")
+    
+    main.load_game_data()
+    
+    assert len(main.all_quests) > 0
+    assert len(main.all_items) > 0
+    assert os.path.exists("data/quests.txt")
+
 def test_data_validation():
     """Test that data validation works"""
     valid_quest = {
@@ -0,0 +1,85 @@
+"""
+Test Item Effects
+Tests that item effects are parsed once and used by the inventory system
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+import inventory_system
+import character_manager
+from custom_exceptions import InvalidItemTypeError
+
+def test_parse_effect_formats():
+    """Test that every effect format becomes the same ItemEffect"""
+    effect = game_data.parse_effect("Strength:5, defense:3")
+
+    assert effect == (('strength', 5), ('defense', 3))
+    assert str(effect) == "strength:5,defense:3"
+    assert game_data.parse_effect({'strength': 5, 'defense': 3}) == effect
+    assert game_data.parse_effect(effect) is effect
+
+    with pytest.raises(ValueError):
+        game_data.parse_effect("strength")
+
+def test_loaded_items_have_parsed_effects():
+    """Test that load_items stores effects already parsed"""
+    items = game_data.load_items("data/items.txt")
+
+    assert items['iron_sword']['effect'] == (('strength', 5),)
+    assert isinstance(items['iron_sword']['effect'], game_data.ItemEffect)
+
+def test_inventory_uses_multi_stat_effects():
+    """Test using and equipping items with several stats"""
+    char = character_manager.create_character("EffectTest", "Warrior")
+    char['health'] = 50
+    potion = {'type': 'consumable', 'effect': game_data.parse_effect("health:20,magic:2")}
+    armor = {'type': 'armor', 'name': 'Robe', 'effect': "magic:5"}
+
+    inventory_system.add_item_to_inventory(char, "potion")
+    inventory_system.use_item(char, "potion", potion)
+    assert char['health'] == 70
+    assert char['magic'] == 7
+
+    inventory_system.add_item_to_inventory(char, "robe")
+    inventory_system.equip_armor(char, "robe", armor)
+    assert char['magic'] == 12
+
+    inventory_system.add_item_to_inventory(char, "bad")
+    with pytest.raises(InvalidItemTypeError):
+        inventory_system.use_item(char, "bad", {'type': 'consumable', 'effect': 'oops'})
+
+def test_equip_unequip_restores_stats():
+    """Test that equipping and unequipping leaves stats where they started"""
+    items = game_data.load_items("data/items.txt")
+    char = character_manager.create_character("CycleTest", "Warrior")
+    before = dict(char)
+    armor_id = next(item_id for item_id, item in items.items() if item['type'] == 'armor')
+    weapon_id = next(item_id for item_id, item in items.items() if item['type'] == 'weapon')
+    inventory_system.add_item_to_inventory(char, armor_id)
+    inventory_system.add_item_to_inventory(char, weapon_id)
+
+    for _ in range(3):
+        inventory_system.equip_armor(char, armor_id, items[armor_id], items)
+        inventory_system.equip_weapon(char, weapon_id, items[weapon_id], items)
+        assert char != before
+        inventory_system.unequip_armor(char, items)
+        inventory_system.unequip_weapon(char, items)
+
+    for stat in ('health', 'max_health', 'strength', 'magic'):
+        assert char[stat] == before[stat]
+
+    # Swapping armor takes the old armor's bonus away
+    inventory_system.equip_armor(char, armor_id, items[armor_id], items)
+    inventory_system.add_item_to_inventory(char, "robe")
+    robe = {'type': 'armor', 'effect': "magic:5"}
+    inventory_system.equip_armor(char, "robe", robe, dict(items, robe=robe))
+    assert char['max_health'] == before['max_health']
+    assert char['magic'] == before['magic'] + 5
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,468 @@
+"""
+Test Save Backends
+Tests that every save backend stores and loads characters the same way
+"""
+
+import pytest
+import sys
+import os
+import time
+import sqlite3
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import inventory_system
+from custom_exceptions import CharacterNotFoundError
+
+@pytest.fixture(params=["file", "sqlite", "journal"])
+def backend(request):
+    """Switch save_character & co. to each backend in turn"""
+    previous = character_manager.SAVE_BACKEND
+    character_manager.set_save_backend(request.param)
+    yield request.param
+    character_manager.close_save_backends()
+    character_manager.SAVE_BACKEND = previous
+
+def make_character(name, level=1):
+    character = character_manager.create_character(name, "Rogue")
+    character['level'] = level
+    character['inventory'] = ['health_potion', 'iron_sword']
+    character['completed_quests'] = ['first_quest']
+    return character
+
+# ============================================================================
+# BACKEND TESTS
+# ============================================================================
+
+def test_save_load_round_trip(backend, tmp_path):
+    """Test that a saved character loads back unchanged"""
+    character = make_character("Ayla", level=4)
+
+    assert character_manager.save_character(character, str(tmp_path))
+    assert character_manager.load_character("Ayla", str(tmp_path)) == character
+
+    character['gold'] = 999
+    character_manager.mark_dirty(character)
+    character_manager.save_character(character, str(tmp_path))
+    assert character_manager.load_character("Ayla", str(tmp_path))['gold'] == 999
+
+def test_list_and_delete(backend, tmp_path):
+    """Test listing and deleting saves"""
+    for name in ["Bram", "Cira", "Dov"]:
+        character_manager.save_character(make_character(name), str(tmp_path))
+
+    assert sorted(character_manager.list_saved_characters(str(tmp_path))) == ["Bram", "Cira", "Dov"]
+
+    character_manager.delete_character("Cira", str(tmp_path))
+    assert sorted(character_manager.list_saved_characters(str(tmp_path))) == ["Bram", "Dov"]
+
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.delete_character("Cira", str(tmp_path))
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("Cira", str(tmp_path))
+
+def test_sqlite_uses_wal_and_indexes(tmp_path):
+    """Test the SQLite database settings"""
+    backend = character_manager.get_save_backend(str(tmp_path), "sqlite")
+    try:
+        connection = backend.connection
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        indexes = {row[1] for row in connection.execute("PRAGMA index_list(characters)")}
+        assert {"characters_level", "characters_class"} <= indexes
+    finally:
+        character_manager.close_save_backends()
+
+def test_unknown_backend_rejected():
+    """Test that a misspelled backend name is an error"""
+    with pytest.raises(ValueError):
+        character_manager.set_save_backend("floppy")
+
+def test_incomplete_backend_rejected():
+    """Test that a backend missing a method fails when it is created"""
+    class NoDeleteBackend(character_manager.SaveBackend):
+        def save(self, character):
+            return True
+
+        def load(self, character_name):
+            return None
+
+        def list_names(self):
+            return []
+
+        def list_summaries(self):
+            return []
+
+    with pytest.raises(TypeError):
+        NoDeleteBackend()
+
+def test_character_summaries(backend, tmp_path):
+    """Test listing name, class, level and save time without loading saves"""
+    before = time.time()
+    for name, level in [("Pax", 3), ("Ora", 7), ("Quin", 1)]:
+        character_manager.save_character(make_character(name, level), str(tmp_path))
+
+    summaries = character_manager.list_character_summaries(str(tmp_path))
+    assert [(s['name'], s['class'], s['level']) for s in summaries] == [
+        ("Ora", "Rogue", 7), ("Pax", "Rogue", 3), ("Quin", "Rogue", 1)
+    ]
+    assert all(summary['saved_at'] >= before - 1 for summary in summaries)
+
+    character = make_character("Pax", 4)
+    character_manager.save_character(character, str(tmp_path))
+    character_manager.delete_character("Quin", str(tmp_path))
+    summaries = character_manager.list_character_summaries(str(tmp_path))
+    assert [(s['name'], s['level']) for s in summaries] == [("Ora", 7), ("Pax", 4)]
+
+# ============================================================================
+# ATOMIC SAVE AND GROUP COMMIT TESTS
+# ============================================================================
+
+def test_failed_save_keeps_old_file(tmp_path, monkeypatch):
+    """Test that a save that fails part way leaves the old save intact"""
+    character = make_character("Eno")
+    character_manager.save_character(character, str(tmp_path))
+
+    def disk_full(fd):
+        raise OSError("No space left on device")
+    monkeypatch.setattr(os, "fsync", disk_full)
+
+    changed = dict(character, gold=1)
+    with pytest.raises(OSError):
+        character_manager.save_character(changed, str(tmp_path))
+    monkeypatch.undo()
+
+    assert character_manager.load_character("Eno", str(tmp_path)) == character
+    assert sorted(os.listdir(tmp_path)) == ["Eno_save.txt", "manifest.jsonl"]
+
+def test_group_commit_batches_saves(backend, tmp_path):
+    """Test that saves in a group commit all land when the block ends"""
+    characters = [make_character(f"hero_{i}", level=i + 1) for i in range(20)]
+
+    with character_manager.group_commit(str(tmp_path)):
+        for character in characters:
+            character_manager.save_character(character, str(tmp_path))
+        # A later save of the same character replaces the earlier one
+        characters[0]['gold'] = 5
+        character_manager.mark_dirty(characters[0])
+        character_manager.save_character(characters[0], str(tmp_path))
+
+    for character in characters:
+        assert character_manager.load_character(character['name'], str(tmp_path)) == character
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+# ============================================================================
+# MANIFEST TESTS
+# ============================================================================
+
+def test_sqlite_failed_commit_rolls_back(tmp_path):
+    """Test that a failed commit doesn't leave the transaction open"""
+    backend = character_manager.get_save_backend(str(tmp_path), "sqlite")
+    connection = backend.connection
+
+    class FailingCommit:
+        in_transaction = property(lambda self: connection.in_transaction)
+
+        def execute(self, sql, *args):
+            if sql == "COMMIT":
+                raise sqlite3.OperationalError("disk I/O error")
+            return connection.execute(sql, *args)
+
+    try:
+        backend.connection = FailingCommit()
+        backend.begin_batch()
+        backend.save(make_character("Ula"))
+        with pytest.raises(sqlite3.OperationalError):
+            backend.end_batch()
+        backend.connection = connection
+
+        assert not connection.in_transaction
+        assert backend.list_names() == []
+        backend.save(make_character("Ula"))
+        assert backend.list_names() == ["Ula"]
+    finally:
+        backend.connection = connection
+        character_manager.close_save_backends()
+
+def test_manifest_rebuilt_when_stale(tmp_path):
+    """Test that saves added behind the manifest's back still get listed"""
+    character_manager.save_character(make_character("Rho"), str(tmp_path))
+    manifest = tmp_path / "manifest.jsonl"
+    assert manifest.exists()
+
+    # A save copied in by hand makes the directory newer than the manifest
+    # (backdated, as file times can be too coarse to tell them apart here)
+    old = time.time() - 10
+    os.utime(manifest, (old, old))
+    text = (tmp_path / "Rho_save.txt").read_text()
+    (tmp_path / "Sol_save.txt").write_text(text.replace("NAME: Rho", "NAME: Sol"))
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Rho", "Sol"]
+
+    # Missing, or cut short by a crash
+    manifest.unlink()
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Rho", "Sol"]
+    with open(manifest, 'a') as file:
+        file.write('{"name":"Tam","class"')
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Rho", "Sol"]
+
+    # An unreadable save is listed without a class or level
+    (tmp_path / "Sol_save.txt").write_text("NOT A SAVE\n")
+    manifest.unlink()
+    summaries = character_manager.list_character_summaries(str(tmp_path))
+    assert summaries[1]['name'] == "Sol" and summaries[1]['class'] is None
+
+def test_empty_batch_in_missing_directory(backend, tmp_path):
+    """Test that a group commit with no saves doesn't need the directory"""
+    with character_manager.group_commit(str(tmp_path / "never_made")):
+        pass
+    assert character_manager.list_saved_characters(str(tmp_path / "never_made")) == []
+
+def test_manifest_compacts_old_entries(tmp_path, monkeypatch):
+    """Test that repeated saves don't grow the manifest without limit"""
+    monkeypatch.setattr(character_manager.FileSaveBackend, "MANIFEST_SLACK", 5)
+    character = make_character("Uma")
+    for gold in range(20):
+        character_manager.add_gold(character, 1)
+        character_manager.save_character(character, str(tmp_path))
+        character_manager.list_saved_characters(str(tmp_path))
+
+    lines = (tmp_path / "manifest.jsonl").read_text().splitlines()
+    assert len(lines) <= 2 + 5 + 1
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Uma"]
+
+# ============================================================================
+# AUTOSAVE TESTS
+# ============================================================================
+
+def test_autosave_coalesces_pending_saves(tmp_path):
+    """Test that queued saves of one character are written once, newest first"""
+    writer = character_manager.AutosaveWriter(str(tmp_path), interval=60)
+    try:
+        character = make_character("Fen")
+        for gold in [10, 20, 30]:
+            character['gold'] = gold
+            character_manager.mark_dirty(character)
+            writer.submit(character)
+        # Changes after submit must not leak into the queued copy
+        character['inventory'].append('late_item')
+
+        writer.flush()
+        loaded = character_manager.load_character("Fen", str(tmp_path))
+        assert loaded['gold'] == 30
+        assert 'late_item' not in loaded['inventory']
+        assert writer.written == 1
+    finally:
+        writer.close()
+
+def test_autosave_writes_on_interval_and_close(tmp_path):
+    """Test that pending saves are written by the timer and on shutdown"""
+    writer = character_manager.AutosaveWriter(str(tmp_path), interval=0.05)
+    writer.submit(make_character("Gil"))
+    for _ in range(100):
+        if writer.written:
+            break
+        time.sleep(0.02)
+    assert writer.written == 1
+
+    writer.interval = 60
+    writer.submit(make_character("Hal"))
+    writer.close()
+    assert character_manager.load_character("Hal", str(tmp_path))['name'] == "Hal"
+    with pytest.raises(RuntimeError):
+        writer.submit(make_character("Ivo"))
+
+def test_autosave_marks_character_saved(tmp_path):
+    """Test that a written autosave makes the live character clean"""
+    writer = character_manager.AutosaveWriter(str(tmp_path), interval=60)
+    try:
+        character = make_character("Jun")
+        writer.submit(character)
+        writer.flush()
+        assert not character_manager.is_dirty(character, str(tmp_path))
+
+        # Unchanged, so nothing is queued
+        writer.submit(character)
+        assert not writer.pending
+    finally:
+        writer.close()
+
+def test_failed_autosave_stays_dirty(tmp_path, monkeypatch):
+    """Test that a character whose batch failed to commit is saved again"""
+    writer = character_manager.AutosaveWriter(str(tmp_path), interval=60)
+    try:
+        character = make_character("Kit")
+        real_replace = os.replace
+
+        def failing_replace(source, target):
+            if str(target).endswith("_save.txt"):
+                raise OSError("rename failed")
+            real_replace(source, target)
+        monkeypatch.setattr(os, "replace", failing_replace)
+
+        character_manager.add_gold(character, 500)
+        writer.submit(character)
+        writer.flush()
+        monkeypatch.undo()
+
+        assert writer.errors and character_manager.is_dirty(character, str(tmp_path))
+        writer.submit(character)
+        writer.flush()
+        assert character_manager.load_character("Kit", str(tmp_path))['gold'] == 600
+    finally:
+        writer.close()
+
+# ============================================================================
+# DIRTY TRACKING TESTS
+# ============================================================================
+
+def test_unchanged_character_not_rewritten(backend, tmp_path, monkeypatch):
+    """Test that saving a character that hasn't changed skips the write"""
+    monkeypatch.setattr(character_manager, "SAVE_STATS", {'written': 0, 'skipped': 0})
+    character = make_character("Kai")
+
+    character_manager.save_character(character, str(tmp_path))
+    character_manager.save_character(character, str(tmp_path))
+    assert character_manager.SAVE_STATS == {'written': 1, 'skipped': 1}
+
+    inventory_system.purchase_item(character, 'health_potion', {'cost': 25})
+    assert character_manager.is_dirty(character, str(tmp_path))
+    character_manager.save_character(character, str(tmp_path))
+    assert character_manager.SAVE_STATS == {'written': 2, 'skipped': 1}
+    assert character_manager.load_character("Kai", str(tmp_path)) == character
+
+def test_loaded_character_is_clean(tmp_path):
+    """Test that loading counts as saved and every change marks it dirty"""
+    character_manager.save_character(make_character("Lio"), str(tmp_path))
+    loaded = character_manager.load_character("Lio", str(tmp_path))
+    assert not character_manager.is_dirty(loaded, str(tmp_path))
+
+    character_manager.add_gold(loaded, 10)
+    assert character_manager.is_dirty(loaded, str(tmp_path))
+
+    # Plain dicts aren't tracked, so they are always saved
+    assert character_manager.is_dirty(dict(loaded))
+
+# ============================================================================
+# JOURNAL TESTS
+# ============================================================================
+
+def test_journal_appends_only_changes(tmp_path):
+    """Test that a small change adds a small journal line, not a new save"""
+    backend = character_manager.get_save_backend(str(tmp_path), "journal")
+    try:
+        character = make_character("Mira")
+        character['inventory'] = [f"item_{i}" for i in range(200)]
+        backend.save(character)
+        snapshot = (tmp_path / "Mira_save.txt").read_text()
+
+        character['gold'] += 5
+        character['inventory'].append('new_item')
+        backend.save(character)
+        character['inventory'].remove('item_7')
+        backend.save(character)
+
+        assert (tmp_path / "Mira_save.txt").read_text() == snapshot
+        lines = (tmp_path / "Mira_save.journal").read_text().splitlines()
+        assert lines[1:] == ['{"gold":105,"inventory+":["new_item"]}', '{"inventory-":["item_7"]}']
+    finally:
+        character_manager.close_save_backends()
+
+    # A new backend (like a restarted game) replays the journal
+    backend = character_manager.get_save_backend(str(tmp_path), "journal")
+    try:
+        assert backend.load("Mira") == character
+    finally:
+        character_manager.close_save_backends()
+
+def test_journal_compacts_past_threshold(tmp_path, monkeypatch):
+    """Test that a long journal is folded into a new snapshot"""
+    monkeypatch.setattr(character_manager, "JOURNAL_COMPACT_SIZE", 200)
+    backend = character_manager.get_save_backend(str(tmp_path), "journal")
+    try:
+        character = make_character("Nox")
+        for gold in range(50):
+            character['gold'] = gold
+            backend.save(character)
+            journal = tmp_path / "Nox_save.journal"
+            assert not journal.exists() or journal.stat().st_size <= 200
+
+        assert "GOLD: " in (tmp_path / "Nox_save.txt").read_text()
+        assert backend.load("Nox") == character
+    finally:
+        character_manager.close_save_backends()
+
+def test_journal_cache_is_bounded(tmp_path, monkeypatch):
+    """Test that the journal backend keeps only recent characters' fields"""
+    monkeypatch.setattr(character_manager, "JOURNAL_CACHE_SIZE", 3)
+    backend = character_manager.get_save_backend(str(tmp_path), "journal")
+    try:
+        characters = [make_character(f"Pip{i}") for i in range(5)]
+        for character in characters:
+            backend.save(character)
+        assert list(backend.states) == ["Pip2", "Pip3", "Pip4"]
+
+        # A dropped character is read back from disk and still journaled
+        characters[0]['gold'] = 99
+        backend.save(characters[0])
+        assert list(backend.states) == ["Pip3", "Pip4", "Pip0"]
+        assert (tmp_path / "Pip0_save.journal").exists()
+        assert backend.load("Pip0") == characters[0]
+
+        # Listing every save doesn't fill the cache
+        backend.states.clear()
+        os.remove(backend.manifest_path())
+        assert len(backend.list_summaries()) == 5
+        assert not backend.states
+    finally:
+        character_manager.close_save_backends()
+
+def test_journal_survives_crashes(tmp_path):
+    """Test that stale journals and half-written lines are not replayed"""
+    backend = character_manager.get_save_backend(str(tmp_path), "journal")
+    try:
+        character = make_character("Oda")
+        backend.save(character)
+        character['inventory'].append('gem')
+        backend.save(character)
+        old_journal = (tmp_path / "Oda_save.journal").read_bytes()
+
+        # Crash after compaction wrote the snapshot but before the journal went
+        backend._write_snapshot(character)
+        (tmp_path / "Oda_save.journal").write_bytes(old_journal)
+        backend.states.clear()
+        assert backend.load("Oda") == character
+
+        # Crash part way through appending a line
+        character['gold'] = 7
+        backend.save(character)
+        with open(tmp_path / "Oda_save.journal", 'ab') as file:
+            file.write(b'{"gold":')
+        backend.states.clear()
+        assert backend.load("Oda") == character
+
+        character['gold'] = 8
+        backend.save(character)
+        backend.states.clear()
+        assert backend.load("Oda") == character
+    finally:
+        character_manager.close_save_backends()
+
+def test_new_destinations_always_written(backend, tmp_path):
+    """Test that a clean character is still written where it isn't saved"""
+    first, second = str(tmp_path / "first"), str(tmp_path / "second")
+    character = make_character("Vey")
+    character_manager.save_character(character, first)
+
+    # Another directory
+    character_manager.save_character(character, second)
+    assert character_manager.load_character("Vey", second) == character
+
+    # A copy of a loaded character
+    loaded = character_manager.load_character("Vey", first)
+    character_manager.save_character(loaded, str(tmp_path / "backup"))
+    assert character_manager.list_saved_characters(str(tmp_path / "backup")) == ["Vey"]
+
+    # After the save was deleted
+    character_manager.delete_character("Vey", first)
+    character_manager.save_character(character, first)
+    assert character_manager.load_character("Vey", first) == character
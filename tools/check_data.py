@@ -0,0 +1,49 @@
+"""
+Data File Checker
+Validates quest and item catalogs in one pass and lists every error
+
+Usage: python tools/check_data.py [--quests PATH] [--items PATH]
+Exits with status 1 if any errors were found (useful in CI).
+"""
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+from custom_exceptions import DataError
+
+
+def check(name, loader, path):
+    try:
+        records, errors = loader(path, strict=False)
+    except DataError as e:
+        print(f"✗ {name}: {e}")
+        return 1
+
+    for error in errors:
+        location = error['file']
+        if error['line'] is not None:
+            location += f":{error['line']}"
+        record_id = error['record_id'] or "?"
+        print(f"{location}: [{record_id}] {error['message']}")
+
+    print(f"{name}: {len(records)} valid, {len(errors)} errors")
+    return len(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate quest and item data files")
+    parser.add_argument("--quests", default="data/quests.txt")
+    parser.add_argument("--items", default="data/items.txt")
+    args = parser.parse_args()
+
+    error_count = check("Quests", game_data.load_quests, args.quests)
+    error_count += check("Items", game_data.load_items, args.items)
+    return 1 if error_count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
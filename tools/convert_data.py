@@ -0,0 +1,111 @@
+"""
+Catalog Format Converter
+Converts quest and item catalogs between the .txt, .jsonl and .csv formats
+
+Usage: python tools/convert_data.py INPUT OUTPUT [--kind quests|items]
+
+Formats are picked from the file extensions. The input is fully loaded and
+validated first, so a converted file is always valid. --kind can be left
+out when a file name contains "quest" or "item".
+"""
+
+import os
+import sys
+import csv
+import json
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+from custom_exceptions import DataError
+
+LOADERS = {'quests': game_data.load_quests, 'items': game_data.load_items}
+
+
+def field_text(value):
+    # Item effects and ints are written the way the text format spells them
+    return value if isinstance(value, str) else str(value)
+
+
+def json_value(value):
+    return value if isinstance(value, (str, int)) else str(value)
+
+
+def write_txt(filename, records, field_names):
+    with open(filename, 'w', encoding='utf-8') as file:
+        for record in records:
+            for name in field_names:
+                text = field_text(record[name])
+                if '\n' in text:
+                    raise ValueError(f"{name} of {record[field_names[0]]} has a line break, "
+                                     f"which the .txt format can't store")
+                file.write(f"{name.upper()}: {text}\n")
+            file.write("\n")
+
+
+def write_jsonl(filename, records, field_names):
+    with open(filename, 'w', encoding='utf-8') as file:
+        for record in records:
+            values = {name: json_value(record[name]) for name in field_names}
+            file.write(json.dumps(values, ensure_ascii=False) + "\n")
+
+
+def write_csv(filename, records, field_names):
+    with open(filename, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(field_names)
+        for record in records:
+            writer.writerow([field_text(record[name]) for name in field_names])
+
+
+WRITERS = {'txt': write_txt, 'jsonl': write_jsonl, 'csv': write_csv}
+
+
+def guess_kind(*filenames):
+    for filename in filenames:
+        name = os.path.basename(filename).lower()
+        if 'quest' in name:
+            return 'quests'
+        if 'item' in name:
+            return 'items'
+    return None
+
+
+def convert(source, target, kind):
+    """
+    Convert one catalog file to another format
+
+    Returns: Number of records written
+    Raises: DataError if the source is invalid
+    """
+    records = LOADERS[kind](source)
+    schema = game_data._catalog_schema(kind)
+    writer = WRITERS[game_data.get_catalog_format(target)]
+    writer(target, records.values(), schema.field_names)
+    return len(records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert quest/item catalog formats")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--kind", choices=sorted(LOADERS))
+    args = parser.parse_args()
+
+    kind = args.kind or guess_kind(args.input, args.output)
+    if kind is None:
+        parser.error("can't tell quests from items by the file names, use --kind")
+
+    try:
+        count = convert(args.input, args.output, kind)
+    except (DataError, ValueError) as e:
+        print(f"✗ {e}")
+        return 1
+
+    print(f"Converted {count} {kind} from {args.input} to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""
+Synthetic Data Generator
+Writes large, valid quest/item catalogs and save files for scale testing
+
+Quests form prerequisite trees: every tree is DEPTH quests deep and each
+quest unlocks up to FAN_OUT others (fan-out 1 gives plain chains). Records
+are written one at a time, so memory use stays flat no matter how many are
+asked for, and the same seed always produces the same files.
+
+Usage: python tools/generate_data.py OUTPUT_DIR [--quests N] [--items N]
+           [--saves N] [--depth D] [--fan-out F] [--seed S]
+           [--backend file|sqlite|journal]
+
+Creates OUTPUT_DIR/quests.txt, OUTPUT_DIR/items.txt and the saves in
+OUTPUT_DIR/save_games/ (<name>_save.txt files unless another --backend
+is given; QUEST_SAVE_BACKEND is ignored).
+"""
+
+import os
+import sys
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+ITEM_TYPES = ['weapon', 'armor', 'consumable']
+ITEM_STATS = {
+    'weapon': ['strength', 'magic'],
+    'armor': ['max_health'],
+    'consumable': ['health', 'max_health', 'strength', 'magic']
+}
+CHARACTER_CLASSES = ['Warrior', 'Mage', 'Rogue', 'Cleric']
+
+# Buffer size for the output files
+WRITE_BUFFER = 1 << 20
+
+# ============================================================================
+# PREREQUISITE TREES
+# ============================================================================
+
+class QuestTree:
+    """
+    Shape of the prerequisite trees, worked out from a quest's number
+
+    Quest numbers fill each tree breadth-first, so a quest's prerequisite
+    and depth can be calculated directly and nothing has to be remembered
+    between records.
+    """
+
+    def __init__(self, depth, fan_out):
+        if depth < 1 or fan_out < 1:
+            raise ValueError("depth and fan-out must be at least 1")
+        self.depth = depth
+        self.fan_out = fan_out
+        if fan_out == 1:
+            self.size = depth
+        else:
+            self.size = (fan_out ** depth - 1) // (fan_out - 1)
+
+    def prerequisite(self, number):
+        """Returns: Number of the quest's prerequisite, or None for a root"""
+        tree, position = divmod(number, self.size)
+        if position == 0:
+            return None
+        return tree * self.size + (position - 1) // self.fan_out
+
+    def level(self, number):
+        """Returns: How many prerequisites come before the quest (0 for a root)"""
+        position = number % self.size
+        if self.fan_out == 1:
+            return position
+
+        level = 0
+        while position > 0:
+            position = (position - 1) // self.fan_out
+            level += 1
+        return level
+
+    def chain(self, number):
+        """Returns: Quest numbers from the tree's root down to the quest"""
+        chain = []
+        while number is not None:
+            chain.append(number)
+            number = self.prerequisite(number)
+        chain.reverse()
+        return chain
+
+
+def quest_id(number):
+    return f"quest_{number}"
+
+
+def item_id(number):
+    return f"item_{number}"
+
+
+def required_level(tree, number):
+    # Levels rise along each chain so every chain can be played in order
+    return min(1 + tree.level(number), 50)
+
+# ============================================================================
+# WRITERS
+# ============================================================================
+
+def write_quests(filename, count, tree, rng):
+    with open(filename, 'w', buffering=WRITE_BUFFER) as file:
+        for number in range(count):
+            prerequisite = tree.prerequisite(number)
+            level = required_level(tree, number)
+            file.write(
+                f"QUEST_ID: {quest_id(number)}\n"
+                f"TITLE: Quest {number}\n"
+                f"DESCRIPTION: Generated quest {number} at depth {tree.level(number)}\n"
+                f"REWARD_XP: {level * 25 + rng.randint(0, 50)}\n"
+                f"REWARD_GOLD: {level * 10 + rng.randint(0, 25)}\n"
+                f"REQUIRED_LEVEL: {level}\n"
+                f"PREREQUISITE: {'NONE' if prerequisite is None else quest_id(prerequisite)}\n\n"
+            )
+
+
+def write_items(filename, count, rng):
+    with open(filename, 'w', buffering=WRITE_BUFFER) as file:
+        for number in range(count):
+            item_type = rng.choice(ITEM_TYPES)
+            stat = rng.choice(ITEM_STATS[item_type])
+            value = rng.randint(1, 25)
+            file.write(
+                f"ITEM_ID: {item_id(number)}\n"
+                f"NAME: Item {number}\n"
+                f"TYPE: {item_type}\n"
+                f"EFFECT: {stat}:{value}\n"
+                f"COST: {rng.randint(5, 50) * value}\n"
+                f"DESCRIPTION: Generated {item_type} raising {stat} by {value}\n\n"
+            )
+
+
+def write_saves(save_directory, count, quest_count, item_count, tree, rng,
+                backend="file"):
+    previous_backend = character_manager.SAVE_BACKEND
+    character_manager.set_save_backend(backend)
+    try:
+        # One commit (and one round of fsyncs) for the whole run
+        with character_manager.group_commit(save_directory):
+            for number in range(count):
+                character = random_character(number, quest_count, item_count, tree, rng)
+                character_manager.save_character(character, save_directory)
+    finally:
+        character_manager.SAVE_BACKEND = previous_backend
+
+
+def random_character(number, quest_count, item_count, tree, rng):
+    character = character_manager.create_character(
+        f"hero_{number}", rng.choice(CHARACTER_CLASSES)
+    )
+
+    # Each hero is partway down one chain: everything above the
+    # current quest is done and the current quest is active
+    if quest_count:
+        chain = tree.chain(rng.randrange(quest_count))
+        character['completed_quests'] = [quest_id(n) for n in chain[:-1]]
+        character['active_quests'] = [quest_id(chain[-1])]
+        character['level'] = required_level(tree, chain[-1])
+
+    if item_count:
+        character['inventory'] = [
+            item_id(rng.randrange(item_count)) for _ in range(rng.randint(0, 20))
+        ]
+    character['experience'] = rng.randint(0, character['level'] * 100 - 1)
+    character['gold'] = rng.randint(0, 10000)
+    return character
+
+
+def generate(output_directory, quests, items, saves, depth, fan_out, seed,
+             backend="file"):
+    """
+    Write a full synthetic data set
+
+    Args:
+        output_directory: Directory to create the files in
+        quests, items, saves: How many of each to write
+        depth: Quests in the longest prerequisite chain of each tree
+        fan_out: Quests unlocked by completing each quest
+        seed: Random seed (same seed, same files)
+        backend: Save backend to write the saves with
+    """
+    tree = QuestTree(depth, fan_out)
+    rng = random.Random(seed)
+    os.makedirs(output_directory, exist_ok=True)
+
+    write_quests(os.path.join(output_directory, "quests.txt"), quests, tree, rng)
+    write_items(os.path.join(output_directory, "items.txt"), items, rng)
+    if saves:
+        write_saves(os.path.join(output_directory, "save_games"),
+                    saves, quests, items, tree, rng, backend)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic game data")
+    parser.add_argument("output", help="Directory to write the data set to")
+    parser.add_argument("--quests", type=int, default=1000)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--saves", type=int, default=0)
+    parser.add_argument("--depth", type=int, default=10)
+    parser.add_argument("--fan-out", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--backend", choices=sorted(character_manager.SAVE_BACKENDS),
+                        default="file", help="Save backend for the saves (default: file)")
+    args = parser.parse_args()
+
+    try:
+        generate(args.output, args.quests, args.items, args.saves,
+                 args.depth, args.fan_out, args.seed, args.backend)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(f"Wrote {args.quests} quests, {args.items} items and {args.saves} saves "
+          f"to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())